@@ -0,0 +1,193 @@
+"""
+Excelladin Reloaded - Command line
+Voert een opgeslagen workflow of losse acties uit op een Excel-bestand zonder
+GUI, bijvoorbeeld vanuit cron op een server zonder beeldscherm
+
+Voorbeelden:
+    python cli.py producten.xlsx --workflow workflows/prijzen.json
+    python cli.py producten.xlsx --actie 'kolomSchoonmaken={"kolommen": ["Merk"]}' --rijen 1-500
+    python cli.py groot.xlsx --workflow workflows/prijzen.json --chunk 20000
+    python cli.py --lijst
+"""
+import os
+import sys
+import json
+import signal
+import argparse
+import threading
+
+# Zorg dat we modules kunnen importeren, net als in main.py
+if getattr(sys, 'frozen', False):
+    application_path = os.path.dirname(sys.executable)
+else:
+    application_path = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, application_path)
+
+# Exitcodes voor cron en scripts
+EXIT_SUCCES = 0
+EXIT_MISLUKT = 1
+EXIT_ONGELDIG = 2
+
+def leesRijen(tekst):
+    """
+    Lees een rijbereik in de vorm START-EIND
+    
+    Args:
+        tekst (str): Het bereik, bijvoorbeeld "1-500"
+    
+    Returns:
+        tuple: (startRij, eindRij)
+    """
+    try:
+        start, eind = (int(deel) for deel in tekst.split('-', 1))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Ongeldig bereik '{tekst}', verwacht START-EIND")
+    if start < 0 or start > eind:
+        raise argparse.ArgumentTypeError(f"Ongeldig bereik '{tekst}', verwacht 0 <= START <= EIND")
+    return (start, eind)
+
+def leesActie(tekst):
+    """
+    Lees een actie in de vorm NAAM of NAAM=JSON
+    
+    Args:
+        tekst (str): De actie, bijvoorbeeld 'kolomSchoonmaken={"kolommen": ["Merk"]}'
+    
+    Returns:
+        tuple: (actieNaam, parameters)
+    """
+    naam, _, parameters = tekst.partition('=')
+    if not parameters:
+        return (naam.strip(), {})
+    try:
+        return (naam.strip(), json.loads(parameters))
+    except json.JSONDecodeError as e:
+        raise argparse.ArgumentTypeError(f"Ongeldige JSON-parameters voor actie '{naam}': {e}")
+
+def maakParser():
+    """
+    Maak de parser voor de command line argumenten
+    
+    Returns:
+        argparse.ArgumentParser: De parser
+    """
+    parser = argparse.ArgumentParser(
+        prog="cli.py",
+        description="Voer een Excelladin workflow of losse acties uit zonder GUI"
+    )
+    parser.add_argument("bestand", nargs="?", help="Pad naar het Excel-bestand")
+    bron = parser.add_mutually_exclusive_group()
+    bron.add_argument("-w", "--workflow", metavar="PAD",
+                      help="Opgeslagen workflow (JSON of YAML) om uit te voeren")
+    bron.add_argument("-a", "--actie", metavar="NAAM[=JSON]", type=leesActie, action="append",
+                      help="Actie met parameters als JSON-object; herhaal voor meerdere acties")
+    bron.add_argument("--lijst", action="store_true",
+                      help="Toon de beschikbare acties en stop")
+    parser.add_argument("-r", "--rijen", metavar="START-EIND", type=leesRijen,
+                        help="Bewerk alleen dit rijbereik (standaard dat van de workflow, of alle rijen)")
+    parser.add_argument("--werkblad", help="Naam van het werkblad (standaard het eerste)")
+    parser.add_argument("--parallel", action="store_true",
+                        help="Voer onafhankelijke stappen tegelijk uit")
+    parser.add_argument("--hervat", action="store_true",
+                        help="Zet een afgebroken run voort en sla voltooide rijen over")
+    parser.add_argument("--chunk", metavar="RIJEN", type=int, nargs="?", const=0,
+                        help="Voer lokale acties uit in chunks rijen, met voortgang per chunk; "
+                             "Ctrl+C of SIGTERM stopt na de lopende chunk zonder op te slaan")
+    parser.add_argument("--niet-opslaan", dest="opslaan", action="store_false",
+                        help="Sla de wijzigingen niet op")
+    return parser
+
+def toonActies():
+    """Toon de beschikbare acties per categorie"""
+    from modules.actions import BESCHIKBARE_ACTIES
+    
+    perCategorie = {}
+    for naam, actie in BESCHIKBARE_ACTIES.items():
+        perCategorie.setdefault(actie.categorie, []).append((naam, actie.beschrijving))
+    
+    for categorie, acties in perCategorie.items():
+        print(f"{categorie}:")
+        for naam, beschrijving in acties:
+            print(f"  {naam:<28} {beschrijving}")
+
+def main(argumenten=None):
+    """
+    Voer de command line uit
+    
+    Args:
+        argumenten (list): Optioneel, argumenten in plaats van sys.argv
+    
+    Returns:
+        int: Exitcode
+    """
+    parser = maakParser()
+    args = parser.parse_args(argumenten)
+    
+    if args.lijst:
+        toonActies()
+        return EXIT_SUCCES
+    
+    if not args.bestand or not (args.workflow or args.actie):
+        parser.error("geef een bestand en een workflow (--workflow) of acties (--actie) op")
+    if args.chunk is not None and args.chunk < 0:
+        parser.error("--chunk verwacht een positief aantal rijen")
+    
+    # Pas na het lezen van de argumenten importeren: geen tkinter en geen GUI-tabbladen
+    from modules.logger import logger
+    from modules.excel_handler import excelHandler
+    from modules.workflow import Workflow, workflowManager, STANDAARD_CHUNK_GROOTTE
+    from modules.workflow_opslag import controleerActies
+    
+    # Controleer de workflow voordat het (mogelijk grote) bestand wordt geopend
+    if args.workflow:
+        workflow = workflowManager.laadWorkflow(args.workflow)
+        if workflow is None:
+            print(f"Workflow {args.workflow} kon niet worden geladen, zie het logboek", file=sys.stderr)
+            return EXIT_ONGELDIG
+    else:
+        fouten = controleerActies(args.actie)
+        if fouten:
+            print("\n".join(fouten), file=sys.stderr)
+            return EXIT_ONGELDIG
+        workflow = Workflow("cli")
+        workflow.acties = list(args.actie)
+    
+    if not excelHandler.openBestand(args.bestand, werkblad=args.werkblad):
+        print(f"Bestand {args.bestand} kon niet worden geopend, zie het logboek", file=sys.stderr)
+        return EXIT_MISLUKT
+    excelHandler.wachtTotGeladen()
+    
+    def toonVoortgang(percentage, actieNaam):
+        print(f"[{percentage:5.1f}%] {actieNaam}", flush=True)
+    
+    # In chunks stopt een onderbreking netjes na de lopende chunk
+    annuleer = threading.Event()
+    chunkGrootte = None
+    if args.chunk is not None:
+        chunkGrootte = args.chunk or STANDAARD_CHUNK_GROOTTE
+        for signaal in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signaal, lambda nummer, frame: annuleer.set())
+    
+    logger.logInfo(f"Command line: workflow '{workflow.naam}' op {args.bestand}")
+    succes = workflow.voerUit(
+        toonVoortgang, args.rijen, parallel=args.parallel, hervat=args.hervat,
+        chunkGrootte=chunkGrootte, annuleer=annuleer
+    )
+    
+    for (actieNaam, _), resultaat in zip(workflow.acties, workflow.haalResultaten()):
+        print(f"{'OK  ' if resultaat.succes else 'FOUT'} {actieNaam}: {resultaat.bericht}")
+    
+    if not succes:
+        print(f"Workflow '{workflow.naam}' mislukt, wijzigingen niet opgeslagen", file=sys.stderr)
+        return EXIT_MISLUKT
+    
+    if args.opslaan:
+        if not excelHandler.slaOp():
+            print(f"Opslaan van {args.bestand} mislukt, zie het logboek", file=sys.stderr)
+            return EXIT_MISLUKT
+        print(f"Opgeslagen: {args.bestand}")
+    
+    return EXIT_SUCCES
+
+if __name__ == "__main__":
+    sys.exit(main())
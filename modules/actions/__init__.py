@@ -1,29 +1,27 @@
 # Initialiseert de modules.actions package
 from modules.actions.base import ActieBasis, ActieResultaat
-from modules.actions.rentpro_inlezen import (
-    RentProInlezenActie,
-    RentProMeerdereInlezenActie,
-    RentProZoekInlezenActie
+from modules.actions.lokaal import LokaleActie, KolomDoorgang, voerLokaleActiesUit
+from modules.actions.register import (
+    BESCHIKBARE_ACTIES,
+    ActieRegistratie,
+    registreerActie,
+    haalActieOp,
+    voerActieUit
 )
-from modules.actions.rentpro_upload import (
-    RentProUploadActie,
-    RentProBulkUploadActie,
-    RentProUpdateActie
-)
-
-# Importeer de benodigde variabelen en functies uit het actions.py bestand
-import sys
-import os
-import importlib.util
-
-# Pad naar het actions.py bestand
-actions_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "actions.py")
 
-# Laad het actions.py bestand als module
-spec = importlib.util.spec_from_file_location("actions_module", actions_path)
-actions_module = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(actions_module)
+# RentPro acties worden pas geïmporteerd als ze gevraagd worden, zie __getattr__
+_RENTPRO_ACTIES = {
+    "RentProInlezenActie": "modules.actions.rentpro_inlezen",
+    "RentProMeerdereInlezenActie": "modules.actions.rentpro_inlezen",
+    "RentProZoekInlezenActie": "modules.actions.rentpro_inlezen",
+    "RentProUploadActie": "modules.actions.rentpro_upload",
+    "RentProBulkUploadActie": "modules.actions.rentpro_upload",
+    "RentProUpdateActie": "modules.actions.rentpro_upload",
+}
 
-# Exporteer de benodigde variabelen en functies
-BESCHIKBARE_ACTIES = actions_module.BESCHIKBARE_ACTIES
-voerActieUit = actions_module.voerActieUit
+def __getattr__(naam):
+    """Importeer een RentPro actieklasse pas bij het eerste gebruik"""
+    if naam in _RENTPRO_ACTIES:
+        import importlib
+        return getattr(importlib.import_module(_RENTPRO_ACTIES[naam]), naam)
+    raise AttributeError(f"module {__name__!r} has no attribute {naam!r}")
@@ -12,6 +12,11 @@ class ActieResultaat:
 class ActieBasis:
     """Basis klasse voor alle acties"""
     
+    # True als de actie per rij voortgang vastlegt en na een afgebroken run hervat kan worden
+    hervatbaar = False
+    # Parameters die altijd opgegeven moeten worden
+    verplichteParameters = ()
+    
     def __init__(self, naam, beschrijving, categorie="Algemeen"):
         """
         Initialiseer een actie
@@ -37,3 +42,57 @@ class ActieBasis:
             ActieResultaat: Resultaat van de actie
         """
         raise NotImplementedError("Deze methode moet worden geïmplementeerd in subklassen")
+    
+    def controleer(self, parameters):
+        """
+        Controleer de parameters voordat de actie wordt uitgevoerd
+        
+        Args:
+            parameters (dict): Parameters voor de actie
+            
+        Returns:
+            str: Foutmelding, of None als de parameters in orde zijn
+        """
+        for param in self.verplichteParameters:
+            if param not in parameters:
+                return f"Ontbrekende parameter: {param}"
+        return None
+    
+    def leesKolommen(self, parameters):
+        """
+        Haal de kolommen op die de actie leest
+        
+        Args:
+            parameters (dict): Parameters voor de actie
+            
+        Returns:
+            list: Namen van de gelezen kolommen, of None als dat onbekend is
+                  (de actie wordt dan niet tegelijk met andere acties uitgevoerd)
+        """
+        return None
+    
+    def schrijfKolommen(self, parameters):
+        """
+        Haal de kolommen op die de actie kan wijzigen
+        
+        Args:
+            parameters (dict): Parameters voor de actie
+            
+        Returns:
+            list: Namen van de geschreven kolommen, of None als dat onbekend is
+        """
+        return None
+    
+    def bereikVolgtSchema(self, rijen):
+        """
+        Controleer of het bereik afhangt van het kopschema (de veld-ID rij)
+        
+        Args:
+            rijen (tuple): Optioneel, tuple met (startRij, eindRij) of None voor alle rijen
+            
+        Returns:
+            bool: True als een gewijzigde rij 0 het bereik van de actie kan veranderen
+        """
+        # Zonder bereik beginnen acties standaard bij de eerste productrij
+        return rijen is None
+
@@ -0,0 +1,586 @@
+"""
+Lokale acties voor Excelladin Reloaded
+Acties die alleen kolommen van het geopende bestand lezen en schrijven, en het
+samen uitvoeren van opeenvolgende lokale acties in één doorgang over de data
+"""
+import pandas as pd
+from modules.logger import logger
+from modules.excel_handler import excelHandler
+from modules.excel_formaat import compileerFormaat
+from modules.excel_schoonmaak import compileerPijplijn
+from modules.excel_expressie import compileerExpressie
+from modules.actions.base import ActieBasis, ActieResultaat
+
+class LokaleActie(ActieBasis):
+    """
+    Basis klasse voor acties die alleen kolommen van het geopende bestand bewerken
+    
+    Een lokale actie geeft aan welke kolommen hij leest en schrijft en rekent op
+    kolommen in het geheugen. Opeenvolgende lokale acties kunnen daardoor in één
+    doorgang over de data worden uitgevoerd, zie voerLokaleActiesUit.
+    """
+    
+    def __init__(self, naam, beschrijving):
+        """
+        Initialiseer een lokale actie
+        
+        Args:
+            naam (str): Naam van de actie
+            beschrijving (str): Beschrijving van de actie
+        """
+        super().__init__(naam, beschrijving, categorie="Lokale sheet bijwerken")
+    
+    def controleer(self, parameters):
+        """
+        Controleer de parameters voordat er data wordt opgehaald
+        
+        Args:
+            parameters (dict): Parameters voor de actie
+            
+        Returns:
+            str: Foutmelding, of None als de parameters in orde zijn
+        """
+        return None
+    
+    def leesKolommen(self, parameters):
+        """
+        Haal de kolommen op die de actie binnen het bereik leest
+        
+        Args:
+            parameters (dict): Parameters voor de actie
+            
+        Returns:
+            list: Namen van de gelezen kolommen
+        """
+        return []
+    
+    def schrijfKolommen(self, parameters):
+        """
+        Haal de kolommen op die de actie kan wijzigen
+        
+        Args:
+            parameters (dict): Parameters voor de actie
+            
+        Returns:
+            list: Namen van de geschreven kolommen
+        """
+        return []
+    
+    def volledigeKolommen(self, parameters):
+        """
+        Haal de kolommen op die over alle rijen gelezen worden, buiten het bereik om
+        
+        Args:
+            parameters (dict): Parameters voor de actie
+            
+        Returns:
+            list: Namen van de kolommen (bijvoorbeeld voor OPZOEKEN)
+        """
+        return []
+    
+    def bepaalBereik(self, rijen):
+        """
+        Bepaal de rijen waarop de actie werkt
+        
+        Args:
+            rijen (tuple): Optioneel, tuple met (startRij, eindRij) of None voor alle
+                           productrijen, zonder de veld-ID rij van het sjabloon
+            
+        Returns:
+            tuple: (startRij, eindRij), begrensd op het aantal rijen
+        """
+        totaalRijen = excelHandler.haalRijAantal()
+        if rijen is None:
+            return (excelHandler.haalSchema().eersteDataRij, totaalRijen - 1)
+        return (max(rijen[0], 0), min(rijen[1], totaalRijen - 1))
+    
+    def bereikVolgtSchema(self, rijen):
+        """
+        Controleer of het bereik afhangt van het kopschema (de veld-ID rij)
+        
+        Args:
+            rijen (tuple): Optioneel, tuple met (startRij, eindRij) of None voor alle rijen
+            
+        Returns:
+            bool: True als een gewijzigde rij 0 het bereik van de actie kan veranderen
+        """
+        # Zonder bereik slaat de actie de veld-ID rij over, zie bepaalBereik
+        return rijen is None
+    
+    def bereken(self, parameters, doorgang):
+        """
+        Reken de actie door op de kolommen van een doorgang (implementeer in subklassen)
+        
+        Args:
+            parameters (dict): Parameters voor de actie
+            doorgang (KolomDoorgang): Doorgang met de kolommen van het bereik
+            
+        Returns:
+            dict: Kolomnaam -> nieuwe waarden voor het bereik, alleen voor gewijzigde kolommen
+            
+        Raises:
+            ValueError: Als de actie niet uitgevoerd kan worden
+        """
+        raise NotImplementedError("Deze methode moet worden geïmplementeerd in subklassen")
+    
+    def maakBericht(self, parameters, rijBereik, gewijzigd):
+        """
+        Maak het bericht voor een geslaagde uitvoering
+        
+        Args:
+            parameters (dict): Parameters voor de actie
+            rijBereik (str): Omschrijving van het bereik, zoals 'alle rijen'
+            gewijzigd (list): Namen van de gewijzigde kolommen
+            
+        Returns:
+            str: Het bericht
+        """
+        return f"Actie '{self.naam}' uitgevoerd voor {rijBereik}"
+    
+    def voerUit(self, parameters, rijen=None):
+        """
+        Voer de actie uit als doorgang van één actie
+        
+        Args:
+            parameters (dict): Parameters voor de actie
+            rijen (tuple): Optioneel, tuple met (startRij, eindRij) om alleen een bereik te bewerken
+            
+        Returns:
+            ActieResultaat: Resultaat van de actie
+        """
+        return voerLokaleActiesUit([(self, parameters)], rijen)[0]
+
+class KolomDoorgang:
+    """
+    Eén doorgang over een rijbereik
+    
+    Elke kolom wordt hooguit één keer uit het werkblad gehaald, tussenresultaten
+    blijven als Series in het geheugen en gewijzigde kolommen worden aan het eind
+    één keer teruggeschreven.
+    """
+    
+    def __init__(self, bereik):
+        """
+        Initialiseer een lege doorgang
+        
+        Args:
+            bereik (tuple): (startRij, eindRij) van de doorgang
+        """
+        self.bereik = bereik
+        self.aantalRijen = max(bereik[1] - bereik[0] + 1, 0)
+        self.gewijzigd = []
+        self._kolommen = {}
+    
+    def haal(self, kolomNaam):
+        """
+        Haal een kolom van het bereik op, inclusief eerdere wijzigingen in deze doorgang
+        
+        Args:
+            kolomNaam (str): Naam van de kolom
+            
+        Returns:
+            pandas.Series: De kolomwaarden met een index die bij 0 begint
+            
+        Raises:
+            ValueError: Als de kolom niet opgehaald kan worden
+        """
+        reeks = self._kolommen.get(kolomNaam)
+        if reeks is None:
+            reeks = excelHandler.haalKolomReeks(kolomNaam, self.bereik)
+            if reeks is None:
+                raise ValueError(f"Fout bij ophalen gegevens uit kolom '{kolomNaam}'")
+            self._kolommen[kolomNaam] = reeks
+        return reeks
+    
+    def haalVolledig(self, kolomNaam):
+        """
+        Haal een hele kolom op uit het werkblad
+        
+        Args:
+            kolomNaam (str): Naam van de kolom
+            
+        Returns:
+            pandas.Series: Alle waarden van de kolom
+        """
+        return excelHandler.haalKolomReeks(kolomNaam)
+    
+    def zet(self, kolomNaam, waarden):
+        """
+        Vervang een kolom van het bereik in het geheugen
+        
+        Args:
+            kolomNaam (str): Naam van de kolom
+            waarden: Nieuwe waarden (Series, array of lijst) voor het hele bereik
+        """
+        if not isinstance(waarden, pd.Series):
+            waarden = pd.Series(waarden, dtype=object, copy=False)
+        self._kolommen[kolomNaam] = waarden
+        if kolomNaam not in self.gewijzigd:
+            self.gewijzigd.append(kolomNaam)
+    
+    def schrijfTerug(self):
+        """
+        Schrijf alle gewijzigde kolommen terug naar het werkblad
+        
+        Returns:
+            str: Naam van de kolom die niet geschreven kon worden, of None als alles gelukt is
+        """
+        # Het hele werkblad wordt in één keer vervangen, een bereik per rij
+        rijen = None if self.bereik == (0, excelHandler.haalRijAantal() - 1) else self.bereik
+        for kolomNaam in self.gewijzigd:
+            waarden = self._kolommen[kolomNaam].to_numpy(dtype=object)
+            if not excelHandler.bewerkKolom(kolomNaam, waarden, rijen):
+                return kolomNaam
+        self.gewijzigd = []
+        return None
+
+class KolomVullenActie(LokaleActie):
+    """Actie om een kolom te vullen met gecombineerde data uit andere kolommen"""
+    
+    def __init__(self):
+        """Initialiseer de kolom vullen actie"""
+        super().__init__(
+            naam="kolomVullen",
+            beschrijving="Vul een kolom met gecombineerde data uit andere kolommen"
+        )
+    
+    def controleer(self, parameters):
+        """
+        Controleer de parameters van de kolom vullen actie
+        
+        Args:
+            parameters (dict): Parameters voor de actie, moet bevatten:
+                - doelKolom (str): Naam van de kolom om te vullen
+                - bronKolommen (list): Lijst met namen van bronkolommen
+                - formaat (str): Formaat string met {kolomnaam} placeholders
+            
+        Returns:
+            str: Foutmelding, of None als de parameters in orde zijn
+        """
+        for param in ["doelKolom", "bronKolommen", "formaat"]:
+            if param not in parameters:
+                return f"Ontbrekende parameter: {param}"
+        
+        # Compileer het formaat één keer tot kolombewerkingen (gecachet per formaat)
+        try:
+            compileerFormaat(parameters["formaat"])
+        except ValueError as e:
+            return f"Ongeldig formaat: {e}"
+        return None
+    
+    def leesKolommen(self, parameters):
+        """Bronkolommen van het formaat"""
+        return list(parameters["bronKolommen"])
+    
+    def schrijfKolommen(self, parameters):
+        """De doelkolom"""
+        return [parameters["doelKolom"]]
+    
+    def bereken(self, parameters, doorgang):
+        """
+        Genereer de nieuwe waarden voor de hele doelkolom in één keer
+        
+        Args:
+            parameters (dict): Parameters voor de actie
+            doorgang (KolomDoorgang): Doorgang met de kolommen van het bereik
+            
+        Returns:
+            dict: Doelkolom -> nieuwe waarden
+        """
+        sjabloon = compileerFormaat(parameters["formaat"])
+        kolomData = {kolom: doorgang.haal(kolom) for kolom in parameters["bronKolommen"]}
+        
+        try:
+            nieuweWaarden = sjabloon.pasToe(kolomData, doorgang.aantalRijen)
+        except KeyError as e:
+            logger.logWaarschuwing(f"Ontbrekende kolom in formaat: {e}")
+            nieuweWaarden = [""] * doorgang.aantalRijen
+        except Exception as e:
+            startRij, eindRij = doorgang.bereik
+            logger.logWaarschuwing(f"Fout bij formatteren rijen {startRij+1}-{eindRij+1}: {e}")
+            nieuweWaarden = [""] * doorgang.aantalRijen
+        
+        return {parameters["doelKolom"]: nieuweWaarden}
+    
+    def maakBericht(self, parameters, rijBereik, gewijzigd):
+        """Bericht met de gevulde kolom en het bereik"""
+        logger.logActie(f"Kolom '{parameters['doelKolom']}' gevuld met data uit {', '.join(parameters['bronKolommen'])}")
+        return f"Kolom '{parameters['doelKolom']}' succesvol gevuld voor {rijBereik}"
+
+class KolomSchoonmakenActie(LokaleActie):
+    """Actie om kolommen op te schonen (onnodige tekens verwijderen)"""
+    
+    def __init__(self):
+        """Initialiseer de kolom schoonmaken actie"""
+        super().__init__(
+            naam="kolomSchoonmaken",
+            beschrijving="Schoon een of meer kolommen op door onnodige tekens te verwijderen"
+        )
+    
+    def _kolommen(self, parameters):
+        """Namen van de schoon te maken kolommen"""
+        if "kolommen" in parameters:
+            return list(parameters["kolommen"])
+        return [parameters["kolom"]]
+    
+    def _stappen(self, parameters):
+        """Schoonmaakstappen in volgorde; zonder lijst gelden de losse opties"""
+        stappen = parameters.get("stappen")
+        if stappen is None:
+            stappen = []
+            if parameters.get("verwijderLeestekens", False):
+                stappen.append("verwijderLeestekens")
+            if parameters.get("verwijderSpaties", False):
+                stappen.append("verwijderSpaties")
+        return tuple(stappen)
+    
+    def controleer(self, parameters):
+        """
+        Controleer de parameters van de kolom schoonmaken actie
+        
+        Args:
+            parameters (dict): Parameters voor de actie, moet bevatten:
+                - kolommen (list): Namen van de kolommen om schoon te maken
+                  (of kolom (str) voor één kolom)
+                - stappen (list): Optioneel, schoonmaakstappen in volgorde, zie SCHOONMAAK_STAPPEN
+                - verwijderSpaties (bool): Verwijder extra spaties (als stappen ontbreekt)
+                - verwijderLeestekens (bool): Verwijder leestekens (als stappen ontbreekt)
+            
+        Returns:
+            str: Foutmelding, of None als de parameters in orde zijn
+        """
+        if "kolommen" not in parameters and "kolom" not in parameters:
+            return "Ontbrekende parameter: kolommen"
+        
+        try:
+            compileerPijplijn(self._stappen(parameters))
+        except ValueError as e:
+            return str(e)
+        return None
+    
+    def leesKolommen(self, parameters):
+        """De schoon te maken kolommen"""
+        return self._kolommen(parameters)
+    
+    def schrijfKolommen(self, parameters):
+        """De schoon te maken kolommen"""
+        return self._kolommen(parameters)
+    
+    def bereken(self, parameters, doorgang):
+        """
+        Maak elke kolom in één doorgang schoon
+        
+        Args:
+            parameters (dict): Parameters voor de actie
+            doorgang (KolomDoorgang): Doorgang met de kolommen van het bereik
+            
+        Returns:
+            dict: Kolomnaam -> schoongemaakte kolom, alleen voor kolommen die veranderd zijn
+        """
+        pijplijn = compileerPijplijn(self._stappen(parameters))
+        
+        gewijzigd = {}
+        for kolom in self._kolommen(parameters):
+            schoneData = pijplijn.pasToe(doorgang.haal(kolom))
+            if schoneData is not None:
+                gewijzigd[kolom] = schoneData
+        return gewijzigd
+    
+    def maakBericht(self, parameters, rijBereik, gewijzigd):
+        """Bericht met het aantal (gewijzigde) kolommen en het bereik"""
+        kolommen = self._kolommen(parameters)
+        if gewijzigd:
+            logger.logActie(f"Kolommen schoongemaakt: {', '.join(gewijzigd)}")
+        if len(kolommen) == 1:
+            return f"Kolom '{kolommen[0]}' succesvol schoongemaakt voor {rijBereik}"
+        return f"{len(kolommen)} kolommen schoongemaakt voor {rijBereik} ({len(gewijzigd)} gewijzigd)"
+
+class KolomBerekenenActie(LokaleActie):
+    """Actie om een kolom te berekenen met een formule over andere kolommen"""
+    
+    def __init__(self):
+        """Initialiseer de kolom berekenen actie"""
+        super().__init__(
+            naam="kolomBerekenen",
+            beschrijving="Bereken een kolom met een formule, zoals een verkoopprijs uit inkoopprijs en marge"
+        )
+    
+    def controleer(self, parameters):
+        """
+        Controleer de parameters van de kolom berekenen actie
+        
+        Args:
+            parameters (dict): Parameters voor de actie, moet bevatten:
+                - doelKolom (str): Naam van de kolom om te vullen
+                - expressie (str): Formule, bijvoorbeeld 'AFRONDEN(Inkoopprijs * (1 + Margepercentage / 100); 2)'
+            
+        Returns:
+            str: Foutmelding, of None als de parameters in orde zijn
+        """
+        for param in ["doelKolom", "expressie"]:
+            if param not in parameters:
+                return f"Ontbrekende parameter: {param}"
+        
+        # Parse de formule (gecachet per formuletekst)
+        try:
+            compileerExpressie(parameters["expressie"])
+        except ValueError as e:
+            return f"Ongeldige formule: {e}"
+        return None
+    
+    def leesKolommen(self, parameters):
+        """Kolommen uit de formule"""
+        return list(compileerExpressie(parameters["expressie"]).kolommen)
+    
+    def schrijfKolommen(self, parameters):
+        """De doelkolom"""
+        return [parameters["doelKolom"]]
+    
+    def volledigeKolommen(self, parameters):
+        """Kolommen waarin de formule opzoekt"""
+        return list(compileerExpressie(parameters["expressie"]).volledigeKolommen)
+    
+    def bereken(self, parameters, doorgang):
+        """
+        Bereken de hele doelkolom in één keer
+        
+        Args:
+            parameters (dict): Parameters voor de actie
+            doorgang (KolomDoorgang): Doorgang met de kolommen van het bereik
+            
+        Returns:
+            dict: Doelkolom -> berekende waarden
+            
+        Raises:
+            ValueError: Als de formule niet berekend kan worden
+        """
+        expressie = compileerExpressie(parameters["expressie"])
+        try:
+            nieuweWaarden = expressie.evalueer(doorgang.haal, doorgang.aantalRijen, doorgang.haalVolledig)
+        except (ValueError, TypeError) as e:
+            raise ValueError(f"Fout bij berekenen formule: {e}") from e
+        return {parameters["doelKolom"]: nieuweWaarden}
+    
+    def maakBericht(self, parameters, rijBereik, gewijzigd):
+        """Bericht met de berekende kolom en het bereik"""
+        logger.logActie(f"Kolom '{parameters['doelKolom']}' berekend met formule: {parameters['expressie']}")
+        return f"Kolom '{parameters['doelKolom']}' succesvol berekend voor {rijBereik}"
+
+def _rijBereikTekst(bereik):
+    """Omschrijving van een bereik voor in een resultaatbericht"""
+    if bereik == (0, excelHandler.haalRijAantal() - 1):
+        return "alle rijen"
+    return f"rijen {bereik[0]+1}-{bereik[1]+1}"
+
+def voerLokaleActiesUit(acties, rijen=None, naElkeActie=None, venster=None):
+    """
+    Voer opeenvolgende lokale acties uit in zo min mogelijk doorgangen over de data
+    
+    Acties met hetzelfde bereik delen één KolomDoorgang: elke kolom wordt één
+    keer opgehaald, een actie ziet de uitkomst van de vorige zonder tussenkopie
+    naar het werkblad en elke gewijzigde kolom wordt één keer teruggeschreven.
+    Een nieuwe doorgang begint alleen als het bereik verandert, als een actie
+    een hele kolom opzoekt die eerder in de doorgang is gewijzigd of als het
+    bereik van een actie afhangt van een gewijzigde veld-ID rij. Bij een fout
+    worden de wijzigingen van de eerdere acties nog teruggeschreven en stopt de
+    uitvoering.
+    
+    Met een venster bewerkt elke actie alleen het deel van zijn bereik binnen
+    het venster, zodat een groot bereik in chunks uitgevoerd kan worden zonder
+    hele kolommen in het geheugen te halen (zie Workflow.voerUit).
+    
+    Args:
+        acties (list): Lijst met (LokaleActie, parameters) tuples
+        rijen (tuple): Optioneel, tuple met (startRij, eindRij) om alleen een bereik te bewerken
+        naElkeActie (callable): Optioneel, wordt na elke actie aangeroepen met het ActieResultaat
+        venster (tuple): Optioneel, tuple met (startRij, eindRij) van de chunk die bewerkt wordt
+        
+    Returns:
+        list: ActieResultaat per uitgevoerde actie, de laatste is de eventuele fout
+    """
+    if not excelHandler.isBestandGeopend():
+        resultaat = ActieResultaat(False, "Kan actie niet uitvoeren: Geen Excel-bestand geopend")
+        if naElkeActie:
+            naElkeActie(resultaat)
+        return [resultaat]
+    
+    # Bereiken en kolommen liggen pas vast als alle rijen geladen zijn
+    excelHandler.wachtTotGeladen()
+    
+    resultaten = []
+    doorgang = None
+    
+    def schrijfDoorgangTerug():
+        """Schrijf de open doorgang terug; een mislukte kolom is de fout van de laatste actie"""
+        mislukt = doorgang.schrijfTerug()
+        if mislukt is not None and resultaten and resultaten[-1].succes:
+            resultaten[-1] = ActieResultaat(False, f"Fout bij schrijven naar kolom '{mislukt}'")
+        return mislukt is None
+    
+    for actie, parameters in acties:
+        try:
+            fout = actie.controleer(parameters)
+            if fout is None:
+                for kolom in actie.leesKolommen(parameters) + actie.volledigeKolommen(parameters):
+                    if kolom not in excelHandler.kolomNamen:
+                        fout = f"Kolom '{kolom}' bestaat niet in het bestand"
+                        break
+            if fout is None:
+                for kolom in actie.schrijfKolommen(parameters):
+                    if kolom not in excelHandler.kolomNamen:
+                        fout = f"Doelkolom '{kolom}' bestaat niet in het bestand"
+                        break
+            if fout is None:
+                # Een gewijzigde veld-ID rij kan het schema en daarmee het bereik veranderen
+                if (doorgang is not None and doorgang.gewijzigd and doorgang.bereik[0] == 0
+                        and actie.bereikVolgtSchema(rijen)):
+                    if not schrijfDoorgangTerug():
+                        return resultaten
+                    doorgang = None
+                bereik = actie.bepaalBereik(rijen)
+                if bereik[1] < bereik[0]:
+                    fout = "Geen rijen om te bewerken"
+            if fout is None:
+                # Het bericht noemt het hele bereik, ook als alleen een chunk bewerkt wordt
+                rijBereik = _rijBereikTekst(bereik)
+                if venster is not None:
+                    bereik = (max(bereik[0], venster[0]), min(bereik[1], venster[1]))
+            if fout is not None:
+                resultaat = ActieResultaat(False, fout)
+            elif bereik[1] < bereik[0]:
+                # Het bereik van de actie valt buiten deze chunk
+                resultaat = ActieResultaat(True, actie.maakBericht(parameters, rijBereik, []))
+            else:
+                # Begin een nieuwe doorgang als deze actie niet in de open doorgang past
+                if doorgang is not None and (
+                    doorgang.bereik != bereik
+                    or set(actie.volledigeKolommen(parameters)) & set(doorgang.gewijzigd)
+                ):
+                    if not schrijfDoorgangTerug():
+                        return resultaten
+                    doorgang = None
+                if doorgang is None:
+                    doorgang = KolomDoorgang(bereik)
+                
+                gewijzigd = actie.bereken(parameters, doorgang)
+                for kolom, waarden in gewijzigd.items():
+                    doorgang.zet(kolom, waarden)
+                resultaat = ActieResultaat(
+                    True,
+                    actie.maakBericht(parameters, rijBereik, list(gewijzigd))
+                )
+        except ValueError as e:
+            resultaat = ActieResultaat(False, str(e))
+        except Exception as e:
+            logger.logFout(f"Fout bij uitvoeren {type(actie).__name__}: {e}")
+            resultaat = ActieResultaat(False, f"Fout bij uitvoeren actie: {e}")
+        
+        resultaten.append(resultaat)
+        if naElkeActie:
+            naElkeActie(resultaat)
+        if not resultaat.succes:
+            break
+    
+    if doorgang is not None:
+        schrijfDoorgangTerug()
+    return resultaten
@@ -0,0 +1,229 @@
+"""
+Actieregister voor Excelladin Reloaded
+Houdt van elke actie alleen de gegevens bij die de GUI en workflows vooraf nodig
+hebben (naam, categorie en beschrijving); de implementatie wordt pas bij het
+eerste gebruik geïmporteerd. Zo laadt een sessie die RentPro niet gebruikt ook
+de browserbibliotheken niet.
+
+Acties van andere pakketten worden gevonden via de entry point groep
+'excelladin.acties', bijvoorbeeld in pyproject.toml:
+
+    [project.entry-points."excelladin.acties"]
+    mijnActie = "mijn_pakket.acties:MijnActie"
+
+De naam van het entry point is de naam van de actie; de waarde verwijst naar een
+subklasse van ActieBasis die zonder argumenten aangemaakt kan worden.
+"""
+import importlib
+import importlib.metadata
+import threading
+from modules.logger import logger
+from modules.excel_handler import excelHandler
+from modules.actions.base import ActieResultaat
+
+# Groep waarin andere pakketten hun acties registreren
+ENTRY_POINT_GROEP = "excelladin.acties"
+
+class ActieRegistratie:
+    """
+    Gegevens van een geregistreerde actie, zonder de implementatie te importeren
+    
+    De implementatie wordt bij de eerste aanroep van laad() geïmporteerd en
+    aangemaakt; daarna wordt steeds dezelfde instantie teruggegeven.
+    """
+    
+    def __init__(self, naam, doel, beschrijving, categorie="Algemeen"):
+        """
+        Initialiseer een registratie
+        
+        Args:
+            naam (str): Naam van de actie
+            doel (str): Verwijzing naar de actieklasse als "module:Klasse"
+            beschrijving (str): Beschrijving van de actie
+            categorie (str): Categorie van de actie
+        """
+        self.naam = naam
+        self.doel = doel
+        self.beschrijving = beschrijving
+        self.categorie = categorie
+        self._actie = None
+        self._lock = threading.Lock()
+    
+    def isGeladen(self):
+        """
+        Controleer of de implementatie al geïmporteerd is
+        
+        Returns:
+            bool: True als de actie al geladen is
+        """
+        return self._actie is not None
+    
+    def laad(self):
+        """
+        Importeer en maak de actie aan bij het eerste gebruik
+        
+        Returns:
+            ActieBasis: De actie
+        
+        Raises:
+            ImportError: Als de module van de actie niet geïmporteerd kan worden
+            AttributeError: Als de klasse niet in de module bestaat
+        """
+        if self._actie is None:
+            # Werkthreads van een parallelle workflow kunnen tegelijk dezelfde actie opvragen
+            with self._lock:
+                if self._actie is None:
+                    moduleNaam, _, klasseNaam = self.doel.partition(':')
+                    klasse = getattr(importlib.import_module(moduleNaam), klasseNaam)
+                    actie = klasse()
+                    
+                    # De actie zelf is leidend, zodat ook de gegevens van plugins kloppen
+                    self.beschrijving = actie.beschrijving
+                    self.categorie = actie.categorie
+                    self._actie = actie
+                    logger.logInfo(f"Actie '{self.naam}' geladen uit {moduleNaam}")
+        return self._actie
+
+# Register met alle beschikbare acties (naam: ActieRegistratie)
+BESCHIKBARE_ACTIES = {}
+
+def registreerActie(naam, doel, beschrijving, categorie="Algemeen"):
+    """
+    Registreer een actie zonder de implementatie te importeren
+    
+    Args:
+        naam (str): Naam van de actie
+        doel (str): Verwijzing naar de actieklasse als "module:Klasse"
+        beschrijving (str): Beschrijving van de actie
+        categorie (str): Categorie van de actie
+    
+    Returns:
+        ActieRegistratie: De registratie
+    """
+    if naam in BESCHIKBARE_ACTIES:
+        logger.logWaarschuwing(f"Actie '{naam}' is al geregistreerd, wordt vervangen door {doel}")
+    
+    registratie = ActieRegistratie(naam, doel, beschrijving, categorie)
+    BESCHIKBARE_ACTIES[naam] = registratie
+    return registratie
+
+def _laadEntryPoints():
+    """Registreer de acties die andere pakketten aanbieden via entry points"""
+    try:
+        entryPoints = importlib.metadata.entry_points(group=ENTRY_POINT_GROEP)
+    except Exception as e:
+        logger.logWaarschuwing(f"Kon acties van andere pakketten niet opzoeken: {e}")
+        return
+    
+    for entryPoint in entryPoints:
+        if entryPoint.name in BESCHIKBARE_ACTIES:
+            logger.logWaarschuwing(f"Actie '{entryPoint.name}' uit {entryPoint.value} genegeerd: naam bestaat al")
+            continue
+        
+        # Tot de actie geladen is, dient de samenvatting van het pakket als beschrijving
+        beschrijving = entryPoint.value
+        if entryPoint.dist is not None:
+            beschrijving = entryPoint.dist.metadata.get('Summary') or beschrijving
+        registreerActie(entryPoint.name, entryPoint.value, beschrijving)
+
+def haalActieOp(actieNaam):
+    """
+    Haal een actie op basis van naam, en importeer hem bij het eerste gebruik
+    
+    Args:
+        actieNaam (str): Naam van de actie
+    
+    Returns:
+        ActieBasis: De actie of None als de actie niet bestaat of niet geladen kan worden
+    """
+    registratie = BESCHIKBARE_ACTIES.get(actieNaam)
+    if registratie is None:
+        return None
+    
+    try:
+        return registratie.laad()
+    except Exception as e:
+        logger.logFout(f"Kan actie '{actieNaam}' niet laden uit {registratie.doel}: {e}")
+        return None
+
+def voerActieUit(actieNaam, parameters, rijen=None):
+    """
+    Voer een actie uit
+    
+    Args:
+        actieNaam (str): Naam van de actie
+        parameters (dict): Parameters voor de actie
+        rijen (tuple): Optioneel, tuple met (startRij, eindRij) om alleen een bereik te bewerken
+    
+    Returns:
+        ActieResultaat: Resultaat van de actie
+    """
+    actie = haalActieOp(actieNaam)
+    
+    if actie is None:
+        if actieNaam in BESCHIKBARE_ACTIES:
+            return ActieResultaat(False, f"Actie '{actieNaam}' kon niet worden geladen, zie het logboek")
+        logger.logFout(f"Actie '{actieNaam}' bestaat niet")
+        return ActieResultaat(False, f"Actie '{actieNaam}' bestaat niet")
+    
+    logger.logInfo(f"Voer actie uit: {actieNaam}")
+    
+    # Alle wijzigingen van de actie vormen samen één ongedaan te maken stap
+    with excelHandler.bewerking(actieNaam):
+        resultaat = actie.voerUit(parameters, rijen)
+        excelHandler.schrijfBufferDoor()
+    return resultaat
+
+# Lokale sheet acties
+registreerActie(
+    "kolomVullen", "modules.actions.lokaal:KolomVullenActie",
+    "Vul een kolom met gecombineerde data uit andere kolommen",
+    "Lokale sheet bijwerken"
+)
+registreerActie(
+    "kolomSchoonmaken", "modules.actions.lokaal:KolomSchoonmakenActie",
+    "Schoon een of meer kolommen op door onnodige tekens te verwijderen",
+    "Lokale sheet bijwerken"
+)
+registreerActie(
+    "kolomBerekenen", "modules.actions.lokaal:KolomBerekenenActie",
+    "Bereken een kolom met een formule, zoals een verkoopprijs uit inkoopprijs en marge",
+    "Lokale sheet bijwerken"
+)
+
+# RentPro inlezen acties
+registreerActie(
+    "rentProInlezen", "modules.actions.rentpro_inlezen:RentProInlezenActie",
+    "Haalt productdata op van RentPro en importeert in Excel",
+    "Inlezen vanuit RentPro"
+)
+registreerActie(
+    "rentProMeerdereInlezen", "modules.actions.rentpro_inlezen:RentProMeerdereInlezenActie",
+    "Haalt data op van meerdere producten uit RentPro en importeert in Excel",
+    "Inlezen vanuit RentPro"
+)
+registreerActie(
+    "rentProZoekInlezen", "modules.actions.rentpro_inlezen:RentProZoekInlezenActie",
+    "Zoekt producten in RentPro en importeert de gevonden data in Excel",
+    "Inlezen vanuit RentPro"
+)
+
+# RentPro upload acties
+registreerActie(
+    "rentProUpload", "modules.actions.rentpro_upload:RentProUploadActie",
+    "Uploadt productdata van Excel naar RentPro",
+    "Uploaden naar RentPro"
+)
+registreerActie(
+    "rentProBulkUpload", "modules.actions.rentpro_upload:RentProBulkUploadActie",
+    "Uploadt meerdere producten in bulk van Excel naar RentPro",
+    "Uploaden naar RentPro"
+)
+registreerActie(
+    "rentProUpdate", "modules.actions.rentpro_upload:RentProUpdateActie",
+    "Update bestaande producten in RentPro met data uit Excel",
+    "Uploaden naar RentPro"
+)
+
+# Acties van andere pakketten
+_laadEntryPoints()
@@ -3,11 +3,16 @@ RentPro connector module voor Excelladin Reloaded
 Verantwoordelijk voor de interactie met RentPro via Puppeteer
 """
 import os
+import re
 import sys
 import asyncio
 import configparser
 from pyppeteer import launch
 from modules.logger import logger
+from modules.rentpro.http_cache import httpCache
+
+# Het product-ID in de URL van een Edit- of Details-pagina
+_PRODUCT_URL_PATROON = re.compile(r'/Product/(?:Edit|Details)/([^/?#]+)', re.IGNORECASE)
 
 def run_async(coroutine):
     """
@@ -336,6 +341,9 @@ class RentProConnector:
         """
         Klik op de opslaan knop
         
+        Na het klikken worden de bewaarde pagina's van het product uit de
+        HTTP-cache verwijderd, zodat een synchronisatie de nieuwe waarden ophaalt.
+        
         Returns:
             bool: True als klikken succesvol is, anders False
         """
@@ -356,10 +364,15 @@ class RentProConnector:
             await asyncio.sleep(1)
             
             # Klik op de knop
+            bewerkt_url = self.page.url
             await button.click()
             
-            # Wacht op paginawissel
-            await self.page.waitForNavigation()
+            try:
+                # Wacht op paginawissel
+                await self.page.waitForNavigation()
+            finally:
+                # Ook als het wachten mislukt kan het product al opgeslagen zijn
+                self._vergeet_product(bewerkt_url, self.page.url)
             
             return True
         
@@ -367,6 +380,21 @@ class RentProConnector:
             logger.logFout(f"Fout bij klikken op opslaan knop: {e}")
             return False
     
+    def _vergeet_product(self, *urls):
+        """
+        Verwijder de bewaarde pagina's van de producten in de gegeven URL's uit de HTTP-cache
+        
+        Een nieuw product heeft pas na het opslaan een ID, vandaar zowel de URL
+        van voor als na het opslaan.
+        
+        Args:
+            *urls (str): URL's van pagina's van het product
+        """
+        for url in urls:
+            match = _PRODUCT_URL_PATROON.search(url or '')
+            if match:
+                httpCache.verwijder_product(match.group(1))
+    
     async def lees_product_data(self, product_id):
         """
         Haal productgegevens op
@@ -441,7 +469,10 @@ class RentProConnector:
     
     def lees_veld_mappings(self):
         """
-        Leest de eerste twee rijen van de Excel sheet voor veldnaam/ID mappings
+        Haalt de veldnaam/ID mappings op uit het kopschema van de Excel sheet
+        
+        Het schema (labels in de kopregel, veld-ID's in de rij daaronder) wordt
+        bij het openen van het bestand één keer opgebouwd door de ExcelHandler.
         
         Returns:
             dict: Dictionary met veldnaam -> veld_id mappings
@@ -450,23 +481,5 @@ class RentProConnector:
         
         if not excelHandler.isBestandGeopend():
             raise ValueError("Geen Excel-bestand geopend")
-            
-        # Lees alle kolommen in eerste rij (veldnamen)
-        veldnamen = []
-        veld_ids = []
-        
-        for kolom in excelHandler.kolomNamen:
-            namen = excelHandler.haalKolomOp(kolom, (0, 0))
-            ids = excelHandler.haalKolomOp(kolom, (1, 1))
-            
-            if namen and ids:
-                veldnamen.append(namen[0])
-                veld_ids.append(ids[0])
-        
-        # Maak mapping dictionary
-        mappings = {}
-        for i, naam in enumerate(veldnamen):
-            if i < len(veld_ids) and naam and veld_ids[i]:
-                mappings[naam] = veld_ids[i]
         
-        return mappings
+        return excelHandler.haalSchema().labelNaarVeldId
@@ -7,10 +7,13 @@ from modules.logger import logger
 from modules.excel_handler import excelHandler
 from modules.actions.base import ActieBasis, ActieResultaat
 from modules.actions.rentpro import RentProConnector, run_async
+from modules.workflow_checkpoint import huidigeCheckpoint
 
 class RentProInlezenActie(ActieBasis):
     """Actie om product data in te lezen vanuit RentPro"""
     
+    verplichteParameters = ("product_id", "doelKolommen")
+    
     def __init__(self):
         """Initialiseer de RentPro inlezen actie"""
         super().__init__(
@@ -19,6 +22,14 @@ class RentProInlezenActie(ActieBasis):
             categorie="Inlezen vanuit RentPro"
         )
     
+    def leesKolommen(self, parameters):
+        """Leest geen kolommen uit het werkblad"""
+        return []
+    
+    def schrijfKolommen(self, parameters):
+        """De doelkolommen"""
+        return list(parameters.get("doelKolommen", []))
+    
     def voerUit(self, parameters, rijen=None):
         """
         Implementatie van de actie
@@ -92,8 +103,8 @@ class RentProInlezenActie(ActieBasis):
                     f"Fout bij lezen veldmappings: {e}"
                 )
             
-            # Omgekeerde mapping maken (veld_id -> kolomnaam)
-            omgekeerde_mapping = {v: k for k, v in veld_mappings.items()}
+            # Doelkolommen met een veld-ID eenmalig uit het schema bepalen
+            doel_velden = [(kolom, veld_mappings[kolom]) for kolom in doelKolommen if kolom in veld_mappings]
             
             # Bepaal het aantal rijen
             if rijen:
@@ -102,16 +113,14 @@ class RentProInlezenActie(ActieBasis):
                 rij_index = startRij
             else:
                 aantalRijen = 1
-                rij_index = 0  # Standaard naar eerste rij schrijven
+                rij_index = excelHandler.haalSchema().eersteDataRij  # Standaard naar eerste productrij schrijven
             
             # Vul Excel met product data
-            for kolom in doelKolommen:
-                if kolom in veld_mappings:
-                    veld_id = veld_mappings[kolom]
-                    if veld_id in product_data:
-                        waarde = product_data[veld_id]
-                        excelHandler.bewerkKolom(kolom, [waarde], (rij_index, rij_index))
-                        logger.logInfo(f"Kolom '{kolom}' gevuld met waarde '{waarde}'")
+            for kolom, veld_id in doel_velden:
+                if veld_id in product_data:
+                    waarde = product_data[veld_id]
+                    excelHandler.bewerkKolom(kolom, [waarde], (rij_index, rij_index))
+                    logger.logInfo(f"Kolom '{kolom}' gevuld met waarde '{waarde}'")
             
             # Sluit browser
             run_async(connector.sluit())
@@ -128,6 +137,10 @@ class RentProInlezenActie(ActieBasis):
 class RentProMeerdereInlezenActie(ActieBasis):
     """Actie om meerdere producten in te lezen vanuit RentPro"""
     
+    # Ingelezen rijen worden met hun waarden vastgelegd, zodat een afgebroken run hervat kan worden
+    hervatbaar = True
+    verplichteParameters = ("product_ids", "doelKolommen")
+    
     def __init__(self):
         """Initialiseer de RentPro meerdere inlezen actie"""
         super().__init__(
@@ -136,6 +149,14 @@ class RentProMeerdereInlezenActie(ActieBasis):
             categorie="Inlezen vanuit RentPro"
         )
     
+    def leesKolommen(self, parameters):
+        """Leest geen kolommen uit het werkblad"""
+        return []
+    
+    def schrijfKolommen(self, parameters):
+        """De doelkolommen"""
+        return list(parameters.get("doelKolommen", []))
+    
     def voerUit(self, parameters, rijen=None):
         """
         Implementatie van de actie
@@ -182,8 +203,10 @@ class RentProMeerdereInlezenActie(ActieBasis):
                 startRij, eindRij = rijen
                 aantalRijen = eindRij - startRij + 1
             else:
-                aantalRijen = excelHandler.haalRijAantal()
-                startRij, eindRij = 0, aantalRijen - 1
+                # De veld-ID rij van het importsjabloon is geen productrij
+                startRij = excelHandler.haalSchema().eersteDataRij
+                eindRij = excelHandler.haalRijAantal() - 1
+                aantalRijen = eindRij - startRij + 1
             
             # Controleer of er genoeg rijen zijn
             if len(product_ids) > aantalRijen:
@@ -192,6 +215,26 @@ class RentProMeerdereInlezenActie(ActieBasis):
                     f"Niet genoeg rijen beschikbaar. Nodig: {len(product_ids)}, Beschikbaar: {aantalRijen}"
                 )
             
+            # Rijen uit een eerdere run opnieuw invullen zonder RentPro te benaderen
+            checkpoint = huidigeCheckpoint()
+            voltooid = checkpoint.voltooid()
+            te_doen = []
+            for i, product_id in enumerate(product_ids):
+                rij_index = startRij + i
+                if str(rij_index) not in voltooid:
+                    te_doen.append((i, product_id))
+                    continue
+                for kolom, waarde in (voltooid[str(rij_index)] or {}).items():
+                    excelHandler.bewerkKolom(kolom, [waarde], (rij_index, rij_index))
+            
+            if voltooid:
+                logger.logInfo(f"{len(product_ids) - len(te_doen)} producten overgenomen uit een eerdere run")
+            if not te_doen:
+                return ActieResultaat(
+                    True,
+                    f"Product data succesvol ingelezen voor {len(product_ids)} producten (hervat)"
+                )
+            
             # Maak RentPro connector
             connector = RentProConnector()
             
@@ -213,11 +256,11 @@ class RentProMeerdereInlezenActie(ActieBasis):
                     f"Fout bij lezen veldmappings: {e}"
                 )
             
-            # Omgekeerde mapping maken (veld_id -> kolomnaam)
-            omgekeerde_mapping = {v: k for k, v in veld_mappings.items()}
+            # Doelkolommen met een veld-ID eenmalig uit het schema bepalen
+            doel_velden = [(kolom, veld_mappings[kolom]) for kolom in doelKolommen if kolom in veld_mappings]
             
-            # Verwerk elk product
-            for i, product_id in enumerate(product_ids):
+            # Verwerk elk product dat nog niet is ingelezen
+            for i, product_id in te_doen:
                 rij_index = startRij + i
                 
                 # Haal product data op
@@ -229,13 +272,14 @@ class RentProMeerdereInlezenActie(ActieBasis):
                     continue
                 
                 # Vul Excel met product data
-                for kolom in doelKolommen:
-                    if kolom in veld_mappings:
-                        veld_id = veld_mappings[kolom]
-                        if veld_id in product_data:
-                            waarde = product_data[veld_id]
-                            excelHandler.bewerkKolom(kolom, [waarde], (rij_index, rij_index))
-                            logger.logInfo(f"Kolom '{kolom}' gevuld met waarde '{waarde}' voor rij {rij_index+1}")
+                ingevuld = {}
+                for kolom, veld_id in doel_velden:
+                    if veld_id in product_data:
+                        waarde = product_data[veld_id]
+                        excelHandler.bewerkKolom(kolom, [waarde], (rij_index, rij_index))
+                        ingevuld[kolom] = waarde
+                        logger.logInfo(f"Kolom '{kolom}' gevuld met waarde '{waarde}' voor rij {rij_index+1}")
+                checkpoint.markeer(rij_index, ingevuld)
             
             # Sluit browser
             run_async(connector.sluit())
@@ -252,6 +296,8 @@ class RentProMeerdereInlezenActie(ActieBasis):
 class RentProZoekInlezenActie(ActieBasis):
     """Actie om producten te zoeken en in te lezen vanuit RentPro"""
     
+    verplichteParameters = ("zoekterm", "doelKolommen")
+    
     def __init__(self):
         """Initialiseer de RentPro zoek en inlezen actie"""
         super().__init__(
@@ -260,6 +306,14 @@ class RentProZoekInlezenActie(ActieBasis):
             categorie="Inlezen vanuit RentPro"
         )
     
+    def leesKolommen(self, parameters):
+        """Leest geen kolommen uit het werkblad"""
+        return []
+    
+    def schrijfKolommen(self, parameters):
+        """De doelkolommen"""
+        return list(parameters.get("doelKolommen", []))
+    
     def voerUit(self, parameters, rijen=None):
         """
         Implementatie van de actie
@@ -308,8 +362,10 @@ class RentProZoekInlezenActie(ActieBasis):
                 startRij, eindRij = rijen
                 aantalRijen = eindRij - startRij + 1
             else:
-                aantalRijen = excelHandler.haalRijAantal()
-                startRij, eindRij = 0, aantalRijen - 1
+                # De veld-ID rij van het importsjabloon is geen productrij
+                startRij = excelHandler.haalSchema().eersteDataRij
+                eindRij = excelHandler.haalRijAantal() - 1
+                aantalRijen = eindRij - startRij + 1
             
             # Maak RentPro connector
             connector = RentProConnector()
@@ -355,6 +411,9 @@ class RentProZoekInlezenActie(ActieBasis):
                     f"Fout bij lezen veldmappings: {e}"
                 )
             
+            # Doelkolommen met een veld-ID eenmalig uit het schema bepalen
+            doel_velden = [(kolom, veld_mappings[kolom]) for kolom in doelKolommen if kolom in veld_mappings]
+            
             # Controleer of er genoeg rijen zijn
             if len(search_results) > aantalRijen:
                 logger.logWaarschuwing(f"Meer resultaten gevonden ({len(search_results)}) dan beschikbare rijen ({aantalRijen}). Alleen de eerste {aantalRijen} resultaten worden ingelezen.")
@@ -373,13 +432,11 @@ class RentProZoekInlezenActie(ActieBasis):
                     continue
                 
                 # Vul Excel met product data
-                for kolom in doelKolommen:
-                    if kolom in veld_mappings:
-                        veld_id = veld_mappings[kolom]
-                        if veld_id in product_data:
-                            waarde = product_data[veld_id]
-                            excelHandler.bewerkKolom(kolom, [waarde], (rij_index, rij_index))
-                            logger.logInfo(f"Kolom '{kolom}' gevuld met waarde '{waarde}' voor rij {rij_index+1}")
+                for kolom, veld_id in doel_velden:
+                    if veld_id in product_data:
+                        waarde = product_data[veld_id]
+                        excelHandler.bewerkKolom(kolom, [waarde], (rij_index, rij_index))
+                        logger.logInfo(f"Kolom '{kolom}' gevuld met waarde '{waarde}' voor rij {rij_index+1}")
             
             # Sluit browser
             run_async(connector.sluit())
@@ -7,10 +7,13 @@ from modules.logger import logger
 from modules.excel_handler import excelHandler
 from modules.actions.base import ActieBasis, ActieResultaat
 from modules.actions.rentpro import RentProConnector, run_async
+from modules.workflow_checkpoint import huidigeCheckpoint
 
 class RentProUploadActie(ActieBasis):
     """Actie om product data te uploaden naar RentPro"""
     
+    verplichteParameters = ("bronKolommen",)
+    
     def __init__(self):
         """Initialiseer de RentPro upload actie"""
         super().__init__(
@@ -19,6 +22,14 @@ class RentProUploadActie(ActieBasis):
             categorie="Uploaden naar RentPro"
         )
     
+    def leesKolommen(self, parameters):
+        """De bronkolommen"""
+        return list(parameters.get("bronKolommen", []))
+    
+    def schrijfKolommen(self, parameters):
+        """Schrijft niet in het werkblad"""
+        return []
+    
     def voerUit(self, parameters, rijen=None):
         """
         Implementatie van de actie
@@ -63,8 +74,10 @@ class RentProUploadActie(ActieBasis):
                 startRij, eindRij = rijen
                 aantalRijen = eindRij - startRij + 1
             else:
-                aantalRijen = excelHandler.haalRijAantal()
-                startRij, eindRij = 0, aantalRijen - 1
+                # De veld-ID rij van het importsjabloon is geen productrij
+                startRij = excelHandler.haalSchema().eersteDataRij
+                eindRij = excelHandler.haalRijAantal() - 1
+                aantalRijen = eindRij - startRij + 1
             
             # Maak RentPro connector
             connector = RentProConnector()
@@ -97,10 +110,9 @@ class RentProUploadActie(ActieBasis):
                 
                 # Verzamel data uit Excel
                 rij_data = {}
-                for kolom in bronKolommen:
-                    waarden = excelHandler.haalKolomOp(kolom, (rij_index, rij_index))
-                    if waarden and waarden[0]:  # Controleer of er een waarde is
-                        rij_data[kolom] = waarden[0]
+                for kolom, waarde in excelHandler.getRowValues(rij_index, bronKolommen).items():
+                    if waarde:  # Controleer of er een waarde is
+                        rij_data[kolom] = waarde
                 
                 # Controleer of er data is
                 if not rij_data:
@@ -138,6 +150,10 @@ class RentProUploadActie(ActieBasis):
 class RentProBulkUploadActie(ActieBasis):
     """Actie om meerdere producten in bulk te uploaden naar RentPro"""
     
+    # Voltooide rijen worden vastgelegd, zodat een afgebroken run hervat kan worden
+    hervatbaar = True
+    verplichteParameters = ("bronKolommen",)
+    
     def __init__(self):
         """Initialiseer de RentPro bulk upload actie"""
         super().__init__(
@@ -146,6 +162,14 @@ class RentProBulkUploadActie(ActieBasis):
             categorie="Uploaden naar RentPro"
         )
     
+    def leesKolommen(self, parameters):
+        """De bronkolommen"""
+        return list(parameters.get("bronKolommen", []))
+    
+    def schrijfKolommen(self, parameters):
+        """Schrijft niet in het werkblad"""
+        return []
+    
     def voerUit(self, parameters, rijen=None):
         """
         Implementatie van de actie
@@ -192,8 +216,16 @@ class RentProBulkUploadActie(ActieBasis):
                 startRij, eindRij = rijen
                 aantalRijen = eindRij - startRij + 1
             else:
-                aantalRijen = excelHandler.haalRijAantal()
-                startRij, eindRij = 0, aantalRijen - 1
+                # De veld-ID rij van het importsjabloon is geen productrij
+                startRij = excelHandler.haalSchema().eersteDataRij
+                eindRij = excelHandler.haalRijAantal() - 1
+                aantalRijen = eindRij - startRij + 1
+            
+            # Rijen die in een eerdere run al zijn geüpload overslaan
+            checkpoint = huidigeCheckpoint()
+            voltooid = checkpoint.voltooid()
+            if voltooid:
+                logger.logInfo(f"{len(voltooid)} rijen zijn in een eerdere run al geüpload en worden overgeslagen")
             
             # Maak RentPro connector
             connector = RentProConnector()
@@ -225,6 +257,9 @@ class RentProBulkUploadActie(ActieBasis):
                 
                 # Verwerk elke rij in de batch
                 for rij_index in range(batch_start, batch_eind + 1):
+                    if str(rij_index) in voltooid:
+                        continue
+                    
                     # Navigeer naar nieuw product pagina
                     logger.logInfo(f"Navigeren naar nieuw product pagina voor rij {rij_index+1}...")
                     if not run_async(connector.navigeer_naar_nieuw_product()):
@@ -233,10 +268,9 @@ class RentProBulkUploadActie(ActieBasis):
                     
                     # Verzamel data uit Excel
                     rij_data = {}
-                    for kolom in bronKolommen:
-                        waarden = excelHandler.haalKolomOp(kolom, (rij_index, rij_index))
-                        if waarden and waarden[0]:  # Controleer of er een waarde is
-                            rij_data[kolom] = waarden[0]
+                    for kolom, waarde in excelHandler.getRowValues(rij_index, bronKolommen).items():
+                        if waarde:  # Controleer of er een waarde is
+                            rij_data[kolom] = waarde
                     
                     # Controleer of er data is
                     if not rij_data:
@@ -258,6 +292,7 @@ class RentProBulkUploadActie(ActieBasis):
                         continue
                     
                     logger.logInfo(f"Product succesvol opgeslagen voor rij {rij_index+1}")
+                    checkpoint.markeer(rij_index)
                     totaal_verwerkt += 1
             
             # Sluit browser
@@ -266,6 +301,7 @@ class RentProBulkUploadActie(ActieBasis):
             return ActieResultaat(
                 True,
                 f"{totaal_verwerkt} producten succesvol geüpload"
+                + (f" ({len(voltooid)} al geüpload in een eerdere run)" if voltooid else "")
             )
         
         except Exception as e:
@@ -275,6 +311,8 @@ class RentProBulkUploadActie(ActieBasis):
 class RentProUpdateActie(ActieBasis):
     """Actie om bestaande producten te updaten in RentPro"""
     
+    verplichteParameters = ("product_id_kolom", "bronKolommen")
+    
     def __init__(self):
         """Initialiseer de RentPro update actie"""
         super().__init__(
@@ -283,6 +321,15 @@ class RentProUpdateActie(ActieBasis):
             categorie="Uploaden naar RentPro"
         )
     
+    def leesKolommen(self, parameters):
+        """De kolom met product IDs en de bronkolommen"""
+        kolommen = [parameters["product_id_kolom"]] if "product_id_kolom" in parameters else []
+        return kolommen + list(parameters.get("bronKolommen", []))
+    
+    def schrijfKolommen(self, parameters):
+        """Schrijft niet in het werkblad"""
+        return []
+    
     def voerUit(self, parameters, rijen=None):
         """
         Implementatie van de actie
@@ -335,8 +382,10 @@ class RentProUpdateActie(ActieBasis):
                 startRij, eindRij = rijen
                 aantalRijen = eindRij - startRij + 1
             else:
-                aantalRijen = excelHandler.haalRijAantal()
-                startRij, eindRij = 0, aantalRijen - 1
+                # De veld-ID rij van het importsjabloon is geen productrij
+                startRij = excelHandler.haalSchema().eersteDataRij
+                eindRij = excelHandler.haalRijAantal() - 1
+                aantalRijen = eindRij - startRij + 1
             
             # Maak RentPro connector
             connector = RentProConnector()
@@ -360,7 +409,7 @@ class RentProUpdateActie(ActieBasis):
                 )
             
             # Haal product IDs op
-            product_ids = excelHandler.haalKolomOp(product_id_kolom, rijen)
+            product_ids = excelHandler.haalKolomOp(product_id_kolom, (startRij, eindRij))
             
             # Verwerk elke rij
             totaal_verwerkt = 0
@@ -384,10 +433,9 @@ class RentProUpdateActie(ActieBasis):
                 
                 # Verzamel data uit Excel
                 rij_data = {}
-                for kolom in bronKolommen:
-                    waarden = excelHandler.haalKolomOp(kolom, (rij_index, rij_index))
-                    if waarden and waarden[0]:  # Controleer of er een waarde is
-                        rij_data[kolom] = waarden[0]
+                for kolom, waarde in excelHandler.getRowValues(rij_index, bronKolommen).items():
+                    if waarde:  # Controleer of er een waarde is
+                        rij_data[kolom] = waarde
                 
                 # Controleer of er data is
                 if not rij_data:
@@ -0,0 +1,359 @@
+"""
+Excel Cache module voor Excelladin Reloaded
+Bewaart ingelezen werkbladen als binair sidecar-bestand naast het werkboek,
+zodat het opnieuw openen van hetzelfde bestand het parsen van xlsx overslaat
+
+De cache staat naast het werkboek en reist dus mee met gedeelde mappen. Daarom
+is het formaat niet uitvoerbaar: een NumPy .npz-archief dat zonder pickle wordt
+gelezen, met per kolom een array en een JSON-beschrijving van de datatypes.
+Parquet/Feather vallen af omdat ingelezen kolommen vaak gemengde waarden
+(tekst, getallen en datums door elkaar) bevatten.
+"""
+import os
+import json
+import hashlib
+import datetime
+import numpy as np
+import pandas as pd
+from modules.logger import logger
+from modules.excel_opslaan import schrijfAtomisch
+
+# Map (naast het werkboek) waarin de cachebestanden worden bewaard
+CACHE_MAP = ".excelladin_cache"
+
+# Verhoog bij een wijziging in het cacheformaat zodat oude caches vervallen
+CACHE_VERSIE = 2
+
+# Waarden die in een object-kolom van de cache mogen voorkomen
+_JSON_TYPES = (str, int, float, bool, type(None))
+_DATUM_TYPES = (pd.Timestamp, datetime.datetime, datetime.date, datetime.time, datetime.timedelta)
+
+class _NietTeCachen(Exception):
+    """Intern signaal dat een DataFrame niet in het cacheformaat past"""
+
+def berekenBestandsHash(bestandspad):
+    """
+    Bereken de inhoudshash van een bestand
+    
+    Args:
+        bestandspad (str): Pad naar het bestand
+    
+    Returns:
+        str: Hexadecimale BLAKE2b hash van de inhoud
+    """
+    hasher = hashlib.blake2b(digest_size=20)
+    with open(bestandspad, 'rb') as bestand:
+        for blok in iter(lambda: bestand.read(1024 * 1024), b''):
+            hasher.update(blok)
+    return hasher.hexdigest()
+
+def _cachePaden(bestandspad, werkblad=None):
+    """
+    Bepaal de paden van het metadata- en databestand van de cache
+    
+    Args:
+        bestandspad (str): Pad naar het werkboek
+        werkblad (str): Optioneel, naam van het werkblad
+    
+    Returns:
+        tuple: (metaPad, dataPad)
+    """
+    absoluutPad = os.path.abspath(bestandspad)
+    padHash = hashlib.blake2b(f"{absoluutPad}\0{werkblad or ''}".encode('utf-8'), digest_size=8).hexdigest()
+    basis = f"{os.path.basename(absoluutPad)}.{padHash}"
+    cacheMap = os.path.join(os.path.dirname(absoluutPad), CACHE_MAP)
+    return (
+        os.path.join(cacheMap, f"{basis}.json"),
+        os.path.join(cacheMap, f"{basis}.npz")
+    )
+
+def maakCacheSleutel(bestandspad, werkblad=None, bestandsHash=None):
+    """
+    Maak de cachesleutel van een werkboek
+    
+    Bepaal de sleutel vóór het inlezen, zodat een wijziging van het bestand
+    tijdens het inlezen niet tot een verkeerde cache leidt.
+    
+    Args:
+        bestandspad (str): Pad naar het werkboek
+        werkblad (str): Optioneel, naam van het werkblad
+        bestandsHash (str): Optioneel, al berekende inhoudshash
+    
+    Returns:
+        dict: Sleutel met pad, werkblad, wijzigingstijd, grootte, inhoudshash en versies
+    """
+    status = os.stat(bestandspad)
+    return {
+        'pad': os.path.abspath(bestandspad),
+        'werkblad': werkblad,
+        'mtime_ns': status.st_mtime_ns,
+        'grootte': status.st_size,
+        'hash': bestandsHash or berekenBestandsHash(bestandspad),
+        'cache_versie': CACHE_VERSIE,
+        'pandas_versie': pd.__version__
+    }
+
+def laadUitCache(bestandspad, werkblad=None):
+    """
+    Laad een werkblad uit de sidecar-cache als die nog geldig is
+    
+    De cache is geldig als pad, grootte en inhoudshash overeenkomen met het
+    huidige bestand. Bij een gelijke wijzigingstijd en grootte wordt de hash
+    niet opnieuw berekend.
+    
+    Args:
+        bestandspad (str): Pad naar het werkboek
+        werkblad (str): Optioneel, naam van het werkblad
+    
+    Returns:
+        pandas.DataFrame: De gecachte data, of None als er geen geldige cache is
+    """
+    metaPad, dataPad = _cachePaden(bestandspad, werkblad)
+    if not (os.path.exists(metaPad) and os.path.exists(dataPad)):
+        return None
+    
+    try:
+        with open(metaPad, 'r', encoding='utf-8') as bestand:
+            sleutel = json.load(bestand)
+        
+        status = os.stat(bestandspad)
+        if (
+            sleutel.get('pad') != os.path.abspath(bestandspad)
+            or sleutel.get('werkblad') != werkblad
+            or sleutel.get('grootte') != status.st_size
+            or sleutel.get('cache_versie') != CACHE_VERSIE
+            or sleutel.get('pandas_versie') != pd.__version__
+        ):
+            logger.logInfo(f"Cache van {bestandspad} is verouderd")
+            return None
+        
+        # Andere wijzigingstijd maar zelfde grootte: controleer de inhoud
+        if sleutel.get('mtime_ns') != status.st_mtime_ns:
+            bestandsHash = berekenBestandsHash(bestandspad)
+            if bestandsHash != sleutel.get('hash'):
+                logger.logInfo(f"Cache van {bestandspad} is verouderd (inhoud gewijzigd)")
+                return None
+            
+            # Inhoud ongewijzigd, werk de sleutel bij voor de volgende keer
+            sleutel['mtime_ns'] = status.st_mtime_ns
+            schrijfAtomisch(metaPad, lambda pad: _schrijfJson(pad, sleutel))
+        
+        dataFrame = _leesData(dataPad)
+        
+        logger.logInfo(f"Werkblad geladen uit cache: {bestandspad}")
+        return dataFrame
+    except Exception as e:
+        logger.logWaarschuwing(f"Kon cache van {bestandspad} niet laden: {e}")
+        return None
+
+def schrijfNaarCache(bestandspad, dataFrame, sleutel=None, werkblad=None):
+    """
+    Bewaar een ingelezen werkblad in de sidecar-cache
+    
+    Args:
+        bestandspad (str): Pad naar het werkboek waaruit de data is ingelezen
+        dataFrame (pandas.DataFrame): De ingelezen data
+        sleutel (dict): Optioneel, cachesleutel van vóór het inlezen (zie maakCacheSleutel)
+        werkblad (str): Optioneel, naam van het werkblad
+    
+    Returns:
+        bool: True als de cache is geschreven, anders False
+    """
+    if sleutel is not None:
+        werkblad = sleutel.get('werkblad')
+    metaPad, dataPad = _cachePaden(bestandspad, werkblad)
+    
+    try:
+        if sleutel is None:
+            sleutel = maakCacheSleutel(bestandspad, werkblad)
+        os.makedirs(os.path.dirname(metaPad), exist_ok=True)
+        
+        # Eerst de data, dan de sleutel: een cache zonder passende sleutel wordt nooit gebruikt
+        schrijfAtomisch(dataPad, lambda pad: _schrijfData(pad, dataFrame))
+        schrijfAtomisch(metaPad, lambda pad: _schrijfJson(pad, sleutel))
+        
+        logger.logInfo(f"Cache bijgewerkt voor {bestandspad}")
+        return True
+    except _NietTeCachen as e:
+        logger.logInfo(f"Geen cache voor {bestandspad}: {e}")
+        return False
+    except Exception as e:
+        logger.logWaarschuwing(f"Kon cache voor {bestandspad} niet schrijven: {e}")
+        return False
+
+def verwijderCache(bestandspad, werkblad=None):
+    """
+    Verwijder de sidecar-cache van een werkblad
+    
+    Args:
+        bestandspad (str): Pad naar het werkboek
+        werkblad (str): Optioneel, naam van het werkblad
+    """
+    for pad in _cachePaden(bestandspad, werkblad):
+        try:
+            if os.path.exists(pad):
+                os.remove(pad)
+        except Exception as e:
+            logger.logWaarschuwing(f"Kon cachebestand {pad} niet verwijderen: {e}")
+
+def _naarJson(waarde):
+    """Zet een datum, tijd of NumPy-waarde om naar een JSON-object met type"""
+    if waarde is pd.NaT:
+        return {'__type': 'NaT'}
+    if isinstance(waarde, np.generic):
+        return waarde.item()
+    if isinstance(waarde, pd.Timestamp):
+        return {'__type': 'Timestamp', 'v': waarde.isoformat()}
+    if isinstance(waarde, datetime.datetime):
+        return {'__type': 'datetime', 'v': waarde.isoformat()}
+    if isinstance(waarde, datetime.date):
+        return {'__type': 'date', 'v': waarde.isoformat()}
+    if isinstance(waarde, datetime.time):
+        return {'__type': 'time', 'v': waarde.isoformat()}
+    if isinstance(waarde, pd.Timedelta):
+        return {'__type': 'Timedelta', 'v': waarde.value}
+    if isinstance(waarde, datetime.timedelta):
+        return {'__type': 'timedelta', 'v': [waarde.days, waarde.seconds, waarde.microseconds]}
+    raise _NietTeCachen(f"waarde van type {type(waarde).__name__}")
+
+def _vanJson(object_):
+    """Zet een JSON-object met type terug naar de oorspronkelijke waarde; andere objecten blijven dicts"""
+    soort = object_.get('__type')
+    if soort is None:
+        return object_
+    if soort == 'NaT':
+        return pd.NaT
+    if soort == 'Timestamp':
+        return pd.Timestamp(object_['v'])
+    if soort == 'datetime':
+        return datetime.datetime.fromisoformat(object_['v'])
+    if soort == 'date':
+        return datetime.date.fromisoformat(object_['v'])
+    if soort == 'time':
+        return datetime.time.fromisoformat(object_['v'])
+    if soort == 'Timedelta':
+        return pd.Timedelta(object_['v'])
+    if soort == 'timedelta':
+        return datetime.timedelta(*object_['v'])
+    raise ValueError(f"Onbekend type in cache: {soort}")
+
+def _codeerWaarden(waarden):
+    """
+    Codeer een reeks losse waarden als JSON-bytes
+    
+    Args:
+        waarden: Reeks met tekst, getallen, booleans, None en datums
+    
+    Returns:
+        numpy.ndarray: De JSON als uint8-array
+    
+    Raises:
+        _NietTeCachen: Als er een waarde in staat die niet gecodeerd kan worden
+    """
+    waarden = list(waarden)
+    for soort in set(map(type, waarden)):
+        if not issubclass(soort, _JSON_TYPES + _DATUM_TYPES + (np.generic, type(pd.NaT))):
+            raise _NietTeCachen(f"waarde van type {soort.__name__}")
+    return _naarBytes(waarden)
+
+def _naarBytes(gegevens):
+    """Zet gegevens om naar JSON als uint8-array, zodat ze zonder pickle in een .npz passen"""
+    tekst = json.dumps(gegevens, default=_naarJson, ensure_ascii=False)
+    return np.frombuffer(tekst.encode('utf-8'), dtype=np.uint8)
+
+def _decodeerWaarden(array):
+    """Decodeer de JSON-bytes van _codeerWaarden tot een lijst"""
+    return json.loads(array.tobytes().decode('utf-8'), object_hook=_vanJson)
+
+def _schrijfData(pad, dataFrame):
+    """
+    Schrijf een DataFrame als .npz-archief zonder pickle
+    
+    Args:
+        pad (str): Pad van het archief
+        dataFrame (pandas.DataFrame): Te bewaren data, met een standaard RangeIndex
+    
+    Raises:
+        _NietTeCachen: Als een kolom of waarde niet in het formaat past
+    """
+    if not (isinstance(dataFrame.index, pd.RangeIndex) and dataFrame.index.start == 0 and dataFrame.index.step == 1):
+        raise _NietTeCachen("geen standaard rij-index")
+    
+    arrays = {}
+    kolommen = []
+    for i, (_, reeks) in enumerate(dataFrame.items()):
+        dtype = reeks.dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            kolommen.append({'soort': 'category', 'geordend': bool(dtype.ordered)})
+            arrays[f'c{i}'] = reeks.cat.codes.to_numpy()
+            arrays[f'k{i}'] = _codeerWaarden(dtype.categories)
+        elif isinstance(dtype, pd.BooleanDtype):
+            kolommen.append({'soort': 'boolean'})
+            arrays[f'k{i}'] = reeks.to_numpy(dtype=bool, na_value=False)
+            arrays[f'm{i}'] = reeks.isna().to_numpy()
+        elif isinstance(dtype, pd.StringDtype):
+            # Sinds pandas 2.3 bestaat tekst met NaN als lege waarde naast tekst met pd.NA
+            naNan = getattr(dtype, 'na_value', pd.NA) is not pd.NA
+            kolommen.append({'soort': 'string', 'opslag': dtype.storage, 'naNan': naNan})
+            arrays[f'k{i}'] = _codeerWaarden(reeks.astype(object).where(reeks.notna(), None))
+        elif dtype == object:
+            kolommen.append({'soort': 'object'})
+            arrays[f'k{i}'] = _codeerWaarden(reeks)
+        elif isinstance(dtype, np.dtype) and dtype.kind in 'biufmM':
+            kolommen.append({'soort': 'numpy'})
+            arrays[f'k{i}'] = reeks.to_numpy()
+        else:
+            raise _NietTeCachen(f"kolom met datatype {dtype}")
+    
+    arrays['beschrijving'] = _naarBytes([len(dataFrame), kolommen])
+    arrays['namen'] = _codeerWaarden(dataFrame.columns)
+    with open(pad, 'wb') as bestand:
+        np.savez(bestand, **arrays)
+
+def _leesData(pad):
+    """
+    Lees een DataFrame uit een .npz-archief van _schrijfData
+    
+    Het archief wordt gelezen met allow_pickle=False, zodat een gemanipuleerd
+    cachebestand geen code kan uitvoeren.
+    
+    Args:
+        pad (str): Pad van het archief
+    
+    Returns:
+        pandas.DataFrame: De bewaarde data
+    """
+    with np.load(pad, allow_pickle=False) as archief:
+        rijen, kolommen = _decodeerWaarden(archief['beschrijving'])
+        namen = _decodeerWaarden(archief['namen'])
+        
+        data = {}
+        for i, kolom in enumerate(kolommen):
+            soort = kolom['soort']
+            if soort == 'category':
+                dtype = pd.CategoricalDtype(_decodeerWaarden(archief[f'k{i}']), ordered=kolom['geordend'])
+                waarden = pd.Categorical.from_codes(archief[f'c{i}'], dtype=dtype)
+            elif soort == 'boolean':
+                waarden = pd.arrays.BooleanArray(archief[f'k{i}'], archief[f'm{i}'])
+            elif soort == 'string':
+                dtype = pd.StringDtype(kolom['opslag'], na_value=np.nan) if kolom['naNan'] else pd.StringDtype(kolom['opslag'])
+                waarden = pd.array(_decodeerWaarden(archief[f'k{i}']), dtype=dtype)
+            elif soort == 'object':
+                # Expliciet object: anders leidt pandas zelf een tekst- of datumtype af
+                waarden = np.empty(rijen, dtype=object)
+                waarden[:] = _decodeerWaarden(archief[f'k{i}'])
+                waarden = pd.Series(waarden, dtype=object, copy=False)
+            elif soort == 'numpy':
+                waarden = archief[f'k{i}']
+            else:
+                raise ValueError(f"Onbekende kolomsoort in cache: {soort}")
+            data[i] = waarden
+    
+    dataFrame = pd.DataFrame(data, index=pd.RangeIndex(rijen))
+    dataFrame.columns = pd.Index(namen)
+    return dataFrame
+
+def _schrijfJson(pad, gegevens):
+    """Schrijf gegevens als JSON"""
+    with open(pad, 'w', encoding='utf-8') as bestand:
+        json.dump(gegevens, bestand)
@@ -0,0 +1,609 @@
+"""
+Excel Expressie module voor Excelladin Reloaded
+Een kleine formuletaal voor afgeleide kolommen, die één keer wordt geparsed en
+vertaald naar bewerkingen op hele kolommen (pandas/NumPy) in plaats van per rij
+
+Voorbeelden:
+    AFRONDEN(Inkoopprijs * (1 + Margepercentage / 100); 2)
+    ALS([BTW percentage] = 21; "hoog"; "laag")
+    HOOFDLETTERS(Merk) & " " & Type
+    OPZOEKEN(Hoofdcategorie; [Categorie code]; [Categorie naam])
+    WISSEL(Hoofdcategorie; "Licht"; 30; "Geluid"; 25; 20)
+"""
+import operator
+import re
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+
+# Tokens van de formuletaal, in volgorde van herkenning
+_TOKEN_PATROON = re.compile(r'''
+    (?P<spatie>\s+)
+  | (?P<getal>\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)
+  | (?P<tekst>"(?:[^"]|"")*"|'(?:[^']|'')*')
+  | (?P<kolom>\[[^\]]+\])
+  | (?P<naam>[^\W\d][\w.]*)
+  | (?P<operator><=|>=|<>|!=|==|[-+*/^&=<>%(),;])
+''', re.VERBOSE)
+
+# Bindingssterkte van binaire operatoren (hoger bindt sterker)
+_PRIORITEIT = {
+    '=': 1, '==': 1, '<>': 1, '!=': 1, '<': 1, '>': 1, '<=': 1, '>=': 1,
+    '&': 2,
+    '+': 3, '-': 3,
+    '*': 4, '/': 4,
+    '^': 6,
+}
+
+_WAAR = {'WAAR', 'TRUE'}
+_ONWAAR = {'ONWAAR', 'FALSE'}
+
+class _Context:
+    """Toegang tot de kolommen tijdens één evaluatie, met een cache per kolom"""
+    
+    def __init__(self, haalKolom, haalVolledigeKolom, aantalRijen):
+        """
+        Initialiseer de context
+        
+        Args:
+            haalKolom (callable): Geeft de Series van een kolom voor het te berekenen bereik
+            haalVolledigeKolom (callable): Geeft de Series van de hele kolom, of None
+            aantalRijen (int): Aantal rijen in het bereik
+        """
+        self.haalKolom = haalKolom
+        self.haalVolledigeKolom = haalVolledigeKolom or haalKolom
+        self.aantalRijen = aantalRijen
+        self._kolommen = {}
+        self._getallen = {}
+    
+    def kolom(self, naam):
+        """Haal een kolom (voor het te berekenen bereik) op"""
+        if naam not in self._kolommen:
+            self._kolommen[naam] = self.haalKolom(naam).reset_index(drop=True)
+        return self._kolommen[naam]
+    
+    def getalKolom(self, naam):
+        """Haal een kolom op als getallen (eenmalig omgezet per evaluatie)"""
+        if naam not in self._getallen:
+            self._getallen[naam] = _naarGetal(self.kolom(naam))
+        return self._getallen[naam]
+
+class Expressie:
+    """
+    Gecompileerde expressie
+    
+    Attributes:
+        tekst (str): De oorspronkelijke expressie
+        kolommen (list): Namen van de kolommen die de expressie gebruikt
+        volledigeKolommen (list): Kolommen die over alle rijen gelezen worden (OPZOEKEN)
+    """
+    
+    def __init__(self, tekst):
+        """
+        Parse en compileer een expressie
+        
+        Args:
+            tekst (str): De expressie
+        
+        Raises:
+            ValueError: Als de expressie ongeldig is
+        """
+        self.tekst = tekst
+        self.kolommen = []
+        self.volledigeKolommen = []
+        boom = _Parser(tekst).parse()
+        self._functie = self._compileer(boom)
+    
+    def evalueer(self, haalKolom, aantalRijen, haalVolledigeKolom=None):
+        """
+        Bereken de expressie voor alle rijen tegelijk
+        
+        Args:
+            haalKolom (callable): Functie die een kolomnaam krijgt en de pandas.Series
+                voor het te berekenen bereik teruggeeft
+            aantalRijen (int): Aantal rijen in het bereik
+            haalVolledigeKolom (callable): Optioneel, functie die de hele kolom teruggeeft
+                (voor OPZOEKEN); standaard haalKolom
+        
+        Returns:
+            numpy.ndarray: Object-array met de uitkomst per rij (None voor lege uitkomsten)
+        """
+        context = _Context(haalKolom, haalVolledigeKolom, aantalRijen)
+        # Delen door nul geeft een lege uitkomst in plaats van een waarschuwing
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            resultaat = self._functie(context)
+        
+        if not isinstance(resultaat, pd.Series):
+            resultaat = pd.Series([resultaat] * aantalRijen)
+        
+        waarden = resultaat.to_numpy(dtype=object)
+        leeg = pd.isna(waarden)
+        if leeg.any():
+            waarden = waarden.copy()
+            waarden[leeg] = None
+        return waarden
+    
+    def _compileer(self, knoop):
+        """
+        Vertaal een knoop van de syntaxboom naar een functie van de context
+        
+        Args:
+            knoop (tuple): Knoop van de syntaxboom
+        
+        Returns:
+            callable: Functie die een _Context krijgt en een Series of scalair teruggeeft
+        """
+        soort = knoop[0]
+        
+        if soort == 'waarde':
+            waarde = knoop[1]
+            return lambda context: waarde
+        
+        if soort == 'kolom':
+            naam = knoop[1]
+            if naam not in self.kolommen:
+                self.kolommen.append(naam)
+            return lambda context: context.kolom(naam)
+        
+        if soort == 'min':
+            operand = self._compileerGetal(knoop[1])
+            return lambda context: -operand(context)
+        
+        if soort == 'procent':
+            operand = self._compileerGetal(knoop[1])
+            return lambda context: operand(context) / 100
+        
+        if soort == 'operator':
+            return self._compileerOperator(knoop[1], knoop[2], knoop[3])
+        
+        if soort == 'functie':
+            return self._compileerFunctie(knoop[1], knoop[2], knoop[3])
+        
+        raise ValueError(f"Onbekende expressie: {knoop!r}")
+    
+    def _compileerGetal(self, knoop):
+        """Compileer een knoop waarvan de uitkomst als getal gebruikt wordt"""
+        if knoop[0] == 'kolom':
+            naam = knoop[1]
+            self._compileer(knoop)
+            return lambda context: context.getalKolom(naam)
+        functie = self._compileer(knoop)
+        return lambda context: _naarGetal(functie(context))
+    
+    def _compileerOperator(self, operator_, links, rechts):
+        """Compileer een binaire operator"""
+        if operator_ in ('+', '-', '*', '/', '^'):
+            a, b = self._compileerGetal(links), self._compileerGetal(rechts)
+            bewerking = {
+                '+': np.add, '-': np.subtract, '*': np.multiply,
+                '/': np.divide, '^': np.power,
+            }[operator_]
+            return lambda context: _eindig(bewerking(a(context), b(context)))
+        
+        if operator_ == '&':
+            a, b = self._compileer(links), self._compileer(rechts)
+            return lambda context: _naarTekst(a(context)) + _naarTekst(b(context))
+        
+        # Vergelijking: als getallen als een van beide kanten een getal is, anders als tekst
+        a, b = self._compileer(links), self._compileer(rechts)
+        vergelijk = {
+            '=': operator.eq, '==': operator.eq, '<>': operator.ne, '!=': operator.ne,
+            '<': operator.lt, '>': operator.gt, '<=': operator.le, '>=': operator.ge,
+        }[operator_]
+        
+        def vergelijking(context):
+            x, y = a(context), b(context)
+            if _isGetal(x) or _isGetal(y):
+                x, y = _naarGetal(x), _naarGetal(y)
+            else:
+                x, y = _naarTekst(x), _naarTekst(y)
+            return vergelijk(x, y)
+        return vergelijking
+    
+    def _compileerFunctie(self, naam, argumenten, positie):
+        """Compileer een functieaanroep"""
+        functie = _FUNCTIES.get(naam)
+        if functie is None:
+            raise ValueError(f"Onbekende functie '{naam}' op positie {positie}")
+        
+        minimum, maximum, soorten, uitvoering = functie
+        if not minimum <= len(argumenten) <= (maximum if maximum is not None else len(argumenten)):
+            raise ValueError(f"Verkeerd aantal argumenten voor {naam} op positie {positie}")
+        
+        # Per argument: 'getal', 'tekst', 'kolomnaam' of 'waarde' (ongewijzigd)
+        gecompileerd = []
+        for i, argument in enumerate(argumenten):
+            soort = soorten[min(i, len(soorten) - 1)]
+            if soort == 'kolomnaam':
+                if argument[0] != 'kolom':
+                    raise ValueError(f"{naam} verwacht een kolomnaam als argument {i + 1}")
+                kolomNaam = argument[1]
+                if kolomNaam not in self.kolommen:
+                    self.kolommen.append(kolomNaam)
+                if kolomNaam not in self.volledigeKolommen:
+                    self.volledigeKolommen.append(kolomNaam)
+                gecompileerd.append(lambda context, kolomNaam=kolomNaam: context.haalVolledigeKolom(kolomNaam))
+            elif soort == 'getal':
+                gecompileerd.append(self._compileerGetal(argument))
+            elif soort == 'tekst':
+                waarde = self._compileer(argument)
+                gecompileerd.append(lambda context, waarde=waarde: _naarTekst(waarde(context)))
+            else:
+                gecompileerd.append(self._compileer(argument))
+        
+        return lambda context: uitvoering(context, *[argument(context) for argument in gecompileerd])
+
+class _Parser:
+    """Recursive descent parser die een expressie omzet naar een syntaxboom van tuples"""
+    
+    def __init__(self, tekst):
+        """
+        Initialiseer de parser
+        
+        Args:
+            tekst (str): De expressie
+        
+        Raises:
+            ValueError: Als de expressie een onbekend teken bevat
+        """
+        self.tekst = tekst
+        self.tokens = self._tokeniseer(tekst)
+        self.positie = 0
+    
+    @staticmethod
+    def _tokeniseer(tekst):
+        """Splits de expressie in (soort, waarde, positie) tokens"""
+        tokens = []
+        positie = 0
+        while positie < len(tekst):
+            match = _TOKEN_PATROON.match(tekst, positie)
+            if match is None:
+                raise ValueError(f"Onverwacht teken '{tekst[positie]}' op positie {positie + 1}")
+            soort = match.lastgroup
+            if soort != 'spatie':
+                tokens.append((soort, match.group(), positie + 1))
+            positie = match.end()
+        tokens.append(('einde', '', len(tekst) + 1))
+        return tokens
+    
+    def parse(self):
+        """Parse de hele expressie"""
+        if self.tokens[0][0] == 'einde':
+            raise ValueError("Lege expressie")
+        boom = self._expressie(0)
+        soort, waarde, positie = self.tokens[self.positie]
+        if soort != 'einde':
+            raise ValueError(f"Onverwacht '{waarde}' op positie {positie}")
+        return boom
+    
+    def _volgende(self):
+        """Geef het huidige token en ga door naar het volgende"""
+        token = self.tokens[self.positie]
+        self.positie += 1
+        return token
+    
+    def _verwacht(self, waarde):
+        """Controleer en sla een verwachte operator over"""
+        soort, gevonden, positie = self._volgende()
+        if soort != 'operator' or gevonden != waarde:
+            raise ValueError(f"'{waarde}' verwacht op positie {positie}, gevonden: '{gevonden}'")
+    
+    def _expressie(self, minimum):
+        """Parse binaire operatoren met een prioriteit van minstens 'minimum'"""
+        links = self._unair()
+        while True:
+            soort, operator, _ = self.tokens[self.positie]
+            prioriteit = _PRIORITEIT.get(operator) if soort == 'operator' else None
+            if prioriteit is None or prioriteit < minimum:
+                return links
+            self.positie += 1
+            # Machtsverheffen is rechts-associatief, de rest links-associatief
+            rechts = self._expressie(prioriteit if operator == '^' else prioriteit + 1)
+            links = ('operator', operator, links, rechts)
+    
+    def _unair(self):
+        """Parse een unaire min of plus"""
+        soort, waarde, _ = self.tokens[self.positie]
+        if soort == 'operator' and waarde in ('-', '+'):
+            self.positie += 1
+            operand = self._expressie(5)
+            return ('min', operand) if waarde == '-' else operand
+        return self._postfix()
+    
+    def _postfix(self):
+        """Parse een waarde gevolgd door eventuele procenttekens"""
+        knoop = self._primair()
+        while self.tokens[self.positie][:2] == ('operator', '%'):
+            self.positie += 1
+            knoop = ('procent', knoop)
+        return knoop
+    
+    def _primair(self):
+        """Parse een getal, tekst, kolom, functieaanroep of expressie tussen haakjes"""
+        soort, waarde, positie = self._volgende()
+        
+        if soort == 'getal':
+            return ('waarde', float(waarde))
+        
+        if soort == 'tekst':
+            aanhalingsteken = waarde[0]
+            return ('waarde', waarde[1:-1].replace(aanhalingsteken * 2, aanhalingsteken))
+        
+        if soort == 'kolom':
+            return ('kolom', waarde[1:-1].strip())
+        
+        if soort == 'naam':
+            if self.tokens[self.positie][:2] == ('operator', '('):
+                self.positie += 1
+                return ('functie', waarde.upper(), self._argumenten(), positie)
+            if waarde.upper() in _WAAR:
+                return ('waarde', True)
+            if waarde.upper() in _ONWAAR:
+                return ('waarde', False)
+            return ('kolom', waarde)
+        
+        if soort == 'operator' and waarde == '(':
+            knoop = self._expressie(0)
+            self._verwacht(')')
+            return knoop
+        
+        if soort == 'einde':
+            raise ValueError("Onverwacht einde van de expressie")
+        raise ValueError(f"Onverwacht '{waarde}' op positie {positie}")
+    
+    def _argumenten(self):
+        """Parse de argumenten van een functieaanroep (gescheiden door ; of ,)"""
+        argumenten = []
+        if self.tokens[self.positie][:2] == ('operator', ')'):
+            self.positie += 1
+            return argumenten
+        
+        while True:
+            argumenten.append(self._expressie(0))
+            soort, waarde, positie = self._volgende()
+            if soort == 'operator' and waarde == ')':
+                return argumenten
+            if soort != 'operator' or waarde not in (';', ','):
+                raise ValueError(f"';' of ')' verwacht op positie {positie}, gevonden: '{waarde}'")
+
+def _eindig(getal):
+    """Vervang oneindige uitkomsten (zoals delen door nul) door NaN, een lege uitkomst"""
+    if isinstance(getal, pd.Series):
+        return getal.where(np.isfinite(getal))
+    return getal if np.isfinite(getal) else np.nan
+
+def _isGetal(waarde):
+    """Controleer of een waarde (scalair of Series) een getal is"""
+    if isinstance(waarde, pd.Series):
+        if pd.api.types.is_bool_dtype(waarde.dtype):
+            return False
+        if pd.api.types.is_numeric_dtype(waarde.dtype):
+            return True
+        # Kolommen uit Excel zijn vaak object-kolommen met getallen
+        return waarde.dtype == object and pd.api.types.infer_dtype(waarde, skipna=True) in (
+            'integer', 'floating', 'mixed-integer-float', 'decimal'
+        )
+    return isinstance(waarde, (int, float, np.number)) and not isinstance(waarde, (bool, np.bool_))
+
+def _naarGetal(waarde):
+    """
+    Zet een waarde om naar getallen; tekst met een decimale komma ('12,50')
+    wordt ook herkend, niet te lezen waarden worden NaN
+    """
+    if not isinstance(waarde, pd.Series):
+        if isinstance(waarde, str):
+            return _tekstNaarGetal(pd.Series([waarde], dtype=object)).iloc[0]
+        if waarde is None:
+            return np.nan
+        return float(waarde)
+    
+    if pd.api.types.is_numeric_dtype(waarde.dtype):
+        return waarde.astype(float)
+    return _tekstNaarGetal(waarde.astype(object))
+
+def _tekstNaarGetal(reeks):
+    """Zet een object-kolom om naar getallen, met een tweede poging voor Nederlandse notatie"""
+    getallen = pd.to_numeric(reeks, errors='coerce').astype(float)
+    opnieuw = getallen.isna() & reeks.map(type, na_action='ignore').eq(str)
+    if opnieuw.any():
+        # '1.234,56' -> '1234.56'
+        tekst = reeks[opnieuw].str.strip().str.replace('.', '', regex=False).str.replace(',', '.', regex=False)
+        getallen[opnieuw] = pd.to_numeric(tekst, errors='coerce')
+    return getallen
+
+def _celNaarTekst(waarde):
+    """Zet één celwaarde om naar tekst zoals Excel hem toont"""
+    if waarde is None or waarde is pd.NA:
+        return ""
+    if isinstance(waarde, (float, np.floating)):
+        if np.isnan(waarde):
+            return ""
+        if float(waarde).is_integer():
+            return str(int(waarde))
+    return str(waarde)
+
+_CEL_NAAR_TEKST = np.frompyfunc(_celNaarTekst, 1, 1)
+
+def _naarTekst(waarde):
+    """Zet een waarde om naar tekst; lege cellen worden lege tekst en hele getallen krijgen geen '.0'"""
+    if not isinstance(waarde, pd.Series):
+        return _celNaarTekst(waarde)
+    
+    if pd.api.types.is_string_dtype(waarde.dtype) and pd.api.types.infer_dtype(waarde, skipna=True) == 'string':
+        return waarde.astype(object).fillna("")
+    return pd.Series(_CEL_NAAR_TEKST(waarde.to_numpy(dtype=object)), index=waarde.index, dtype=object)
+
+def _naarBool(waarde):
+    """Zet een voorwaarde om naar True/False; lege of onleesbare waarden zijn False"""
+    if isinstance(waarde, pd.Series):
+        if pd.api.types.is_bool_dtype(waarde.dtype):
+            return waarde.fillna(False).astype(bool)
+        if pd.api.types.is_numeric_dtype(waarde.dtype):
+            return waarde.fillna(0) != 0
+        return waarde.map(lambda w: bool(w) and not pd.isna(w), na_action='ignore').fillna(False).astype(bool)
+    return bool(waarde) and not pd.isna(waarde)
+
+def _alsReeks(waarde, aantalRijen):
+    """Maak van een scalair een Series zodat het in een kolombewerking gebruikt kan worden"""
+    if isinstance(waarde, pd.Series):
+        return waarde
+    return pd.Series([waarde] * aantalRijen, dtype=object)
+
+def _als(context, voorwaarde, dan, anders=None):
+    """ALS(voorwaarde; dan; anders)"""
+    voorwaarde = _naarBool(voorwaarde)
+    if not isinstance(voorwaarde, pd.Series):
+        return dan if voorwaarde else anders
+    dan = _alsReeks(dan, context.aantalRijen)
+    anders = _alsReeks(anders, context.aantalRijen)
+    if dan.dtype != anders.dtype:
+        dan, anders = dan.astype(object), anders.astype(object)
+    return dan.where(voorwaarde, anders)
+
+def _en(context, *waarden):
+    """EN(a; b; ...)"""
+    resultaat = True
+    for waarde in waarden:
+        resultaat = resultaat & _naarBool(waarde)
+    return resultaat
+
+def _of(context, *waarden):
+    """OF(a; b; ...)"""
+    resultaat = False
+    for waarde in waarden:
+        resultaat = resultaat | _naarBool(waarde)
+    return resultaat
+
+def _afronden(context, getal, decimalen=0.0):
+    """AFRONDEN(getal; decimalen), half weg van nul zoals in Excel"""
+    if isinstance(decimalen, pd.Series):
+        raise ValueError("Het aantal decimalen van AFRONDEN moet een vast getal zijn")
+    factor = 10.0 ** int(decimalen)
+    return np.sign(getal) * np.floor(np.abs(getal) * factor + 0.5) / factor
+
+def _minimum(context, *getallen):
+    """MIN(a; b; ...)"""
+    resultaat = getallen[0]
+    for getal in getallen[1:]:
+        resultaat = np.fmin(resultaat, getal)
+    return resultaat
+
+def _maximum(context, *getallen):
+    """MAX(a; b; ...)"""
+    resultaat = getallen[0]
+    for getal in getallen[1:]:
+        resultaat = np.fmax(resultaat, getal)
+    return resultaat
+
+def _tekstFunctie(bewerking):
+    """Maak een tekstfunctie die zowel op een Series als op een scalair werkt"""
+    def uitvoering(context, tekst, *argumenten):
+        if any(isinstance(argument, pd.Series) for argument in argumenten):
+            raise ValueError("Alleen de eerste parameter van een tekstfunctie kan een kolom zijn")
+        argumenten = [int(argument) if isinstance(argument, float) else argument for argument in argumenten]
+        reeks = _alsReeks(tekst, 1) if not isinstance(tekst, pd.Series) else tekst
+        resultaat = bewerking(reeks.astype(object).str, *argumenten)
+        return resultaat if isinstance(tekst, pd.Series) else resultaat.iloc[0]
+    return uitvoering
+
+def _opzoeken(context, zoekwaarde, zoekkolom, resultaatkolom):
+    """OPZOEKEN(zoekwaarde; zoekkolom; resultaatkolom): eerste rij waarin de zoekkolom gelijk is"""
+    sleutels = _naarTekst(zoekkolom.reset_index(drop=True))
+    tabel = pd.Series(resultaatkolom.reset_index(drop=True).to_numpy(dtype=object), index=sleutels.to_numpy())
+    tabel = tabel[~tabel.index.duplicated(keep='first')]
+    tabel = tabel[tabel.index != ""]
+    
+    gezocht = _naarTekst(zoekwaarde)
+    if isinstance(gezocht, pd.Series):
+        return gezocht.map(tabel)
+    return tabel.get(gezocht)
+
+def _wissel(context, waarde, *paren):
+    """WISSEL(waarde; zoek1; resultaat1; zoek2; resultaat2; ...; standaard)"""
+    standaard = paren[-1] if len(paren) % 2 else None
+    tabel = {}
+    for zoek, resultaat in zip(paren[0::2], paren[1::2]):
+        if isinstance(zoek, pd.Series) or isinstance(resultaat, pd.Series):
+            raise ValueError("De zoekwaarden en resultaten van WISSEL moeten vaste waarden zijn")
+        tabel.setdefault(_naarTekst(zoek), resultaat)
+    
+    gezocht = _naarTekst(waarde)
+    if not isinstance(gezocht, pd.Series):
+        return tabel.get(gezocht, standaard)
+    resultaat = gezocht.map(tabel)
+    if standaard is not None:
+        resultaat = resultaat.where(gezocht.isin(list(tabel)), standaard)
+    return resultaat
+
+def _isLeeg(context, waarde):
+    """ISLEEG(waarde)"""
+    if isinstance(waarde, pd.Series):
+        return waarde.isna() | waarde.astype(object).eq("")
+    return waarde is None or waarde == "" or pd.isna(waarde)
+
+# Functies: naam -> (minimum, maximum (None = onbeperkt), soort per argument, uitvoering).
+# De laatste soort geldt voor alle volgende argumenten.
+_FUNCTIES = {
+    # Logica
+    'ALS': (2, 3, ['waarde'], _als),
+    'EN': (1, None, ['waarde'], _en),
+    'OF': (1, None, ['waarde'], _of),
+    'NIET': (1, 1, ['waarde'], lambda context, waarde: ~_naarBool(waarde) if isinstance(waarde, pd.Series) else not _naarBool(waarde)),
+    'ISLEEG': (1, 1, ['waarde'], _isLeeg),
+    # Rekenen
+    'AFRONDEN': (1, 2, ['getal'], _afronden),
+    'ABS': (1, 1, ['getal'], lambda context, getal: np.abs(getal)),
+    'MIN': (1, None, ['getal'], _minimum),
+    'MAX': (1, None, ['getal'], _maximum),
+    'GETAL': (1, 1, ['getal'], lambda context, getal: getal),
+    # Tekst
+    'TEKST': (1, 1, ['tekst'], lambda context, tekst: tekst),
+    'HOOFDLETTERS': (1, 1, ['tekst'], _tekstFunctie(lambda tekst: tekst.upper())),
+    'KLEINELETTERS': (1, 1, ['tekst'], _tekstFunctie(lambda tekst: tekst.lower())),
+    'BEGINLETTERS': (1, 1, ['tekst'], _tekstFunctie(lambda tekst: tekst.title())),
+    'SPATIES.WISSEN': (1, 1, ['tekst'], _tekstFunctie(lambda tekst: tekst.strip().str.replace(r'\s+', ' ', regex=True))),
+    'LENGTE': (1, 1, ['tekst'], _tekstFunctie(lambda tekst: tekst.len().astype(float))),
+    'LINKS': (1, 2, ['tekst', 'getal'], _tekstFunctie(lambda tekst, aantal=1: tekst[:aantal])),
+    'RECHTS': (1, 2, ['tekst', 'getal'], _tekstFunctie(lambda tekst, aantal=1: tekst[-aantal:] if aantal else tekst[:0])),
+    'DEEL': (3, 3, ['tekst', 'getal'], _tekstFunctie(lambda tekst, start, aantal: tekst[start - 1:start - 1 + aantal])),
+    'SUBSTITUEREN': (3, 3, ['tekst'], _tekstFunctie(lambda tekst, oud, nieuw: tekst.replace(oud, nieuw, regex=False))),
+    'BEVAT': (2, 2, ['tekst'], _tekstFunctie(lambda tekst, deel: tekst.contains(deel, regex=False))),
+    'TEKST.SAMENVOEGEN': (1, None, ['tekst'], lambda context, *teksten: _samenvoegen(teksten)),
+    # Opzoeken
+    'OPZOEKEN': (3, 3, ['waarde', 'kolomnaam', 'kolomnaam'], _opzoeken),
+    'WISSEL': (3, None, ['waarde'], _wissel),
+}
+
+def _samenvoegen(teksten):
+    """Plak teksten aan elkaar"""
+    resultaat = teksten[0]
+    for tekst in teksten[1:]:
+        resultaat = resultaat + tekst
+    return resultaat
+
+# Engelse namen als alias, voor wie de Engelse Excel-functies kent
+for _alias, _functie in {
+    'IF': 'ALS', 'AND': 'EN', 'OR': 'OF', 'NOT': 'NIET', 'ISBLANK': 'ISLEEG',
+    'ROUND': 'AFRONDEN', 'VALUE': 'GETAL', 'TEXT': 'TEKST',
+    'UPPER': 'HOOFDLETTERS', 'LOWER': 'KLEINELETTERS', 'PROPER': 'BEGINLETTERS',
+    'TRIM': 'SPATIES.WISSEN', 'LEN': 'LENGTE', 'LEFT': 'LINKS', 'RIGHT': 'RECHTS',
+    'MID': 'DEEL', 'SUBSTITUTE': 'SUBSTITUEREN', 'CONTAINS': 'BEVAT', 'CONCAT': 'TEKST.SAMENVOEGEN',
+    'LOOKUP': 'OPZOEKEN', 'SWITCH': 'WISSEL',
+}.items():
+    _FUNCTIES[_alias] = _FUNCTIES[_functie]
+
+@lru_cache(maxsize=128)
+def compileerExpressie(tekst):
+    """
+    Compileer een expressie (met cache per expressietekst)
+    
+    Args:
+        tekst (str): De expressie
+    
+    Returns:
+        Expressie: De gecompileerde expressie
+    
+    Raises:
+        ValueError: Als de expressie ongeldig is
+    """
+    return Expressie(tekst)
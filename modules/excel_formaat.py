@@ -0,0 +1,165 @@
+"""
+Excel Formaat module voor Excelladin Reloaded
+Vertaalt een formaat string met {kolomnaam} placeholders één keer naar een
+reeks kolombewerkingen, zodat een hele kolom in één keer gevuld wordt
+"""
+import re
+import string
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+from modules.logger import logger
+
+# Kolomnaam van een veld: alles vóór een index ('[0]') of attribuut ('.naam')
+_VELD_KOLOM = re.compile(r'[^.\[]*')
+
+# Ufuncs die per element str(), repr() en ascii() toepassen op een object-array
+_NAAR_TEKST = np.frompyfunc(str, 1, 1)
+_NAAR_REPR = np.frompyfunc(repr, 1, 1)
+_NAAR_ASCII = np.frompyfunc(ascii, 1, 1)
+
+class FormaatSjabloon:
+    """
+    Gecompileerde formaat string
+    
+    Het sjabloon bestaat uit vaste tekst en velden. Bij het toepassen wordt per
+    veld de hele bronkolom in één NumPy-bewerking naar tekst omgezet en worden
+    alle delen als kolommen aan elkaar geplakt, in plaats van per rij een
+    dictionary te bouwen en str.format aan te roepen.
+    
+    Velden met een index of attribuut (zoals {Naam[0]} of {Naam.upper}) zijn
+    geen kolomnaam; sjablonen met zulke velden worden per rij met str.format
+    gevuld, zoals voorheen.
+    """
+    
+    def __init__(self, formaat):
+        """
+        Compileer een formaat string
+        
+        Args:
+            formaat (str): Formaat string met {kolomnaam} placeholders
+        
+        Raises:
+            ValueError: Als de formaat string ongeldig is (zoals een losse '{')
+        """
+        self.formaat = formaat
+        # Lijst van (vaste tekst, veldnaam, conversie, formaatspecificatie)
+        self.delen = []
+        for tekst, veld, specificatie, conversie in string.Formatter().parse(formaat):
+            if veld is not None and ('{' in (specificatie or '')):
+                raise ValueError(f"Geneste velden worden niet ondersteund: '{formaat}'")
+            self.delen.append((tekst, veld, conversie, specificatie or ''))
+        
+        self.velden = list(dict.fromkeys(
+            _VELD_KOLOM.match(veld).group(0) for _, veld, _, _ in self.delen if veld is not None
+        ))
+        self.perRij = any(
+            veld is not None and _VELD_KOLOM.match(veld).group(0) != veld for _, veld, _, _ in self.delen
+        )
+    
+    def pasToe(self, kolommen, aantalRijen):
+        """
+        Vul het sjabloon voor alle rijen tegelijk
+        
+        Lege cellen (None of NaN) worden als lege tekst ingevuld.
+        
+        Args:
+            kolommen (dict): Kolomnaam -> pandas.Series met de bronwaarden
+            aantalRijen (int): Aantal rijen van het resultaat (gebruikt als het sjabloon geen velden heeft)
+        
+        Returns:
+            numpy.ndarray: Object-array met de gevulde tekst per rij
+        
+        Raises:
+            KeyError: Als een veld in het sjabloon geen bronkolom heeft
+        """
+        if self.perRij:
+            return self._pasToePerRij(kolommen, aantalRijen)
+        
+        tekstKolommen = {}
+        resultaat = None
+        
+        for tekst, veld, conversie, specificatie in self.delen:
+            if tekst:
+                resultaat = tekst if resultaat is None else resultaat + tekst
+            if veld is None:
+                continue
+            
+            if veld not in tekstKolommen:
+                if veld not in kolommen:
+                    raise KeyError(veld)
+                tekstKolommen[veld] = _alsTekst(kolommen[veld])
+            waarden = _pasVeldAan(tekstKolommen[veld], conversie, specificatie)
+            
+            resultaat = waarden if resultaat is None else resultaat + waarden
+        
+        if resultaat is None or isinstance(resultaat, str):
+            return np.full(aantalRijen, resultaat or "", dtype=object)
+        return resultaat
+    
+    def _pasToePerRij(self, kolommen, aantalRijen):
+        """
+        Vul het sjabloon per rij met str.format, voor velden met een index of attribuut
+        
+        Een rij waarvoor het formatteren mislukt (zoals een te korte waarde bij
+        {Naam[5]}) wordt lege tekst.
+        
+        Args:
+            kolommen (dict): Kolomnaam -> pandas.Series met de bronwaarden
+            aantalRijen (int): Aantal rijen van het resultaat
+        
+        Returns:
+            numpy.ndarray: Object-array met de gevulde tekst per rij
+        
+        Raises:
+            KeyError: Als een veld in het sjabloon geen bronkolom heeft
+        """
+        for veld in self.velden:
+            if veld not in kolommen:
+                raise KeyError(veld)
+        tekstKolommen = {veld: _alsTekst(kolommen[veld]) for veld in self.velden}
+        
+        resultaat = np.empty(aantalRijen, dtype=object)
+        mislukt = 0
+        for rij in range(aantalRijen):
+            try:
+                resultaat[rij] = self.formaat.format(**{veld: waarden[rij] for veld, waarden in tekstKolommen.items()})
+            except (IndexError, AttributeError, KeyError, ValueError, TypeError):
+                resultaat[rij] = ""
+                mislukt += 1
+        
+        if mislukt:
+            logger.logWaarschuwing(f"Formaat '{self.formaat}' kon voor {mislukt} rijen niet worden ingevuld")
+        return resultaat
+
+def _alsTekst(reeks):
+    """Zet een kolom om naar een object-array met str() per waarde en lege tekst voor lege cellen"""
+    waarden = reeks.to_numpy(dtype=object)
+    leeg = pd.isna(waarden)
+    if leeg.any():
+        waarden = waarden.copy()
+        waarden[leeg] = ""
+    return _NAAR_TEKST(waarden)
+
+def _pasVeldAan(tekst, conversie, specificatie):
+    """Pas de conversie (!r, !s, !a) en formaatspecificatie van een veld toe op een tekstkolom"""
+    if conversie == 'r':
+        tekst = _NAAR_REPR(tekst)
+    elif conversie == 'a':
+        tekst = _NAAR_ASCII(tekst)
+    if specificatie:
+        tekst = np.frompyfunc(lambda waarde: format(waarde, specificatie), 1, 1)(tekst)
+    return tekst
+
+@lru_cache(maxsize=64)
+def compileerFormaat(formaat):
+    """
+    Compileer een formaat string tot een FormaatSjabloon (met cache per formaat string)
+    
+    Args:
+        formaat (str): Formaat string met {kolomnaam} placeholders
+    
+    Returns:
+        FormaatSjabloon: Het gecompileerde sjabloon
+    """
+    return FormaatSjabloon(formaat)
@@ -4,26 +4,99 @@ Verantwoordelijk voor het inlezen, bewerken en opslaan van Excel-bestanden
 """
 import os
 import datetime
+import threading
+import functools
+import numpy as np
 import pandas as pd
 from modules.logger import logger
+from modules.excel_opslaan import GewijzigdeBereiken, OpslagWachtrij, slaDataFrameOp
+from modules.excel_cache import laadUitCache, schrijfNaarCache, maakCacheSleutel
+from modules.excel_schema import KopSchema
+from modules.excel_werkboek import Werkboek
+from modules.excel_types import comprimeerDataFrame
+from modules.excel_journaal import BewerkingsJournaal
+from modules.excel_index import SleutelIndex
+
+def _gesynchroniseerd(methode):
+    """
+    Voer een methode uit onder het schrijfslot van de handler
+    
+    Acties die tegelijk in werkthreads draaien (zie modules.workflow_planner)
+    lezen en schrijven zo nooit gelijktijdig in het DataFrame.
+    """
+    @functools.wraps(methode)
+    def omhulsel(self, *args, **kwargs):
+        with self._schrijfLock:
+            return methode(self, *args, **kwargs)
+    return omhulsel
 
 class ExcelHandler:
     """
     ExcelHandler klasse voor het verwerken van Excel-bestanden
     """
     
+    # Bestanden vanaf deze grootte worden standaard in streaming modus geopend
+    STREAMING_DREMPEL_BYTES = 5 * 1024 * 1024
+    # Aantal rijen dat direct geladen wordt voordat de GUI verder kan
+    STREAMING_EERSTE_PAGINA = 500
+    # Aantal rijen per chunk dat op de achtergrond wordt bijgeladen
+    STREAMING_CHUNK_RIJEN = 5000
+    # Bewaar ingelezen werkbladen in een binaire sidecar-cache voor snel heropenen
+    GEBRUIK_CACHE = True
+    # Zet ingelezen kolommen om naar compacte datatypes om geheugen te besparen
+    COMPACTE_TYPES = True
+    
     def __init__(self):
         """Initialiseer de ExcelHandler"""
         self.huidigBestand = None
         self.huidigDataFrame = None
         self.kolomNamen = []
+        # Werkboek met lui ingelezen werkbladen en de naam van het actieve werkblad
+        self.werkboek = None
+        self.huidigWerkblad = None
+        # Aantal bytes bespaard door compacte datatypes, per ingelezen werkblad
+        self.geheugenBespaard = {}
+        
+        # Gebufferde celwijzigingen per kolompositie: {kolomIndex: {rij: waarde}}
+        self._schrijfBuffer = {}
+        # Gecachte NumPy arrays per kolompositie voor snelle positionele leestoegang
+        self._kolomArrays = {}
+        # Gewijzigde rijbereiken per kolom, gebruikt voor het opslaan van alleen de wijzigingen
+        self.gewijzigdeBereiken = GewijzigdeBereiken()
+        # Achtergrondwachtrij voor opslaan zonder de GUI te blokkeren
+        self.opslagWachtrij = OpslagWachtrij()
+        # Koppeling label <-> RentPro veld-ID <-> kolompositie, opgebouwd bij het openen
+        self._schema = None
+        # Ongedaan maken/opnieuw journaal met kopieën van alleen de gewijzigde kolommen
+        self.journaal = BewerkingsJournaal()
+        # Sleutelindexen (sleutelwaarde -> rijen) per kolomnaam, bijgewerkt bij elke wijziging
+        self._sleutelIndexen = {}
+        
+        # Slot voor lezen en schrijven vanuit meerdere threads (herintredend, methodes roepen elkaar aan)
+        self._schrijfLock = threading.RLock()
+        
+        # Status van het laden op de achtergrond (streaming modus)
+        self._laadLock = threading.Lock()
+        self._laadGeneratie = 0
+        self._geladenEvent = threading.Event()
+        self._geladenEvent.set()
     
-    def openBestand(self, bestandspad):
+    def openBestand(self, bestandspad, streaming=None, voortgangCallback=None, werkblad=None):
         """
         Open een Excel-bestand en laad de gegevens
         
+        Alleen het gevraagde werkblad wordt ingelezen; de andere werkbladen worden
+        pas ingelezen als ernaar gewisseld wordt (zie wisselWerkblad). Een geldige
+        sidecar-cache van het werkblad wordt direct geladen; in dat geval wordt het
+        werkblad niet opnieuw geparsed en is streaming niet nodig.
+        
         Args:
             bestandspad (str): Pad naar het Excel-bestand
+            streaming (bool): Optioneel, forceer (True) of verbied (False) de streaming modus;
+                              standaard wordt streaming gebruikt voor grote .xlsx bestanden
+            voortgangCallback (callable): Optioneel, wordt in streaming modus aangeroepen met
+                                          het aantal geladen rijen en of het laden klaar is
+            werkblad (str): Optioneel, naam van het werkblad; standaard het eerste werkblad
             
         Returns:
             bool: True als het bestand succesvol is geopend, anders False
@@ -34,19 +107,324 @@ class ExcelHandler:
                 logger.logFout(f"Bestand niet gevonden: {bestandspad}")
                 return False
             
-            # Laad het bestand met pandas
-            self.huidigDataFrame = pd.read_excel(bestandspad)
-            self.huidigBestand = bestandspad
-            self.kolomNamen = list(self.huidigDataFrame.columns)
+            # Stop een eventueel lopende achtergrondlading van een vorig bestand
+            self._stopAchtergrondLaden()
+            
+            # Lees alleen de werkbladnamen; de werkbladen zelf worden pas bij gebruik ingelezen
+            werkboek = Werkboek(bestandspad, lambda naam: self._leesWerkblad(bestandspad, naam))
+            if werkblad is None:
+                werkblad = werkboek.bladNamen[0]
+            elif werkblad not in werkboek.bladNamen:
+                logger.logFout(f"Werkblad '{werkblad}' niet gevonden in {bestandspad}")
+                return False
+            
+            if streaming is None:
+                streaming = (
+                    bestandspad.lower().endswith(('.xlsx', '.xlsm'))
+                    and os.path.getsize(bestandspad) >= self.STREAMING_DREMPEL_BYTES
+                )
+            
+            if streaming:
+                gecachtDataFrame = laadUitCache(bestandspad, werkblad) if self.GEBRUIK_CACHE else None
+                if gecachtDataFrame is None:
+                    return self._openBestandStreaming(bestandspad, werkboek, werkblad, voortgangCallback)
+                werkboek.bewaar(werkblad, gecachtDataFrame)
+            
+            self._activeerWerkblad(bestandspad, werkboek, werkblad, werkboek.haalBlad(werkblad))
             
-            logger.logInfo(f"Excel-bestand geopend: {bestandspad}")
-            logger.logInfo(f"Kolommen gevonden: {', '.join(self.kolomNamen)}")
+            logger.logInfo(f"Excel-bestand geopend: {bestandspad} (werkblad '{werkblad}')")
+            logger.logInfo(f"Kolommen gevonden: {', '.join(str(k) for k in self.kolomNamen)}")
             
             return True
         except Exception as e:
             logger.logFout(f"Fout bij openen Excel-bestand: {e}")
             return False
     
+    def haalWerkbladNamen(self):
+        """
+        Haal de namen van alle werkbladen in het huidige bestand op
+        
+        Returns:
+            list: Namen van de werkbladen, of een lege lijst als er geen bestand is geopend
+        """
+        if self.werkboek is None:
+            return []
+        
+        return list(self.werkboek.bladNamen)
+    
+    def wisselWerkblad(self, werkblad):
+        """
+        Maak een ander werkblad van het huidige bestand actief
+        
+        Een werkblad dat al eerder is ingelezen komt uit het geheugen; anders wordt
+        alleen dat werkblad ingelezen. Wisselen kan pas als de wijzigingen in het
+        huidige werkblad zijn opgeslagen.
+        
+        Args:
+            werkblad (str): Naam van het werkblad
+            
+        Returns:
+            bool: True als het werkblad actief is, anders False
+        """
+        if not self.isBestandGeopend() or self.werkboek is None:
+            logger.logFout("Kan niet wisselen van werkblad: Geen bestand geopend")
+            return False
+        
+        if werkblad == self.huidigWerkblad:
+            return True
+        
+        if werkblad not in self.werkboek.bladNamen:
+            logger.logFout(f"Werkblad '{werkblad}' niet gevonden in {self.huidigBestand}")
+            return False
+        
+        if self.isLaden():
+            logger.logWaarschuwing("Kan niet wisselen van werkblad: Het huidige werkblad wordt nog geladen")
+            return False
+        
+        self.schrijfBufferDoor()
+        if self.gewijzigdeBereiken:
+            logger.logWaarschuwing(f"Kan niet wisselen van werkblad: Werkblad '{self.huidigWerkblad}' heeft niet-opgeslagen wijzigingen")
+            return False
+        
+        try:
+            self.werkboek.bewaar(self.huidigWerkblad, self.huidigDataFrame)
+            dataFrame = self.werkboek.haalBlad(werkblad)
+            
+            with self._laadLock:
+                self._laadGeneratie += 1
+                self._activeerWerkblad(self.huidigBestand, self.werkboek, werkblad, dataFrame)
+            
+            logger.logInfo(f"Gewisseld naar werkblad '{werkblad}'")
+            return True
+        except Exception as e:
+            logger.logFout(f"Fout bij wisselen naar werkblad '{werkblad}': {e}")
+            return False
+    
+    def _leesWerkblad(self, bestandspad, werkblad):
+        """
+        Lees één werkblad in, uit de sidecar-cache als die geldig is
+        
+        Args:
+            bestandspad (str): Pad naar het Excel-bestand
+            werkblad (str): Naam van het werkblad
+            
+        Returns:
+            pandas.DataFrame: De data van het werkblad
+        """
+        if self.GEBRUIK_CACHE:
+            gecachtDataFrame = laadUitCache(bestandspad, werkblad)
+            if gecachtDataFrame is not None:
+                return gecachtDataFrame
+        
+        cacheSleutel = self._maakCacheSleutel(bestandspad, werkblad)
+        
+        # Laad het werkblad met pandas
+        dataFrame = self._comprimeer(werkblad, pd.read_excel(bestandspad, sheet_name=werkblad))
+        
+        if cacheSleutel:
+            self._schrijfCacheOpAchtergrond(bestandspad, dataFrame, cacheSleutel)
+        
+        return dataFrame
+    
+    def _comprimeer(self, werkblad, dataFrame):
+        """
+        Zet een ingelezen werkblad om naar compacte datatypes als dat is ingeschakeld
+        
+        Args:
+            werkblad (str): Naam van het werkblad
+            dataFrame (pandas.DataFrame): Het ingelezen werkblad
+            
+        Returns:
+            pandas.DataFrame: Het werkblad met compacte datatypes
+        """
+        if not self.COMPACTE_TYPES:
+            return dataFrame
+        
+        try:
+            dataFrame, bespaard = comprimeerDataFrame(dataFrame)
+            self.geheugenBespaard[werkblad] = bespaard
+        except Exception as e:
+            logger.logWaarschuwing(f"Kon compacte datatypes niet toepassen op werkblad '{werkblad}': {e}")
+        return dataFrame
+    
+    def _activeerWerkblad(self, bestandspad, werkboek, werkblad, dataFrame):
+        """Maak een ingelezen werkblad het actieve werkblad"""
+        self.huidigDataFrame = dataFrame
+        self.huidigBestand = bestandspad
+        self.werkboek = werkboek
+        self.huidigWerkblad = werkblad
+        self.kolomNamen = list(dataFrame.columns)
+        self._resetCelStatus()
+    
+    def _openBestandStreaming(self, bestandspad, werkboek, werkblad, voortgangCallback=None):
+        """
+        Open een Excel-bestand in streaming modus
+        
+        De eerste pagina rijen wordt direct geladen zodat de GUI bruikbaar is;
+        de rest wordt in chunks op een achtergrondthread bijgeladen.
+        
+        Args:
+            bestandspad (str): Pad naar het Excel-bestand
+            werkboek (Werkboek): Werkboek waartoe het werkblad behoort
+            werkblad (str): Naam van het werkblad
+            voortgangCallback (callable): Optioneel, ontvangt (geladenRijen, klaar)
+            
+        Returns:
+            bool: True als de eerste pagina succesvol is geladen, anders False
+        """
+        from modules.excel_streaming import StreamingLezer
+        
+        cacheSleutel = self._maakCacheSleutel(bestandspad, werkblad)
+        lezer = StreamingLezer(bestandspad, werkblad)
+        try:
+            eersteRijen = lezer.leesChunk(self.STREAMING_EERSTE_PAGINA)
+        except Exception:
+            lezer.sluit()
+            raise
+        
+        with self._laadLock:
+            self._laadGeneratie += 1
+            generatie = self._laadGeneratie
+            self._activeerWerkblad(
+                bestandspad, werkboek, werkblad,
+                pd.DataFrame.from_records(eersteRijen, columns=lezer.kolomNamen)
+            )
+        
+        logger.logInfo(f"Excel-bestand geopend in streaming modus: {bestandspad} (werkblad '{werkblad}')")
+        logger.logInfo(f"Kolommen gevonden: {', '.join(str(k) for k in self.kolomNamen)}")
+        
+        if lezer.klaar:
+            lezer.sluit()
+            with self._laadLock:
+                self.huidigDataFrame = self._comprimeer(werkblad, self.huidigDataFrame)
+                self._kolomArrays = {}
+            if cacheSleutel:
+                self._schrijfCacheOpAchtergrond(bestandspad, self.huidigDataFrame, cacheSleutel)
+            if voortgangCallback:
+                voortgangCallback(len(self.huidigDataFrame), True)
+            return True
+        
+        if voortgangCallback:
+            voortgangCallback(len(self.huidigDataFrame), False)
+        
+        self._geladenEvent.clear()
+        threading.Thread(
+            target=self._laadRestInAchtergrond,
+            args=(lezer, generatie, voortgangCallback, cacheSleutel),
+            daemon=True
+        ).start()
+        return True
+    
+    def _laadRestInAchtergrond(self, lezer, generatie, voortgangCallback, cacheSleutel=None):
+        """
+        Laad de resterende rijen in chunks en voeg ze toe aan het DataFrame
+        
+        Args:
+            lezer (StreamingLezer): Lezer die al voorbij de eerste pagina staat
+            generatie (int): Laadgeneratie; stopt zodra er een ander bestand wordt geopend
+            voortgangCallback (callable): Optioneel, ontvangt (geladenRijen, klaar)
+            cacheSleutel (dict): Optioneel, cachesleutel van vóór het inlezen
+        """
+        try:
+            while not lezer.klaar:
+                rijen = lezer.leesChunk(self.STREAMING_CHUNK_RIJEN)
+                
+                with self._laadLock:
+                    if generatie != self._laadGeneratie:
+                        logger.logInfo(f"Achtergrondlading van {lezer.bestandspad} afgebroken")
+                        return
+                    
+                    if rijen:
+                        chunk = pd.DataFrame.from_records(rijen, columns=self.kolomNamen)
+                        self.huidigDataFrame = pd.concat([self.huidigDataFrame, chunk], ignore_index=True)
+                        self._kolomArrays = {}
+                    aantal = len(self.huidigDataFrame)
+                    
+                    if lezer.klaar:
+                        self.huidigDataFrame = self._comprimeer(lezer.werkblad, self.huidigDataFrame)
+                        self._kolomArrays = {}
+                        
+                        # Kopie voor de cache nemen voordat er bewerkingen op het volledige bestand komen
+                        if cacheSleutel:
+                            self._schrijfCacheOpAchtergrond(lezer.bestandspad, self.huidigDataFrame, cacheSleutel)
+                
+                if voortgangCallback:
+                    voortgangCallback(aantal, lezer.klaar)
+            
+            logger.logInfo(f"Streaming laden voltooid: {aantal} rijen uit {lezer.bestandspad}")
+        except Exception as e:
+            logger.logFout(f"Fout bij laden op de achtergrond van {lezer.bestandspad}: {e}")
+            if voortgangCallback:
+                voortgangCallback(self.haalGeladenRijAantal(), True)
+        finally:
+            lezer.sluit()
+            if generatie == self._laadGeneratie:
+                self._geladenEvent.set()
+    
+    def _maakCacheSleutel(self, bestandspad, werkblad=None):
+        """
+        Bepaal de cachesleutel van een werkblad vóór het inlezen
+        
+        Args:
+            bestandspad (str): Pad naar het Excel-bestand
+            werkblad (str): Optioneel, naam van het werkblad
+            
+        Returns:
+            dict: De cachesleutel, of None als de cache niet gebruikt wordt
+        """
+        if not self.GEBRUIK_CACHE or not bestandspad.lower().endswith(('.xlsx', '.xlsm', '.xls')):
+            return None
+        
+        try:
+            return maakCacheSleutel(bestandspad, werkblad)
+        except Exception as e:
+            logger.logWaarschuwing(f"Kon cachesleutel voor {bestandspad} niet bepalen: {e}")
+            return None
+    
+    def _schrijfCacheOpAchtergrond(self, bestandspad, dataFrame, cacheSleutel):
+        """
+        Schrijf een kopie van het ingelezen werkblad op de achtergrond naar de cache
+        
+        Args:
+            bestandspad (str): Pad naar het Excel-bestand
+            dataFrame (pandas.DataFrame): Het zojuist ingelezen werkblad
+            cacheSleutel (dict): Cachesleutel van vóór het inlezen
+        """
+        kopie = dataFrame.copy()
+        threading.Thread(
+            target=schrijfNaarCache,
+            args=(bestandspad, kopie, cacheSleutel),
+            daemon=True
+        ).start()
+    
+    def _stopAchtergrondLaden(self):
+        """Breek een lopende achtergrondlading af"""
+        with self._laadLock:
+            self._laadGeneratie += 1
+        self._geladenEvent.set()
+    
+    def isLaden(self):
+        """
+        Controleer of er nog rijen op de achtergrond worden geladen
+        
+        Returns:
+            bool: True als het laden nog bezig is, anders False
+        """
+        return not self._geladenEvent.is_set()
+    
+    def wachtTotGeladen(self, timeout=None):
+        """
+        Wacht tot het laden op de achtergrond klaar is
+        
+        Args:
+            timeout (float): Optioneel, maximaal aantal seconden om te wachten
+            
+        Returns:
+            bool: True als alle rijen geladen zijn, False bij een timeout
+        """
+        return self._geladenEvent.wait(timeout)
+    
+    @_gesynchroniseerd
     def bewerkKolom(self, kolomNaam, nieuweWaarden, rijen=None):
         """
         Bewerk waarden in een specifieke kolom
@@ -64,6 +442,12 @@ class ExcelHandler:
             return False
         
         try:
+            # Schrijven kan pas als alle rijen geladen zijn
+            self.wachtTotGeladen()
+            
+            # Verwerk eerst openstaande celwijzigingen zodat ze niet later overschrijven
+            self.schrijfBufferDoor()
+            
             # Controleer of de kolom bestaat
             if kolomNaam not in self.kolomNamen:
                 logger.logFout(f"Kolom '{kolomNaam}' bestaat niet")
@@ -90,9 +474,12 @@ class ExcelHandler:
                     # Vul aan met lege strings indien nodig
                     nieuweWaarden.extend([""] * (benodigdeWaarden - len(nieuweWaarden)))
                 
-                # Update alleen de geselecteerde rijen
-                for i in range(startRij, eindRij + 1):
-                    self.huidigDataFrame.at[i, kolomNaam] = nieuweWaarden[i - startRij]
+                # Update alleen de geselecteerde rijen in één positionele bewerking
+                kolomIndex = self.kolomNamen.index(kolomNaam)
+                with self.journaal.stap(f"Kolom '{kolomNaam}' bewerken"):
+                    self._bereidSchrijvenVoor(kolomNaam)
+                    self.huidigDataFrame.iloc[startRij:eindRij + 1, kolomIndex] = nieuweWaarden[:benodigdeWaarden]
+                    self._markeerGewijzigd(kolomNaam, range(startRij, eindRij + 1))
             else:
                 # Update alle rijen
                 benodigdeWaarden = len(self.huidigDataFrame)
@@ -103,7 +490,12 @@ class ExcelHandler:
                 
                 # Beperk tot aantal rijen in DataFrame
                 nieuweWaarden = nieuweWaarden[:benodigdeWaarden]
-                self.huidigDataFrame[kolomNaam] = nieuweWaarden
+                with self.journaal.stap(f"Kolom '{kolomNaam}' bewerken"):
+                    self.journaal.bewaarKolom(kolomNaam, self.huidigDataFrame[kolomNaam])
+                    self.huidigDataFrame[kolomNaam] = nieuweWaarden
+                    self._markeerGewijzigd(kolomNaam, range(benodigdeWaarden))
+            
+            self._kolomArrays.pop(self.kolomNamen.index(kolomNaam), None)
             
             logger.logActie(f"Kolom '{kolomNaam}' succesvol bewerkt")
             return True
@@ -111,10 +503,13 @@ class ExcelHandler:
             logger.logFout(f"Fout bij bewerken kolom '{kolomNaam}': {e}")
             return False
     
+    @_gesynchroniseerd
     def haalKolomOp(self, kolomNaam, rijen=None):
         """
         Haal waarden op uit een specifieke kolom
         
+        Wacht tot alle rijen geladen zijn, zodat de kolom compleet is.
+        
         Args:
             kolomNaam (str): Naam van de kolom
             rijen (tuple): Optioneel, tuple met (startRij, eindRij) om alleen een bereik op te halen
@@ -127,6 +522,9 @@ class ExcelHandler:
             return None
         
         try:
+            self.wachtTotGeladen()
+            self.schrijfBufferDoor()
+            
             # Controleer of de kolom bestaat
             if kolomNaam not in self.kolomNamen:
                 logger.logFout(f"Kolom '{kolomNaam}' bestaat niet")
@@ -141,9 +539,52 @@ class ExcelHandler:
                 if eindRij >= len(self.huidigDataFrame):
                     eindRij = len(self.huidigDataFrame) - 1
                 
-                return self.huidigDataFrame[kolomNaam].iloc[startRij:eindRij + 1].tolist()
+                reeks = self.huidigDataFrame[kolomNaam].iloc[startRij:eindRij + 1]
             else:
-                return self.huidigDataFrame[kolomNaam].tolist()
+                reeks = self.huidigDataFrame[kolomNaam]
+            
+            # Tekst-, categorie- en booleankolommen kunnen pd.NA of NaN bevatten; geef None zoals getCellValue
+            if reeks.dtype == object or isinstance(reeks.dtype, (pd.CategoricalDtype, pd.BooleanDtype, pd.StringDtype)):
+                reeks = reeks.astype(object)
+                reeks = reeks.where(reeks.notna(), None)
+            return reeks.tolist()
+        except Exception as e:
+            logger.logFout(f"Fout bij ophalen kolom '{kolomNaam}': {e}")
+            return None
+    
+    @_gesynchroniseerd
+    def haalKolomReeks(self, kolomNaam, rijen=None):
+        """
+        Haal een kolom op als pandas Series, voor gevectoriseerde bewerkingen
+        
+        De Series deelt zijn data met het DataFrame (Copy-on-Write) en heeft een
+        index die bij 0 begint, ook als alleen een bereik is opgevraagd. Wacht
+        tot alle rijen geladen zijn, zodat de kolom compleet is.
+        
+        Args:
+            kolomNaam (str): Naam van de kolom
+            rijen (tuple): Optioneel, tuple met (startRij, eindRij) om alleen een bereik op te halen
+            
+        Returns:
+            pandas.Series: De kolomwaarden of None bij fout
+        """
+        if self.huidigDataFrame is None:
+            logger.logFout("Kan kolom niet ophalen: Geen bestand geopend")
+            return None
+        
+        try:
+            self.wachtTotGeladen()
+            self.schrijfBufferDoor()
+            
+            if kolomNaam not in self.kolomNamen:
+                logger.logFout(f"Kolom '{kolomNaam}' bestaat niet")
+                return None
+            
+            reeks = self.huidigDataFrame[kolomNaam]
+            if rijen:
+                startRij, eindRij = rijen
+                reeks = reeks.iloc[max(startRij, 0):eindRij + 1]
+            return reeks.reset_index(drop=True)
         except Exception as e:
             logger.logFout(f"Fout bij ophalen kolom '{kolomNaam}': {e}")
             return None
@@ -160,24 +601,509 @@ class ExcelHandler:
             return False
         
         try:
+            self.wachtTotGeladen()
+            self.schrijfBufferDoor()
+            
             # Backup functionaliteit verwijderd om stabiliteitsproblemen te voorkomen
             
-            # Sla op naar origineel bestand
-            self.huidigDataFrame.to_excel(self.huidigBestand, index=False)
-            logger.logInfo(f"Excel-bestand opgeslagen: {self.huidigBestand}")
+            # Laat eerdere opslagopdrachten op de achtergrond eerst afronden
+            self.opslagWachtrij.wachtTotLeeg()
             
-            return True
+            # Sla atomisch op naar origineel bestand, bij voorkeur alleen de gewijzigde cellen
+            bereiken = self.gewijzigdeBereiken.neemOver()
+            if slaDataFrameOp(self.huidigBestand, self.huidigDataFrame, bereiken, self.huidigWerkblad):
+                return True
+            
+            self.gewijzigdeBereiken.voegSamen(bereiken)
+            return False
         except Exception as e:
             logger.logFout(f"Fout bij opslaan Excel-bestand: {e}")
             return False
     
+    def slaOpAsync(self, klaarCallback=None):
+        """
+        Sla het huidige Excel-bestand op de achtergrond op
+        
+        Er wordt direct een momentopname van de data gemaakt; het schrijven zelf
+        gebeurt op een achtergrondthread via een tijdelijk bestand dat atomisch
+        het origineel vervangt. Snel opeenvolgende verzoeken worden samengevoegd.
+        
+        Args:
+            klaarCallback (callable): Optioneel, wordt op de achtergrondthread aangeroepen
+                                      met True of False zodra het opslaan klaar is
+            
+        Returns:
+            bool: True als de opslagopdracht is ingepland, anders False
+        """
+        if not self.huidigBestand or self.huidigDataFrame is None:
+            logger.logFout("Kan niet opslaan: Geen bestand geopend")
+            return False
+        
+        try:
+            self.wachtTotGeladen()
+            self.schrijfBufferDoor()
+            
+            bestandspad = self.huidigBestand
+            werkblad = self.huidigWerkblad
+            momentopname = self.huidigDataFrame.copy()
+            bereiken = self.gewijzigdeBereiken.neemOver()
+            
+            def klaar(succes):
+                # Zet de wijzigingen terug als het opslaan mislukt, zodat ze niet verloren gaan
+                if not succes and (self.huidigBestand, self.huidigWerkblad) == (bestandspad, werkblad):
+                    self.gewijzigdeBereiken.voegSamen(bereiken)
+                if klaarCallback:
+                    klaarCallback(succes)
+            
+            self.opslagWachtrij.plaats(bestandspad, momentopname, bereiken, klaar, werkblad)
+            logger.logInfo(f"Opslaan van {bestandspad} ingepland op de achtergrond")
+            return True
+        except Exception as e:
+            logger.logFout(f"Fout bij inplannen opslaan Excel-bestand: {e}")
+            return False
+    
+    def wachtOpOpslaan(self, timeout=None):
+        """
+        Wacht tot alle opslagopdrachten op de achtergrond klaar zijn
+        
+        Args:
+            timeout (float): Optioneel, maximaal aantal seconden om te wachten
+            
+        Returns:
+            bool: True als er niets meer opgeslagen wordt, False bij een timeout
+        """
+        return self.opslagWachtrij.wachtTotLeeg(timeout)
+    
+    def getTotalRows(self):
+        """
+        Haal het aantal rijen op (alias van haalRijAantal voor de RentPro modules)
+        
+        Returns:
+            int: Aantal rijen of 0 als er geen bestand is geopend
+        """
+        return self.haalRijAantal()
+    
+    @_gesynchroniseerd
+    def getCellValue(self, rij, kolom):
+        """
+        Haal de waarde van één cel op via positionele toegang
+        
+        Wacht tot alle rijen geladen zijn, zodat ook rijen na de eerste pagina bestaan.
+        
+        Args:
+            rij (int): Rij-index (0-based)
+            kolom (int of str): Kolompositie (0-based) of kolomnaam
+            
+        Returns:
+            De celwaarde, of None als de cel leeg is
+        """
+        self.wachtTotGeladen()
+        kolomIndex = self._kolomIndex(kolom)
+        
+        # Een nog niet doorgevoerde wijziging is de actuele waarde
+        buffer = self._schrijfBuffer.get(kolomIndex)
+        if buffer is not None and rij in buffer:
+            return buffer[rij]
+        
+        return self._leegNaarNone(self._kolomArray(kolomIndex)[rij])
+    
+    @_gesynchroniseerd
+    def setCellValue(self, rij, kolom, waarde):
+        """
+        Zet de waarde van één cel
+        
+        De wijziging wordt gebufferd en per kolom in één keer naar het DataFrame
+        geschreven bij de volgende lees- of opslagactie, of via schrijfBufferDoor().
+        
+        Args:
+            rij (int): Rij-index (0-based)
+            kolom (int of str): Kolompositie (0-based) of kolomnaam
+            waarde: Nieuwe waarde voor de cel
+        """
+        if not 0 <= rij < self.haalRijAantal():
+            raise IndexError(f"Rij {rij} valt buiten het bereik van het bestand")
+        
+        kolomIndex = self._kolomIndex(kolom)
+        self._schrijfBuffer.setdefault(kolomIndex, {})[rij] = waarde
+    
+    @_gesynchroniseerd
+    def getRowValues(self, rij, kolommen=None):
+        """
+        Haal de waarden van één rij op
+        
+        Args:
+            rij (int): Rij-index (0-based)
+            kolommen (list): Optioneel, kolomnamen of -posities; standaard alle kolommen
+            
+        Returns:
+            dict: Dictionary met kolomnaam -> waarde
+        """
+        self.wachtTotGeladen()
+        if kolommen is None:
+            kolommen = range(len(self.kolomNamen))
+        
+        return {
+            self.kolomNamen[self._kolomIndex(kolom)]: self.getCellValue(rij, kolom)
+            for kolom in kolommen
+        }
+    
+    @_gesynchroniseerd
+    def setRowValues(self, rij, waarden):
+        """
+        Zet meerdere cellen van één rij
+        
+        Args:
+            rij (int): Rij-index (0-based)
+            waarden (dict): Dictionary met kolomnaam of -positie -> nieuwe waarde
+        """
+        for kolom, waarde in waarden.items():
+            self.setCellValue(rij, kolom, waarde)
+    
+    @_gesynchroniseerd
+    def getBlock(self, startRij, eindRij, kolommen=None):
+        """
+        Haal een rechthoekig blok cellen op als NumPy array
+        
+        Args:
+            startRij (int): Eerste rij (0-based, inclusief)
+            eindRij (int): Laatste rij (0-based, inclusief)
+            kolommen (list): Optioneel, kolomnamen of -posities; standaard alle kolommen
+            
+        Returns:
+            numpy.ndarray: 2D object-array met vorm (rijen, kolommen)
+        """
+        self.wachtTotGeladen()
+        self.schrijfBufferDoor()
+        
+        if kolommen is None:
+            kolomIndexen = list(range(len(self.kolomNamen)))
+        else:
+            kolomIndexen = [self._kolomIndex(kolom) for kolom in kolommen]
+        
+        return self.huidigDataFrame.iloc[startRij:eindRij + 1, kolomIndexen].to_numpy(dtype=object)
+    
+    @_gesynchroniseerd
+    def setBlock(self, startRij, kolommen, waarden):
+        """
+        Schrijf een rechthoekig blok cellen in één bewerking per kolom
+        
+        Args:
+            startRij (int): Eerste rij (0-based) van het blok
+            kolommen (list): Kolomnamen of -posities van het blok
+            waarden: 2D reeks (lijst van rijen of NumPy array) met nieuwe waarden
+            
+        Returns:
+            bool: True als het schrijven succesvol was, anders False
+        """
+        if self.huidigDataFrame is None:
+            logger.logFout("Kan blok niet schrijven: Geen bestand geopend")
+            return False
+        
+        try:
+            self.wachtTotGeladen()
+            self.schrijfBufferDoor()
+            
+            blok = np.asarray(waarden, dtype=object)
+            if blok.ndim != 2 or blok.shape[1] != len(kolommen):
+                logger.logFout("Blokvorm komt niet overeen met het aantal kolommen")
+                return False
+            
+            eindRij = startRij + blok.shape[0] - 1
+            if startRij < 0 or eindRij >= self.haalRijAantal():
+                logger.logFout(f"Blok rijen {startRij}-{eindRij} valt buiten het bestand")
+                return False
+            
+            with self.journaal.stap(f"Blok vanaf rij {startRij + 1} schrijven"):
+                for i, kolom in enumerate(kolommen):
+                    kolomIndex = self._kolomIndex(kolom)
+                    kolomNaam = self.kolomNamen[kolomIndex]
+                    self._bereidSchrijvenVoor(kolomNaam)
+                    self.huidigDataFrame.iloc[startRij:eindRij + 1, kolomIndex] = blok[:, i]
+                    self._kolomArrays.pop(kolomIndex, None)
+                    self._markeerGewijzigd(kolomNaam, range(startRij, eindRij + 1))
+            
+            return True
+        except Exception as e:
+            logger.logFout(f"Fout bij schrijven blok vanaf rij {startRij}: {e}")
+            return False
+    
+    @_gesynchroniseerd
+    def schrijfBufferDoor(self):
+        """
+        Schrijf alle gebufferde celwijzigingen naar het DataFrame, één bewerking per kolom
+        
+        Returns:
+            int: Aantal doorgevoerde celwijzigingen
+        """
+        if not self._schrijfBuffer or self.huidigDataFrame is None:
+            return 0
+        
+        self.wachtTotGeladen()
+        buffer, self._schrijfBuffer = self._schrijfBuffer, {}
+        aantal = 0
+        
+        with self.journaal.stap("Celwijzigingen"):
+            for kolomIndex, wijzigingen in buffer.items():
+                kolomNaam = self.kolomNamen[kolomIndex]
+                rijen = np.fromiter(wijzigingen.keys(), dtype=np.intp, count=len(wijzigingen))
+                waarden = np.empty(len(wijzigingen), dtype=object)
+                waarden[:] = list(wijzigingen.values())
+                
+                self._bereidSchrijvenVoor(kolomNaam)
+                self.huidigDataFrame.iloc[rijen, kolomIndex] = waarden
+                self._kolomArrays.pop(kolomIndex, None)
+                self._markeerGewijzigd(kolomNaam, rijen)
+                aantal += len(wijzigingen)
+        
+        logger.logActie(f"{aantal} gebufferde celwijzigingen doorgevoerd in {len(buffer)} kolommen")
+        return aantal
+    
+    def bewerking(self, omschrijving):
+        """
+        Groepeer alle wijzigingen binnen een with-blok tot één ongedaan te maken stap
+        
+        Args:
+            omschrijving (str): Omschrijving van de bewerking, zoals de naam van een actie
+            
+        Returns:
+            Context manager voor gebruik met 'with'
+        """
+        return self.journaal.stap(omschrijving)
+    
+    @_gesynchroniseerd
+    def maakOngedaan(self):
+        """
+        Maak de laatste bewerking ongedaan
+        
+        Returns:
+            bool: True als er een bewerking ongedaan is gemaakt, anders False
+        """
+        return self._zetJournaalStapTerug(self.journaal.maakOngedaan, "Ongedaan gemaakt")
+    
+    @_gesynchroniseerd
+    def doeOpnieuw(self):
+        """
+        Voer de laatst ongedaan gemaakte bewerking opnieuw uit
+        
+        Returns:
+            bool: True als er een bewerking opnieuw is uitgevoerd, anders False
+        """
+        return self._zetJournaalStapTerug(self.journaal.doeOpnieuw, "Opnieuw uitgevoerd")
+    
+    def _zetJournaalStapTerug(self, journaalFunctie, melding):
+        """
+        Zet de kolommen van een journaalstap terug en markeer de rijen voor opslaan
+        
+        Args:
+            journaalFunctie (callable): maakOngedaan of doeOpnieuw van het journaal
+            melding (str): Begin van de logmelding
+            
+        Returns:
+            bool: True als er een stap is teruggezet, anders False
+        """
+        if self.huidigDataFrame is None:
+            logger.logFout("Geen bestand geopend")
+            return False
+        
+        try:
+            self.wachtTotGeladen()
+            self.schrijfBufferDoor()
+            
+            stap = journaalFunctie(self.huidigDataFrame)
+            if stap is None:
+                logger.logWaarschuwing(f"{melding}: Geen bewerking beschikbaar")
+                return False
+            
+            self._kolomArrays = {}
+            self._schema = None
+            self.gewijzigdeBereiken.voegSamen(stap.bereiken)
+            for kolomNaam in stap.kolommen:
+                self._sleutelIndexen.pop(kolomNaam, None)
+            
+            logger.logActie(f"{melding}: {stap.omschrijving}")
+            return True
+        except Exception as e:
+            logger.logFout(f"Fout bij terugzetten van bewerking: {e}")
+            return False
+    
+    @_gesynchroniseerd
+    def haalSleutelIndex(self, kolom):
+        """
+        Haal de index van een sleutelkolom (zoals Productcode) naar rijen op
+        
+        De index wordt bij het eerste gebruik opgebouwd en daarna bij elke
+        wijziging van de kolom bijgewerkt. De veld-ID rij van het importsjabloon
+        telt niet mee. Dubbele sleutels worden bij het opbouwen gemeld.
+        
+        De schrijfbuffer wordt alleen doorgevoerd als die cellen van de
+        sleutelkolom bevat; andere gebufferde wijzigingen raken de index niet.
+        
+        Args:
+            kolom (int of str): Kolompositie (0-based) of kolomnaam van de sleutelkolom
+        
+        Returns:
+            SleutelIndex: De index, of None als er geen bestand is geopend
+        """
+        if not self.isBestandGeopend():
+            logger.logFout("Kan geen index maken: Geen bestand geopend")
+            return None
+        
+        self.wachtTotGeladen()
+        
+        kolomIndex = self._kolomIndex(kolom)
+        kolomNaam = self.kolomNamen[kolomIndex]
+        
+        # Eerst het schema: een gewijzigde veld-ID rij maakt de indexen ongeldig
+        eersteDataRij = self.haalSchema().eersteDataRij
+        if kolomIndex in self._schrijfBuffer:
+            self.schrijfBufferDoor()
+        
+        index = self._sleutelIndexen.get(kolomNaam)
+        if index is None:
+            index = SleutelIndex(kolomNaam, eersteDataRij)
+            index.bouw(self._kolomArray(kolomIndex))
+            self._sleutelIndexen[kolomNaam] = index
+            
+            duplicaten = index.duplicaten()
+            if duplicaten:
+                voorbeelden = ", ".join(
+                    f"'{sleutel}' (rijen {', '.join(str(rij + 1) for rij in rijen)})"
+                    for sleutel, rijen in list(duplicaten.items())[:5]
+                )
+                logger.logWaarschuwing(f"{len(duplicaten)} dubbele sleutels in kolom '{kolomNaam}': {voorbeelden}")
+            logger.logInfo(f"Index gemaakt voor kolom '{kolomNaam}' met {len(index)} sleutels")
+        
+        return index
+    
+    def haalGewijzigdeBereiken(self):
+        """
+        Haal de celbereiken op die sinds het openen of het laatste opslaan zijn gewijzigd
+        
+        Returns:
+            dict: Dictionary met kolomnaam -> lijst van (startRij, eindRij) tuples
+        """
+        self.schrijfBufferDoor()
+        return {
+            kolom: self.gewijzigdeBereiken.bereiken(kolom)
+            for kolom in self.gewijzigdeBereiken.kolommen()
+        }
+    
+    def wisGewijzigdeCellen(self):
+        """Markeer alle cellen als ongewijzigd"""
+        self.gewijzigdeBereiken.wis()
+    
+    @_gesynchroniseerd
+    def haalSchema(self):
+        """
+        Haal het kopschema (label <-> veld-ID <-> kolompositie) van het huidige bestand op
+        
+        Het schema wordt bij het openen opgebouwd en alleen opnieuw bepaald als
+        de veld-ID rij daarna is gewijzigd.
+        
+        Returns:
+            KopSchema: Het schema, of None als er geen bestand is geopend
+        """
+        if self.huidigDataFrame is None:
+            return None
+        
+        if any(0 in wijzigingen for wijzigingen in self._schrijfBuffer.values()):
+            self.schrijfBufferDoor()
+        
+        if self._schema is None:
+            self._schema = KopSchema.uitDataFrame(self.huidigDataFrame)
+        return self._schema
+    
+    def _resetCelStatus(self):
+        """Reset buffers, caches en wijzigingsregistratie na het (her)laden van data"""
+        self._schrijfBuffer = {}
+        self._kolomArrays = {}
+        self.gewijzigdeBereiken.wis()
+        self.journaal.wis()
+        self._sleutelIndexen = {}
+        self._schema = KopSchema.uitDataFrame(self.huidigDataFrame)
+    
+    def _kolomIndex(self, kolom):
+        """Vertaal een kolomnaam of -positie naar een kolompositie"""
+        if isinstance(kolom, (int, np.integer)):
+            if not 0 <= kolom < len(self.kolomNamen):
+                raise IndexError(f"Kolompositie {kolom} bestaat niet")
+            return int(kolom)
+        
+        try:
+            return self.kolomNamen.index(kolom)
+        except ValueError:
+            raise KeyError(f"Kolom '{kolom}' bestaat niet")
+    
+    def _kolomArray(self, kolomIndex):
+        """Haal de (gecachte) NumPy array van een kolom op"""
+        array = self._kolomArrays.get(kolomIndex)
+        if array is None:
+            array = self.huidigDataFrame.iloc[:, kolomIndex].to_numpy(dtype=object)
+            self._kolomArrays[kolomIndex] = array
+        return array
+    
+    def _bereidSchrijvenVoor(self, kolomNaam):
+        """Bewaar de kolom in het journaal en maak hem beschrijfbaar, vóór een schrijfactie"""
+        self.journaal.bewaarKolom(kolomNaam, self.huidigDataFrame[kolomNaam])
+        self._maakKolomBeschrijfbaar(kolomNaam)
+    
+    def _maakKolomBeschrijfbaar(self, kolomNaam):
+        """Zorg dat een kolom willekeurige waarden kan bevatten voordat erin geschreven wordt"""
+        if self.huidigDataFrame[kolomNaam].dtype != object:
+            self.huidigDataFrame[kolomNaam] = self.huidigDataFrame[kolomNaam].astype(object)
+    
+    def _markeerGewijzigd(self, kolomNaam, rijen):
+        """Registreer gewijzigde rijen van een kolom"""
+        self.gewijzigdeBereiken.markeerRijen(kolomNaam, rijen)
+        self.journaal.markeerRijen(kolomNaam, rijen)
+        
+        # Een wijziging in de veld-ID rij maakt het kopschema (en daarmee de indexen) ongeldig
+        if 0 in rijen:
+            self._schema = None
+            self._sleutelIndexen = {}
+            return
+        
+        index = self._sleutelIndexen.get(kolomNaam)
+        if index is not None:
+            kolomIndex = self.kolomNamen.index(kolomNaam)
+            if isinstance(rijen, range):
+                waarden = self.huidigDataFrame.iloc[rijen.start:rijen.stop, kolomIndex].tolist()
+            else:
+                waarden = self.huidigDataFrame.iloc[rijen, kolomIndex].tolist()
+            index.werkBij(rijen, waarden)
+    
+    @staticmethod
+    def _leegNaarNone(waarde):
+        """Converteer pandas/NumPy lege waarden (NaN, NA, NaT) naar None"""
+        try:
+            if pd.isna(waarde):
+                return None
+        except (TypeError, ValueError):
+            pass
+        return waarde
+    
     def haalRijAantal(self):
         """
         Haal het aantal rijen op in het huidige bestand
         
+        Wacht tot alle rijen geladen zijn; acties bepalen hiermee hun standaardbereik.
+        
         Returns:
             int: Aantal rijen of 0 als er geen bestand is geopend
         """
+        self.wachtTotGeladen()
+        return self.haalGeladenRijAantal()
+    
+    def haalGeladenRijAantal(self):
+        """
+        Haal het aantal rijen op dat tot nu toe geladen is, zonder te wachten
+        
+        Bedoeld voor het tonen van de laadvoortgang; tijdens het laden op de
+        achtergrond kan dit minder zijn dan het totaal.
+        
+        Returns:
+            int: Aantal geladen rijen of 0 als er geen bestand is geopend
+        """
         if self.huidigDataFrame is None:
             return 0
         
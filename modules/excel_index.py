@@ -0,0 +1,150 @@
+"""
+Excel Index module voor Excelladin Reloaded
+Hash-index van een sleutelkolom (zoals Productcode) naar rijposities, zodat een
+product in constante tijd teruggevonden wordt en dubbele sleutels opvallen
+"""
+import threading
+import numpy as np
+import pandas as pd
+
+def normaliseerSleutel(waarde):
+    """
+    Normaliseer een celwaarde tot een sleutel
+    
+    Getallen zonder decimalen worden gelijk behandeld, ongeacht of Excel ze als
+    geheel getal of als kommagetal heeft opgeslagen (123 en 123.0 -> '123').
+    
+    Args:
+        waarde: Celwaarde
+    
+    Returns:
+        str: De sleutel, of None voor een lege cel
+    """
+    if waarde is None:
+        return None
+    try:
+        if pd.isna(waarde):
+            return None
+    except (TypeError, ValueError):
+        pass
+    
+    if isinstance(waarde, (float, np.floating)) and float(waarde).is_integer():
+        waarde = int(waarde)
+    
+    sleutel = str(waarde).strip()
+    return sleutel or None
+
+class SleutelIndex:
+    """
+    Index van sleutelwaarde naar de rijen waarin die waarde voorkomt
+    
+    Houdt ook per rij de huidige sleutel bij, zodat een wijziging van een rij
+    bijgewerkt kan worden zonder de kolom opnieuw te doorzoeken.
+    """
+    
+    def __init__(self, kolomNaam, eersteRij=0):
+        """
+        Initialiseer een lege index
+        
+        Args:
+            kolomNaam (str): Naam van de sleutelkolom
+            eersteRij (int): Eerste rij die meetelt; rijen daarvoor (zoals de veld-ID rij) vallen erbuiten
+        """
+        self.kolomNaam = kolomNaam
+        self.eersteRij = eersteRij
+        self._rijen = {}
+        self._rijSleutel = {}
+        self._lock = threading.Lock()
+    
+    def bouw(self, waarden):
+        """
+        Bouw de index op uit alle waarden van de sleutelkolom
+        
+        Args:
+            waarden: Reeks met de waarden van de kolom, rij 0 eerst
+        """
+        with self._lock:
+            self._rijen = {}
+            self._rijSleutel = {}
+            for rij, waarde in enumerate(waarden):
+                if rij >= self.eersteRij:
+                    self._voegToe(rij, normaliseerSleutel(waarde))
+    
+    def werkBij(self, rijen, waarden):
+        """
+        Werk de index bij voor gewijzigde rijen
+        
+        Args:
+            rijen: Reeks rij-indexen
+            waarden: Nieuwe waarden van de sleutelkolom voor dezelfde rijen
+        """
+        with self._lock:
+            for rij, waarde in zip(rijen, waarden):
+                rij = int(rij)
+                if rij < self.eersteRij:
+                    continue
+                self._verwijder(rij)
+                self._voegToe(rij, normaliseerSleutel(waarde))
+    
+    def zoek(self, sleutel):
+        """
+        Zoek de rij van een sleutel
+        
+        Args:
+            sleutel: Te zoeken sleutelwaarde
+        
+        Returns:
+            int: Eerste rij met deze sleutel, of None als de sleutel niet voorkomt
+        """
+        rijen = self._rijen.get(normaliseerSleutel(sleutel))
+        return rijen[0] if rijen else None
+    
+    def zoekAlle(self, sleutel):
+        """
+        Zoek alle rijen van een sleutel
+        
+        Args:
+            sleutel: Te zoeken sleutelwaarde
+        
+        Returns:
+            list: Rijen met deze sleutel, oplopend gesorteerd (leeg als de sleutel niet voorkomt)
+        """
+        return list(self._rijen.get(normaliseerSleutel(sleutel), ()))
+    
+    def duplicaten(self):
+        """
+        Haal alle sleutels op die in meer dan één rij voorkomen
+        
+        Returns:
+            dict: Dictionary met sleutel -> lijst van rijen
+        """
+        with self._lock:
+            return {sleutel: list(rijen) for sleutel, rijen in self._rijen.items() if len(rijen) > 1}
+    
+    def __len__(self):
+        """Aantal verschillende sleutels in de index"""
+        return len(self._rijen)
+    
+    def __contains__(self, sleutel):
+        """Controleer of een sleutel in de index voorkomt"""
+        return normaliseerSleutel(sleutel) in self._rijen
+    
+    def _voegToe(self, rij, sleutel):
+        """Voeg een rij toe aan de index (lege sleutels worden overgeslagen)"""
+        if sleutel is None:
+            return
+        rijen = self._rijen.setdefault(sleutel, [])
+        rijen.append(rij)
+        if len(rijen) > 1 and rijen[-2] > rij:
+            rijen.sort()
+        self._rijSleutel[rij] = sleutel
+    
+    def _verwijder(self, rij):
+        """Verwijder een rij uit de index"""
+        sleutel = self._rijSleutel.pop(rij, None)
+        if sleutel is None:
+            return
+        rijen = self._rijen[sleutel]
+        rijen.remove(rij)
+        if not rijen:
+            del self._rijen[sleutel]
@@ -0,0 +1,196 @@
+"""
+Excel Journaal module voor Excelladin Reloaded
+Houdt een ongedaan maken/opnieuw journaal bij met kopieën per kolom: alleen
+kolommen die daadwerkelijk gewijzigd worden, worden bewaard
+"""
+import threading
+from contextlib import contextmanager
+import pandas as pd
+from modules.logger import logger
+from modules.excel_opslaan import GewijzigdeBereiken
+
+# Vanaf pandas 3 is Copy-on-Write altijd actief: een kolom ophalen kost dan geen kopie,
+# de data wordt pas gekopieerd als het DataFrame daarna wordt gewijzigd
+_COPY_ON_WRITE = int(pd.__version__.split('.')[0]) >= 3
+
+class JournaalStap:
+    """
+    Eén ongedaan te maken stap: de kolommen zoals ze vóór de stap waren
+    """
+    
+    def __init__(self, omschrijving):
+        """
+        Initialiseer een lege stap
+        
+        Args:
+            omschrijving (str): Omschrijving van de bewerking, zoals de naam van een actie
+        """
+        self.omschrijving = omschrijving
+        # Kolomnaam -> kolom (pandas.Series) zoals die vóór de stap was
+        self.kolommen = {}
+        # Rijen die in deze stap gewijzigd zijn, om na ongedaan maken opnieuw op te slaan
+        self.bereiken = GewijzigdeBereiken()
+
+class BewerkingsJournaal:
+    """
+    Journaal met ongedaan maken en opnieuw stappen voor een DataFrame
+    
+    Vóór de eerste schrijfactie op een kolom binnen een stap wordt die kolom
+    bewaard. Het geheugengebruik groeit dus alleen met de gewijzigde kolommen,
+    niet met de grootte van het hele werkblad.
+    """
+    
+    # Maximaal aantal stappen dat ongedaan gemaakt kan worden
+    MAX_STAPPEN = 20
+    
+    def __init__(self, maxStappen=None):
+        """
+        Initialiseer een leeg journaal
+        
+        Args:
+            maxStappen (int): Optioneel, maximaal aantal bewaarde stappen
+        """
+        self.maxStappen = max(1, maxStappen or self.MAX_STAPPEN)
+        self._ongedaan = []
+        self._opnieuw = []
+        self._openStap = None
+        self._diepte = 0
+        self._lock = threading.RLock()
+    
+    @contextmanager
+    def stap(self, omschrijving):
+        """
+        Groepeer alle schrijfacties binnen het blok tot één ongedaan te maken stap
+        
+        Geneste blokken horen bij de buitenste stap.
+        
+        Args:
+            omschrijving (str): Omschrijving van de bewerking
+        """
+        with self._lock:
+            if self._diepte == 0:
+                self._openStap = JournaalStap(omschrijving)
+            self._diepte += 1
+        
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._diepte -= 1
+                if self._diepte == 0:
+                    stap, self._openStap = self._openStap, None
+                    if stap.kolommen:
+                        self._ongedaan.append(stap)
+                        del self._ongedaan[:-self.maxStappen]
+                        self._opnieuw.clear()
+    
+    def bewaarKolom(self, kolomNaam, kolom):
+        """
+        Bewaar een kolom vóór de eerste wijziging binnen de open stap
+        
+        Args:
+            kolomNaam (str): Naam van de kolom
+            kolom (pandas.Series): De kolom zoals die nu in het DataFrame staat
+        """
+        with self._lock:
+            if self._openStap is None or kolomNaam in self._openStap.kolommen:
+                return
+            self._openStap.kolommen[kolomNaam] = kolom if _COPY_ON_WRITE else kolom.copy()
+    
+    def markeerRijen(self, kolomNaam, rijen):
+        """
+        Registreer gewijzigde rijen binnen de open stap
+        
+        Args:
+            kolomNaam (str): Naam van de kolom
+            rijen: range of reeks rij-indexen
+        """
+        with self._lock:
+            if self._openStap is not None:
+                self._openStap.bereiken.markeerRijen(kolomNaam, rijen)
+    
+    def maakOngedaan(self, dataFrame):
+        """
+        Zet de kolommen van de laatste stap terug
+        
+        Args:
+            dataFrame (pandas.DataFrame): Het DataFrame waarop de stap is uitgevoerd
+        
+        Returns:
+            JournaalStap: De teruggedraaide stap, of None als er niets ongedaan te maken is
+        """
+        with self._lock:
+            if not self._ongedaan:
+                return None
+            stap = self._ongedaan.pop()
+            self._opnieuw.append(self._wissel(dataFrame, stap))
+            return stap
+    
+    def doeOpnieuw(self, dataFrame):
+        """
+        Voer de laatst ongedaan gemaakte stap opnieuw uit
+        
+        Args:
+            dataFrame (pandas.DataFrame): Het DataFrame waarop de stap is uitgevoerd
+        
+        Returns:
+            JournaalStap: De opnieuw uitgevoerde stap, of None als er niets opnieuw te doen is
+        """
+        with self._lock:
+            if not self._opnieuw:
+                return None
+            stap = self._opnieuw.pop()
+            self._ongedaan.append(self._wissel(dataFrame, stap))
+            return stap
+    
+    def kanOngedaanMaken(self):
+        """
+        Controleer of er een stap ongedaan gemaakt kan worden
+        
+        Returns:
+            str: Omschrijving van de stap die ongedaan gemaakt kan worden, of None
+        """
+        with self._lock:
+            return self._ongedaan[-1].omschrijving if self._ongedaan else None
+    
+    def kanOpnieuw(self):
+        """
+        Controleer of er een stap opnieuw uitgevoerd kan worden
+        
+        Returns:
+            str: Omschrijving van de stap die opnieuw uitgevoerd kan worden, of None
+        """
+        with self._lock:
+            return self._opnieuw[-1].omschrijving if self._opnieuw else None
+    
+    def wis(self):
+        """Verwijder alle stappen, bijvoorbeeld na het laden van andere data"""
+        with self._lock:
+            self._ongedaan.clear()
+            self._opnieuw.clear()
+            if self._openStap is not None:
+                self._openStap = JournaalStap(self._openStap.omschrijving)
+    
+    def _wissel(self, dataFrame, stap):
+        """
+        Zet de bewaarde kolommen van een stap terug en geef de omgekeerde stap terug
+        
+        Args:
+            dataFrame (pandas.DataFrame): Het DataFrame
+            stap (JournaalStap): De terug te zetten stap
+        
+        Returns:
+            JournaalStap: Stap met de kolommen zoals ze vóór het terugzetten waren
+        """
+        omgekeerd = JournaalStap(stap.omschrijving)
+        omgekeerd.bereiken.voegSamen(stap.bereiken)
+        
+        for kolomNaam, kolom in stap.kolommen.items():
+            if kolomNaam not in dataFrame.columns:
+                logger.logWaarschuwing(f"Kolom '{kolomNaam}' bestaat niet meer, kan niet terugzetten")
+                continue
+            huidig = dataFrame[kolomNaam]
+            omgekeerd.kolommen[kolomNaam] = huidig if _COPY_ON_WRITE else huidig.copy()
+            dataFrame[kolomNaam] = kolom
+        
+        return omgekeerd
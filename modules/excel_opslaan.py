@@ -0,0 +1,973 @@
+"""
+Excel Opslaan module voor Excelladin Reloaded
+Bijhouden van gewijzigde celbereiken en het opslaan van alleen die wijzigingen
+in het bestaande werkboek, zodat opmaak, kolombreedtes en kopregels behouden blijven
+"""
+import os
+import re
+import html
+import math
+import shutil
+import zipfile
+import datetime
+import tempfile
+import threading
+import posixpath
+import xml.etree.ElementTree as ET
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+from openpyxl.utils import get_column_letter, column_index_from_string
+from modules.logger import logger
+from modules.excel_types import naarOpslagTypes
+
+# Namespaces van het xlsx-pakket
+_NS_MAIN = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+_NS_REL = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+_NS_PAKKET = 'http://schemas.openxmlformats.org/package/2006/relationships'
+
+# Grootte van de blokken waarin een werkblad gestreamd wordt
+_BLOK_GROOTTE = 1024 * 1024
+
+# Elementen van een werkblad-XML; een rij of cel is altijd zelfsluitend of eindigt op de eigen sluittag
+_RIJ_PATROON = re.compile(rb'\s*<row\b[^>]*?(?:/>|>.*?</row>)', re.DOTALL)
+_CEL_PATROON = re.compile(rb'<c\b[^>]*?(?:/>|>.*?</c>)', re.DOTALL)
+_REF_PATROON = re.compile(rb'\sr="([A-Z]*)(\d+)"')
+_TYPE_PATROON = re.compile(rb'\st="(\w+)"')
+_STIJL_PATROON = re.compile(rb'\ss="\d+"')
+_SPANS_PATROON = re.compile(rb'\sspans="[^"]*"')
+_WAARDE_PATROON = re.compile(rb'<v>(.*?)</v>', re.DOTALL)
+_TEKST_PATROON = re.compile(rb'<t(?:\s[^>]*)?>(.*?)</t>', re.DOTALL)
+_DIMENSIE_PATROON = re.compile(rb'<dimension ref="([A-Z]+)(\d+)(?::([A-Z]+)(\d+))?"')
+
+class GewijzigdeBereiken:
+    """
+    Houdt per kolom bij welke rijbereiken gewijzigd zijn
+    
+    Bereiken worden als (startRij, eindRij) paren opgeslagen (0-based, inclusief)
+    en pas bij opvragen gesorteerd en samengevoegd, zodat het markeren van een
+    hele kolom net zo goedkoop is als het markeren van één cel.
+    """
+    
+    def __init__(self):
+        """Initialiseer een lege registratie"""
+        self._bereiken = {}
+        self._samengevoegd = set()
+        self._lock = threading.RLock()
+    
+    def markeer(self, kolom, startRij, eindRij):
+        """
+        Markeer een aaneengesloten rijbereik van een kolom als gewijzigd
+        
+        Args:
+            kolom (str): Naam van de kolom
+            startRij (int): Eerste gewijzigde rij (0-based)
+            eindRij (int): Laatste gewijzigde rij (0-based, inclusief)
+        """
+        if eindRij < startRij:
+            return
+        with self._lock:
+            self._bereiken.setdefault(kolom, []).append((int(startRij), int(eindRij)))
+            self._samengevoegd.discard(kolom)
+    
+    def markeerRijen(self, kolom, rijen):
+        """
+        Markeer losse rijen van een kolom als gewijzigd
+        
+        Args:
+            kolom (str): Naam van de kolom
+            rijen (iterable): Rij-indexen (0-based)
+        """
+        if isinstance(rijen, range) and rijen.step == 1:
+            self.markeer(kolom, rijen.start, rijen.stop - 1)
+            return
+        
+        rijen = np.unique(np.fromiter(rijen, dtype=np.int64))
+        if rijen.size == 0:
+            return
+        
+        # Splits in aaneengesloten reeksen
+        breuken = np.flatnonzero(np.diff(rijen) != 1)
+        starts = np.concatenate(([rijen[0]], rijen[breuken + 1]))
+        eindes = np.concatenate((rijen[breuken], [rijen[-1]]))
+        for start, eind in zip(starts, eindes):
+            self.markeer(kolom, start, eind)
+    
+    def bereiken(self, kolom):
+        """
+        Haal de samengevoegde gewijzigde bereiken van een kolom op
+        
+        Args:
+            kolom (str): Naam van de kolom
+        
+        Returns:
+            list: Gesorteerde lijst met niet-overlappende (startRij, eindRij) tuples
+        """
+        with self._lock:
+            if kolom not in self._bereiken:
+                return []
+            
+            if kolom not in self._samengevoegd:
+                samengevoegd = []
+                for start, eind in sorted(self._bereiken[kolom]):
+                    if samengevoegd and start <= samengevoegd[-1][1] + 1:
+                        if eind > samengevoegd[-1][1]:
+                            samengevoegd[-1] = (samengevoegd[-1][0], eind)
+                    else:
+                        samengevoegd.append((start, eind))
+                self._bereiken[kolom] = samengevoegd
+                self._samengevoegd.add(kolom)
+            
+            return list(self._bereiken[kolom])
+    
+    def kolommen(self):
+        """
+        Haal de kolommen op met minstens één gewijzigd bereik
+        
+        Returns:
+            list: Lijst met kolomnamen
+        """
+        with self._lock:
+            return [kolom for kolom, bereiken in self._bereiken.items() if bereiken]
+    
+    def aantalCellen(self):
+        """
+        Tel het aantal gewijzigde cellen
+        
+        Returns:
+            int: Totaal aantal gewijzigde cellen
+        """
+        return sum(
+            eind - start + 1
+            for kolom in self.kolommen()
+            for start, eind in self.bereiken(kolom)
+        )
+    
+    def voegSamen(self, ander):
+        """
+        Neem alle bereiken van een andere registratie over
+        
+        Args:
+            ander (GewijzigdeBereiken): Registratie waarvan de bereiken worden toegevoegd
+        """
+        for kolom in ander.kolommen():
+            for start, eind in ander.bereiken(kolom):
+                self.markeer(kolom, start, eind)
+    
+    def neemOver(self):
+        """
+        Maak een kopie van de huidige bereiken en wis daarna deze registratie
+        
+        Returns:
+            GewijzigdeBereiken: Nieuwe registratie met de bereiken van dit moment
+        """
+        kopie = GewijzigdeBereiken()
+        with self._lock:
+            kopie.voegSamen(self)
+            self.wis()
+        return kopie
+    
+    def wis(self):
+        """Markeer alle cellen als ongewijzigd"""
+        with self._lock:
+            self._bereiken = {}
+            self._samengevoegd = set()
+    
+    def __bool__(self):
+        return bool(self.kolommen())
+
+def naarCelwaarde(waarde):
+    """
+    Converteer een DataFrame-waarde naar een waarde die openpyxl kan schrijven
+    
+    Args:
+        waarde: Waarde uit het DataFrame
+    
+    Returns:
+        Waarde geschikt voor een openpyxl cel (None voor lege waarden)
+    """
+    if waarde is None:
+        return None
+    
+    try:
+        if pd.isna(waarde):
+            return None
+    except (TypeError, ValueError):
+        pass
+    
+    if isinstance(waarde, pd.Timestamp):
+        return waarde.to_pydatetime()
+    if isinstance(waarde, np.generic):
+        return waarde.item()
+    if isinstance(waarde, (str, int, float, bool, datetime.date, datetime.time, datetime.datetime)):
+        return waarde
+    return str(waarde)
+
+def slaDeltaOp(bestandspad, dataFrame, gewijzigdeBereiken, werkblad=None, doelpad=None):
+    """
+    Schrijf alleen de gewijzigde cellen van een DataFrame in het bestaande werkboek
+    
+    Het DataFrame moet overeenkomen met het werkblad zoals pandas het inleest:
+    rij 1 bevat de kolomnamen en DataFrame-rij 0 staat op werkbladrij 2.
+    Opmaak, kolombreedtes en andere werkbladen blijven ongewijzigd.
+    
+    Met een apart doelpad wordt het xlsx-pakket direct gepatcht (zie
+    _patchPakket): het werkboek wordt niet in openpyxl geladen, alleen
+    uitgepakt en opnieuw ingepakt. Wat dat niet ondersteunt gaat via openpyxl.
+    
+    Args:
+        bestandspad (str): Pad naar het bestaande Excel-bestand
+        dataFrame (pandas.DataFrame): Actuele data
+        gewijzigdeBereiken (GewijzigdeBereiken): Te schrijven celbereiken
+        werkblad (str): Optioneel, naam van het werkblad; standaard het eerste werkblad
+        doelpad (str): Optioneel, pad om naartoe te schrijven; standaard bestandspad
+    
+    Returns:
+        bool: True als de wijzigingen zijn opgeslagen, False als het werkboek niet
+              (meer) bij het DataFrame past en volledig opgeslagen moet worden
+    """
+    wijzigingen = _verzamelWijzigingen(dataFrame, gewijzigdeBereiken)
+    if wijzigingen is None:
+        return False
+    
+    if doelpad and os.path.abspath(doelpad) != os.path.abspath(bestandspad):
+        try:
+            if not _patchPakket(bestandspad, doelpad, dataFrame, wijzigingen, werkblad):
+                return False
+            aantalCellen = sum(len(cellen) for cellen in wijzigingen.values())
+            logger.logInfo(f"{aantalCellen} gewijzigde cellen opgeslagen in {doelpad}")
+            return True
+        except _PakketNietOndersteund as e:
+            logger.logInfo(f"Werkboek wordt via openpyxl gepatcht: {e}")
+        except (zipfile.BadZipFile, ET.ParseError, KeyError, ValueError) as e:
+            logger.logWaarschuwing(f"Werkboek kon niet direct gepatcht worden, via openpyxl: {e}")
+    
+    return _slaDeltaOpViaOpenpyxl(bestandspad, dataFrame, wijzigingen, werkblad, doelpad)
+
+def _verzamelWijzigingen(dataFrame, gewijzigdeBereiken):
+    """
+    Verzamel de te schrijven celwaarden per werkbladrij
+    
+    Args:
+        dataFrame (pandas.DataFrame): Actuele data
+        gewijzigdeBereiken (GewijzigdeBereiken): Te schrijven celbereiken
+    
+    Returns:
+        dict: Werkbladrij (1-based) -> {kolomindex (0-based): celwaarde},
+              of None als een gewijzigde kolom niet meer bestaat
+    """
+    wijzigingen = {}
+    for kolom in gewijzigdeBereiken.kolommen():
+        if kolom not in dataFrame.columns:
+            logger.logWaarschuwing(f"Gewijzigde kolom '{kolom}' bestaat niet meer in de data")
+            return None
+        
+        kolomIndex = dataFrame.columns.get_loc(kolom)
+        for startRij, eindRij in gewijzigdeBereiken.bereiken(kolom):
+            waarden = dataFrame.iloc[startRij:eindRij + 1, kolomIndex].tolist()
+            for offset, waarde in enumerate(waarden):
+                wijzigingen.setdefault(startRij + offset + 2, {})[kolomIndex] = naarCelwaarde(waarde)
+    return wijzigingen
+
+def _kopPastBijData(bestandspad, dataFrame, kopregel):
+    """
+    Controleer of de kopregel van het werkblad nog overeenkomt met de kolommen van het DataFrame
+    
+    Args:
+        bestandspad (str): Pad naar het Excel-bestand, voor de melding
+        dataFrame (pandas.DataFrame): Actuele data
+        kopregel (list): Waarden van rij 1, één per kolom van het DataFrame
+    
+    Returns:
+        bool: True als de kopregel past
+    """
+    kolomNamen = [str(kolom) for kolom in dataFrame.columns]
+    for i, (naam, kop) in enumerate(zip(kolomNamen, kopregel)):
+        if kop is None and naam == f"Unnamed: {i}":
+            continue
+        if str(kop) != naam and not naam.startswith(f"{kop}."):
+            logger.logWaarschuwing(
+                f"Kopregel van {bestandspad} past niet bij de data (kolom {i + 1}: '{kop}' != '{naam}')"
+            )
+            return False
+    return True
+
+def _slaDeltaOpViaOpenpyxl(bestandspad, dataFrame, wijzigingen, werkblad=None, doelpad=None):
+    """
+    Schrijf de gewijzigde cellen via openpyxl; leest en schrijft het hele werkboek
+    
+    Args:
+        bestandspad (str): Pad naar het bestaande Excel-bestand
+        dataFrame (pandas.DataFrame): Actuele data
+        wijzigingen (dict): Te schrijven cellen, zie _verzamelWijzigingen
+        werkblad (str): Optioneel, naam van het werkblad; standaard het eerste werkblad
+        doelpad (str): Optioneel, pad om naartoe te schrijven; standaard bestandspad
+    
+    Returns:
+        bool: True als de wijzigingen zijn opgeslagen, False als de kopregel niet past
+    """
+    werkboek = load_workbook(bestandspad, keep_vba=bestandspad.lower().endswith('.xlsm'))
+    try:
+        blad = werkboek[werkblad] if werkblad else werkboek.worksheets[0]
+        
+        kopregel = [blad.cell(row=1, column=i + 1).value for i in range(len(dataFrame.columns))]
+        if not _kopPastBijData(bestandspad, dataFrame, kopregel):
+            return False
+        
+        aantalCellen = 0
+        for rij, cellen in wijzigingen.items():
+            for kolomIndex, waarde in cellen.items():
+                # Via .value toewijzen: cell(value=None) laat een bestaande waarde staan
+                blad.cell(row=rij, column=kolomIndex + 1).value = waarde
+            aantalCellen += len(cellen)
+        
+        werkboek.save(doelpad or bestandspad)
+        logger.logInfo(f"{aantalCellen} gewijzigde cellen opgeslagen in {doelpad or bestandspad}")
+        return True
+    finally:
+        werkboek.close()
+
+class _PakketNietOndersteund(Exception):
+    """Intern signaal dat het werkboek niet direct gepatcht kan worden, maar via openpyxl moet"""
+
+class _KopPastNiet(Exception):
+    """Intern signaal dat de kopregel niet bij de data past"""
+
+def _leesXml(pakket, pad):
+    """Lees en parse een (klein) XML-onderdeel van het pakket"""
+    return ET.fromstring(pakket.read(pad))
+
+def _relaties(pakket, onderdeel):
+    """
+    Lees de relaties van een onderdeel van het pakket
+    
+    Args:
+        pakket (zipfile.ZipFile): Het geopende pakket
+        onderdeel (str): Pad van het onderdeel, zoals 'xl/workbook.xml'; '' voor het pakket zelf
+    
+    Returns:
+        dict: Relatie-ID -> (type, absoluut pad van het doel)
+    """
+    map_, naam = posixpath.split(onderdeel)
+    relsPad = posixpath.join(map_, '_rels', f"{naam}.rels")
+    relaties = {}
+    for relatie in _leesXml(pakket, relsPad).iter(f'{{{_NS_PAKKET}}}Relationship'):
+        doel = relatie.get('Target')
+        if relatie.get('TargetMode') == 'External':
+            continue
+        pad = doel.lstrip('/') if doel.startswith('/') else posixpath.normpath(posixpath.join(map_, doel))
+        relaties[relatie.get('Id')] = (relatie.get('Type'), pad)
+    return relaties
+
+def _zoekOnderdelen(pakket, werkblad):
+    """
+    Zoek het werkboek, het werkblad en de gedeelde teksten in het pakket
+    
+    Args:
+        pakket (zipfile.ZipFile): Het geopende pakket
+        werkblad (str): Naam van het werkblad, of None voor het eerste werkblad
+    
+    Returns:
+        tuple: (werkboekPad, werkbladPad, gedeeldeTekstenPad of None)
+    """
+    werkboekPad = next(
+        (pad for soort, pad in _relaties(pakket, '').values() if soort.endswith('/officeDocument')),
+        None
+    )
+    if werkboekPad is None:
+        raise _PakketNietOndersteund("geen werkboek in het pakket")
+    
+    relaties = _relaties(pakket, werkboekPad)
+    werkbladen = []
+    for blad in _leesXml(pakket, werkboekPad).iter(f'{{{_NS_MAIN}}}sheet'):
+        soort, pad = relaties.get(blad.get(f'{{{_NS_REL}}}id'), (None, None))
+        if soort and soort.endswith('/worksheet'):
+            werkbladen.append((blad.get('name'), pad))
+    
+    if werkblad:
+        bladPad = next((pad for naam, pad in werkbladen if naam == werkblad), None)
+    else:
+        bladPad = werkbladen[0][1] if werkbladen else None
+    if bladPad is None:
+        raise _PakketNietOndersteund(f"werkblad {werkblad or '1'} niet gevonden")
+    
+    tekstenPad = next((pad for soort, pad in relaties.values() if soort.endswith('/sharedStrings')), None)
+    return werkboekPad, bladPad, tekstenPad
+
+def _leesGedeeldeTeksten(pakket, pad, indexen):
+    """
+    Lees de gevraagde gedeelde teksten, zonder de hele tabel in het geheugen te laden
+    
+    Args:
+        pakket (zipfile.ZipFile): Het geopende pakket
+        pad (str): Pad van de gedeelde teksten, of None
+        indexen (set): Gevraagde indexen
+    
+    Returns:
+        dict: Index -> tekst
+    """
+    teksten = {}
+    if not indexen or pad is None:
+        return teksten
+    
+    laatste = max(indexen)
+    index = 0
+    with pakket.open(pad) as bron:
+        for _, element in ET.iterparse(bron):
+            if element.tag != f'{{{_NS_MAIN}}}si':
+                continue
+            if index in indexen:
+                # Uitspraakhulp (rPh) hoort niet bij de tekst
+                delen = [element.find(f'{{{_NS_MAIN}}}t')] + [
+                    run.find(f'{{{_NS_MAIN}}}t') for run in element.findall(f'{{{_NS_MAIN}}}r')
+                ]
+                teksten[index] = ''.join(deel.text or '' for deel in delen if deel is not None)
+            element.clear()
+            index += 1
+            if index > laatste:
+                break
+    return teksten
+
+def _leesKopregel(pakket, tekstenPad, rijXml, aantalKolommen):
+    """
+    Lees de waarden van rij 1 zoals openpyxl ze zou geven
+    
+    Args:
+        pakket (zipfile.ZipFile): Het geopende pakket
+        tekstenPad (str): Pad van de gedeelde teksten, of None
+        rijXml (bytes): XML van rij 1, of None als de rij ontbreekt
+        aantalKolommen (int): Aantal kolommen van het DataFrame
+    
+    Returns:
+        list: Waarde per kolom (None voor lege cellen)
+    """
+    kopregel = [None] * aantalKolommen
+    gedeeld = {}
+    for cel in _CEL_PATROON.finditer(rijXml or b''):
+        celXml = cel.group(0)
+        ref = _REF_PATROON.search(celXml)
+        if not ref or not ref.group(1):
+            raise _PakketNietOndersteund("cel zonder verwijzing in de kopregel")
+        kolom = column_index_from_string(ref.group(1).decode('ascii')) - 1
+        if kolom >= aantalKolommen:
+            continue
+        
+        soort = _TYPE_PATROON.search(celXml.split(b'>', 1)[0])
+        soort = soort.group(1) if soort else b'n'
+        waarde = _WAARDE_PATROON.search(celXml)
+        tekst = html.unescape(waarde.group(1).decode('utf-8')) if waarde else None
+        if soort == b's' and tekst is not None:
+            gedeeld[kolom] = int(tekst)
+        elif soort == b'inlineStr':
+            kopregel[kolom] = html.unescape(b''.join(_TEKST_PATROON.findall(celXml)).decode('utf-8'))
+        elif soort == b'b' and tekst is not None:
+            kopregel[kolom] = tekst == '1'
+        elif soort == b'n' and tekst is not None:
+            # Zelfde regel als openpyxl: met punt of exponent een float, anders een int
+            kopregel[kolom] = float(tekst) if '.' in tekst or 'E' in tekst.upper() else int(tekst)
+        else:
+            kopregel[kolom] = tekst
+    
+    teksten = _leesGedeeldeTeksten(pakket, tekstenPad, set(gedeeld.values()))
+    for kolom, index in gedeeld.items():
+        kopregel[kolom] = teksten.get(index)
+    return kopregel
+
+def _celXml(rij, kolomIndex, waarde, stijl=b''):
+    """
+    Maak de XML van een cel; tekst wordt inline geschreven, zodat de gedeelde teksten ongewijzigd blijven
+    
+    Args:
+        rij (int): Werkbladrij (1-based)
+        kolomIndex (int): Kolomindex (0-based)
+        waarde: Celwaarde, zie naarCelwaarde
+        stijl (bytes): Optioneel, het s-attribuut van de cel die vervangen wordt
+    
+    Returns:
+        bytes: De cel-XML
+    """
+    begin = f'<c r="{get_column_letter(kolomIndex + 1)}{rij}"'.encode('ascii') + stijl
+    if waarde is None:
+        return begin + b'/>'
+    if isinstance(waarde, bool):
+        return begin + b' t="b"><v>' + (b'1' if waarde else b'0') + b'</v></c>'
+    if isinstance(waarde, int):
+        return begin + b'><v>' + str(waarde).encode('ascii') + b'</v></c>'
+    if isinstance(waarde, float):
+        if not math.isfinite(waarde):
+            raise _PakketNietOndersteund(f"niet-eindig getal in cel {get_column_letter(kolomIndex + 1)}{rij}")
+        return begin + b'><v>' + repr(waarde).encode('ascii') + b'</v></c>'
+    if isinstance(waarde, str):
+        # openpyxl maakt van tekst met '=' een formule en weigert stuurtekens; die gevallen laten we aan openpyxl
+        if waarde.startswith('=') or ILLEGAL_CHARACTERS_RE.search(waarde):
+            raise _PakketNietOndersteund(f"formule of stuurteken in cel {get_column_letter(kolomIndex + 1)}{rij}")
+        tekst = waarde.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+        return begin + b' t="inlineStr"><is><t xml:space="preserve">' + tekst.encode('utf-8') + b'</t></is></c>'
+    # Datums hebben een getalnotatie in de stijlen nodig
+    raise _PakketNietOndersteund(f"datum of tijd in cel {get_column_letter(kolomIndex + 1)}{rij}")
+
+def _patchRij(rijXml, rij, cellen):
+    """
+    Vervang of voeg de gewijzigde cellen van een rij in; de rest van de rij blijft byte voor byte gelijk
+    
+    Args:
+        rijXml (bytes): XML van de rij, zonder voorafgaande witruimte
+        rij (int): Werkbladrij (1-based)
+        cellen (dict): Kolomindex (0-based) -> celwaarde
+    
+    Returns:
+        bytes: De nieuwe rij-XML
+    """
+    tagEinde = rijXml.index(b'>') + 1
+    startTag = rijXml[:tagEinde]
+    if startTag.endswith(b'/>'):
+        startTag = startTag[:-2] + b'>'
+        inhoud = b''
+    else:
+        inhoud = rijXml[tagEinde:-len(b'</row>')]
+    
+    nieuw = sorted(cellen.items())
+    j = 0
+    ingevoegd = False
+    delen = []
+    vorige = 0
+    for cel in _CEL_PATROON.finditer(inhoud):
+        celXml = cel.group(0)
+        celTag = celXml.split(b'>', 1)[0]
+        ref = _REF_PATROON.search(celTag)
+        if not ref or not ref.group(1):
+            raise _PakketNietOndersteund(f"cel zonder verwijzing in rij {rij}")
+        kolom = column_index_from_string(ref.group(1).decode('ascii')) - 1
+        
+        delen.append(inhoud[vorige:cel.start()])
+        while j < len(nieuw) and nieuw[j][0] < kolom:
+            delen.append(_celXml(rij, nieuw[j][0], nieuw[j][1]))
+            ingevoegd = True
+            j += 1
+        if j < len(nieuw) and nieuw[j][0] == kolom:
+            if b'<f' in celXml:
+                raise _PakketNietOndersteund(f"formule in gewijzigde cel {ref.group(1).decode('ascii')}{rij}")
+            stijl = _STIJL_PATROON.search(celTag)
+            delen.append(_celXml(rij, kolom, nieuw[j][1], stijl.group(0) if stijl else b''))
+            j += 1
+        else:
+            delen.append(celXml)
+        vorige = cel.end()
+    
+    rest = inhoud[vorige:]
+    if j < len(nieuw):
+        ingevoegd = True
+        delen.extend(_celXml(rij, kolom, waarde) for kolom, waarde in nieuw[j:])
+    delen.append(rest)
+    
+    # spans is een hint voor het bereik van de rij; na invoegen klopt hij niet meer
+    if ingevoegd:
+        startTag = _SPANS_PATROON.sub(b'', startTag)
+    return startTag + b''.join(delen) + b'</row>'
+
+def _nieuweRij(rij, cellen):
+    """Maak de XML van een rij die nog niet in het werkblad stond"""
+    return f'<row r="{rij}">'.encode('ascii') + b''.join(
+        _celXml(rij, kolom, waarde) for kolom, waarde in sorted(cellen.items())
+    ) + b'</row>'
+
+def _patchDimensie(voorwerk, wijzigingen):
+    """Vergroot de dimension van het werkblad als de wijzigingen erbuiten vallen"""
+    match = _DIMENSIE_PATROON.search(voorwerk)
+    if not match or not wijzigingen:
+        return voorwerk
+    
+    eindKolom = match.group(3) or match.group(1)
+    eindRij = int(match.group(4) or match.group(2))
+    maxRij = max(eindRij, max(wijzigingen))
+    maxKolom = max(
+        column_index_from_string(eindKolom.decode('ascii')),
+        max(kolom for cellen in wijzigingen.values() for kolom in cellen) + 1
+    )
+    ref = f'<dimension ref="{match.group(1).decode("ascii")}{match.group(2).decode("ascii")}:{get_column_letter(maxKolom)}{maxRij}"'
+    return voorwerk[:match.start()] + ref.encode('ascii') + voorwerk[match.end():]
+
+def _herschrijfWerkblad(bron, doel, wijzigingen, controleerKop):
+    """
+    Stream een werkblad-XML van bron naar doel en patch alleen de gewijzigde rijen
+    
+    Rijen zonder wijzigingen worden ongewijzigd doorgeschreven; alleen de
+    gewijzigde rijen worden ontleed.
+    
+    Args:
+        bron: Leesbare stroom met de werkblad-XML
+        doel: Schrijfbare stroom voor de nieuwe werkblad-XML
+        wijzigingen (dict): Te schrijven cellen, zie _verzamelWijzigingen
+        controleerKop (callable): Wordt aangeroepen met de XML van rij 1 (of None)
+    """
+    buffer = b''
+    einde = False
+    
+    def leesMeer():
+        nonlocal buffer, einde
+        blok = bron.read(_BLOK_GROOTTE)
+        einde = not blok
+        buffer += blok
+    
+    # Alles tot en met de starttag van sheetData
+    while b'<sheetData' not in buffer and not einde:
+        leesMeer()
+    begin = buffer.find(b'<sheetData')
+    if begin < 0:
+        raise _PakketNietOndersteund("geen sheetData in het werkblad")
+    while buffer.find(b'>', begin) < 0 and not einde:
+        leesMeer()
+    tagEinde = buffer.find(b'>', begin) + 1
+    if buffer[tagEinde - 2:tagEinde] == b'/>':
+        raise _PakketNietOndersteund("leeg werkblad")
+    doel.write(_patchDimensie(buffer[:begin], wijzigingen) + buffer[begin:tagEinde])
+    buffer = buffer[tagEinde:]
+    
+    wachtend = sorted(wijzigingen)
+    volgende = 0
+    kopGecontroleerd = False
+    uit = []
+    positie = 0
+    while True:
+        match = _RIJ_PATROON.match(buffer, positie)
+        if match is None:
+            rest = buffer[positie:].lstrip()
+            if rest.startswith(b'</sheetData>'):
+                break
+            if einde or (len(rest) >= len(b'</sheetData>') and not rest.startswith(b'<row')):
+                raise _PakketNietOndersteund("onverwachte inhoud in sheetData")
+            buffer = buffer[positie:]
+            positie = 0
+            doel.write(b''.join(uit))
+            uit = []
+            leesMeer()
+            continue
+        
+        rijXml = match.group(0)
+        inspringing = len(rijXml) - len(rijXml.lstrip())
+        ref = _REF_PATROON.search(rijXml.split(b'>', 1)[0])
+        if not ref:
+            raise _PakketNietOndersteund("rij zonder nummer")
+        rij = int(ref.group(2))
+        
+        if not kopGecontroleerd:
+            controleerKop(rijXml[inspringing:] if rij == 1 else None)
+            kopGecontroleerd = True
+        
+        while volgende < len(wachtend) and wachtend[volgende] < rij:
+            uit.append(_nieuweRij(wachtend[volgende], wijzigingen[wachtend[volgende]]))
+            volgende += 1
+        if volgende < len(wachtend) and wachtend[volgende] == rij:
+            uit.append(rijXml[:inspringing] + _patchRij(rijXml[inspringing:], rij, wijzigingen[rij]))
+            volgende += 1
+        else:
+            uit.append(rijXml)
+        positie = match.end()
+        
+        # Na de laatste gewijzigde rij hoeft niets meer ontleed te worden
+        if volgende == len(wachtend):
+            break
+    
+    if not kopGecontroleerd:
+        controleerKop(None)
+    
+    # Rijen na de laatste bestaande rij, en daarna de rest van het werkblad ongewijzigd
+    uit.extend(_nieuweRij(rij, wijzigingen[rij]) for rij in wachtend[volgende:])
+    doel.write(b''.join(uit))
+    doel.write(buffer[positie:])
+    shutil.copyfileobj(bron, doel, _BLOK_GROOTTE)
+
+def _zetVolledigHerberekenen(werkboekXml):
+    """
+    Laat Excel bij het openen alle formules herberekenen, zoals na opslaan via openpyxl
+    
+    Nodig omdat formules die naar gewijzigde cellen verwijzen nog hun oude
+    berekende waarde bevatten.
+    """
+    match = re.search(rb'<calcPr\b[^>]*?/?>', werkboekXml)
+    if match:
+        if b'fullCalcOnLoad' in match.group(0):
+            return werkboekXml
+        return werkboekXml[:match.start() + len(b'<calcPr')] + b' fullCalcOnLoad="1"' + werkboekXml[match.start() + len(b'<calcPr'):]
+    
+    # calcPr staat voor deze elementen, of anders aan het einde van het werkboek
+    volgende = re.search(
+        rb'<(?:oleSize|customWorkbookViews|pivotCaches|smartTagPr|smartTagTypes|webPublishing'
+        rb'|fileRecoveryPr|webPublishObjects|extLst)\b|</workbook>',
+        werkboekXml
+    )
+    if not volgende:
+        raise _PakketNietOndersteund("onbekende opbouw van het werkboek")
+    return werkboekXml[:volgende.start()] + b'<calcPr fullCalcOnLoad="1"/>' + werkboekXml[volgende.start():]
+
+def _nieuwOnderdeel(info, compressie=None):
+    """
+    Maak de ZipInfo voor een onderdeel dat opnieuw geschreven wordt
+    
+    Alleen naam, datum en attributen worden overgenomen; groottes, CRC en
+    extra velden bepaalt zipfile zelf bij het schrijven.
+    
+    Args:
+        info (zipfile.ZipInfo): Het onderdeel in het bronpakket
+        compressie (int): Optioneel, compressiemethode; standaard die van het bronpakket
+    
+    Returns:
+        zipfile.ZipInfo: Nieuwe ZipInfo voor het doelpakket
+    """
+    nieuw = zipfile.ZipInfo(info.filename, info.date_time)
+    nieuw.compress_type = info.compress_type if compressie is None else compressie
+    nieuw.external_attr = info.external_attr
+    return nieuw
+
+def _kopieerOnderdeel(bron, doel, info):
+    """
+    Kopieer een onderdeel ongewijzigd naar het doelpakket
+    
+    Args:
+        bron (zipfile.ZipFile): Het bronpakket
+        doel (zipfile.ZipFile): Het doelpakket, geopend om te schrijven
+        info (zipfile.ZipInfo): Het te kopiëren onderdeel
+    """
+    grootte = info.file_size
+    with bron.open(info) as invoer, doel.open(_nieuwOnderdeel(info), 'w', force_zip64=grootte > zipfile.ZIP64_LIMIT) as uitvoer:
+        shutil.copyfileobj(invoer, uitvoer, _BLOK_GROOTTE)
+
+def _patchPakket(bestandspad, doelpad, dataFrame, wijzigingen, werkblad=None):
+    """
+    Schrijf de gewijzigde cellen door het xlsx-pakket direct te patchen
+    
+    Alle onderdelen worden ongewijzigd gekopieerd, behalve het werkblad: dat
+    wordt gestreamd en alleen de gewijzigde rijen worden herschreven, met tekst
+    als inlineStr zodat sharedStrings.xml ongemoeid blijft. Bevat het werkboek
+    formules, dan wordt herberekenen bij openen aangezet.
+    
+    Args:
+        bestandspad (str): Pad naar het bestaande Excel-bestand
+        doelpad (str): Pad om naartoe te schrijven (niet gelijk aan bestandspad)
+        dataFrame (pandas.DataFrame): Actuele data, voor de controle van de kopregel
+        wijzigingen (dict): Te schrijven cellen, zie _verzamelWijzigingen
+        werkblad (str): Optioneel, naam van het werkblad; standaard het eerste werkblad
+    
+    Returns:
+        bool: True als de wijzigingen zijn opgeslagen, False als de kopregel niet past
+    
+    Raises:
+        _PakketNietOndersteund: Als het pakket of een waarde niet direct te patchen is
+    """
+    with zipfile.ZipFile(bestandspad) as bron:
+        werkboekPad, bladPad, tekstenPad = _zoekOnderdelen(bron, werkblad)
+        heeftFormules = any(posixpath.basename(naam) == 'calcChain.xml' for naam in bron.namelist())
+        
+        def controleerKop(rijXml):
+            kopregel = _leesKopregel(bron, tekstenPad, rijXml, len(dataFrame.columns))
+            if not _kopPastBijData(bestandspad, dataFrame, kopregel):
+                raise _KopPastNiet()
+        
+        try:
+            with zipfile.ZipFile(doelpad, 'w', zipfile.ZIP_DEFLATED) as doel:
+                for info in bron.infolist():
+                    if info.filename == bladPad:
+                        nieuw = _nieuwOnderdeel(info, zipfile.ZIP_DEFLATED)
+                        with bron.open(info) as invoer, doel.open(nieuw, 'w', force_zip64=True) as uitvoer:
+                            _herschrijfWerkblad(invoer, uitvoer, wijzigingen, controleerKop)
+                    elif info.filename == werkboekPad and heeftFormules:
+                        doel.writestr(_nieuwOnderdeel(info), _zetVolledigHerberekenen(bron.read(info)))
+                    else:
+                        _kopieerOnderdeel(bron, doel, info)
+        except _KopPastNiet:
+            return False
+    return True
+
+def schrijfAtomisch(doelpad, schrijfFunctie):
+    """
+    Schrijf een bestand via een tijdelijk bestand dat daarna atomisch wordt hernoemd
+    
+    Het tijdelijke bestand staat in dezelfde map, wordt met fsync naar schijf
+    geschreven en vervangt pas daarna het doelbestand. Bij een crash blijft dus
+    altijd het oude of het nieuwe bestand over, nooit een half geschreven bestand.
+    
+    Args:
+        doelpad (str): Pad van het uiteindelijke bestand
+        schrijfFunctie (callable): Functie die het bestand schrijft naar het opgegeven (tijdelijke) pad
+    """
+    map_ = os.path.dirname(os.path.abspath(doelpad))
+    basis, extensie = os.path.splitext(os.path.basename(doelpad))
+    fd, tijdelijkPad = tempfile.mkstemp(prefix=f".~{basis}_", suffix=extensie, dir=map_)
+    os.close(fd)
+    
+    try:
+        schrijfFunctie(tijdelijkPad)
+        
+        with open(tijdelijkPad, 'r+b') as bestand:
+            bestand.flush()
+            os.fsync(bestand.fileno())
+        
+        os.replace(tijdelijkPad, doelpad)
+        
+        # Zorg dat ook de hernoeming zelf op schijf staat (niet mogelijk op Windows)
+        if os.name != 'nt':
+            mapFd = os.open(map_, os.O_RDONLY)
+            try:
+                os.fsync(mapFd)
+            finally:
+                os.close(mapFd)
+    except Exception:
+        if os.path.exists(tijdelijkPad):
+            os.remove(tijdelijkPad)
+        raise
+
+def slaDataFrameOp(bestandspad, dataFrame, gewijzigdeBereiken, werkblad=None):
+    """
+    Sla een DataFrame atomisch op, bij voorkeur door alleen de gewijzigde cellen te schrijven
+    
+    Args:
+        bestandspad (str): Pad naar het Excel-bestand
+        dataFrame (pandas.DataFrame): Op te slaan data
+        gewijzigdeBereiken (GewijzigdeBereiken): Gewijzigde celbereiken sinds de vorige opslag
+        werkblad (str): Optioneel, naam van het werkblad; standaard het eerste werkblad
+    
+    Returns:
+        bool: True als het opslaan succesvol was, anders False
+    """
+    try:
+        # Schrijf bij voorkeur alleen de gewijzigde cellen in het bestaande werkboek,
+        # zodat opmaak en kolombreedtes van het template behouden blijven
+        if bestandspad.lower().endswith(('.xlsx', '.xlsm')) and os.path.exists(bestandspad):
+            if not gewijzigdeBereiken:
+                logger.logInfo(f"Geen wijzigingen om op te slaan in {bestandspad}")
+                return True
+            
+            def schrijfDelta(tijdelijkPad):
+                if not slaDeltaOp(bestandspad, dataFrame, gewijzigdeBereiken, werkblad, doelpad=tijdelijkPad):
+                    raise _DeltaNietMogelijk()
+            
+            try:
+                schrijfAtomisch(bestandspad, schrijfDelta)
+                logger.logInfo(f"Excel-bestand opgeslagen: {bestandspad}")
+                return True
+            except _DeltaNietMogelijk:
+                logger.logWaarschuwing("Opslaan van alleen de wijzigingen niet mogelijk, volledig opslaan")
+            
+            # Vervang alleen dit werkblad zodat de andere werkbladen behouden blijven
+            if werkblad:
+                opslagData = naarOpslagTypes(dataFrame)
+                
+                def schrijfWerkblad(tijdelijkPad):
+                    shutil.copyfile(bestandspad, tijdelijkPad)
+                    with pd.ExcelWriter(tijdelijkPad, engine='openpyxl', mode='a', if_sheet_exists='replace') as schrijver:
+                        opslagData.to_excel(schrijver, sheet_name=werkblad, index=False)
+                
+                schrijfAtomisch(bestandspad, schrijfWerkblad)
+                logger.logInfo(f"Excel-bestand opgeslagen: {bestandspad}")
+                return True
+        
+        opslagData = naarOpslagTypes(dataFrame)
+        schrijfAtomisch(
+            bestandspad,
+            lambda tijdelijkPad: opslagData.to_excel(tijdelijkPad, sheet_name=werkblad or 'Sheet1', index=False)
+        )
+        logger.logInfo(f"Excel-bestand opgeslagen: {bestandspad}")
+        return True
+    except Exception as e:
+        logger.logFout(f"Fout bij opslaan Excel-bestand: {e}")
+        return False
+
+class _DeltaNietMogelijk(Exception):
+    """Intern signaal dat het werkboek volledig opgeslagen moet worden"""
+
+class OpslagWachtrij:
+    """
+    Wachtrij die opslagopdrachten op een achtergrondthread uitvoert
+    
+    Zolang een opdracht voor een werkblad nog niet gestart is, worden nieuwe
+    opdrachten voor hetzelfde werkblad ermee samengevoegd: de nieuwste data wint
+    en de gewijzigde bereiken worden gebundeld, zodat het bestand één keer
+    geschreven wordt.
+    """
+    
+    def __init__(self):
+        """Initialiseer een lege wachtrij"""
+        self._conditie = threading.Condition()
+        self._wachtend = {}
+        self._bezig = False
+        self._thread = None
+    
+    def plaats(self, bestandspad, dataFrame, gewijzigdeBereiken, klaarCallback=None, werkblad=None):
+        """
+        Plaats een opslagopdracht in de wachtrij
+        
+        Args:
+            bestandspad (str): Pad naar het Excel-bestand
+            dataFrame (pandas.DataFrame): Momentopname van de data; wordt niet meer gewijzigd
+            gewijzigdeBereiken (GewijzigdeBereiken): Gewijzigde bereiken van deze momentopname
+            klaarCallback (callable): Optioneel, wordt op de achtergrondthread aangeroepen
+                                      met True of False zodra de opdracht klaar is
+            werkblad (str): Optioneel, naam van het werkblad; standaard het eerste werkblad
+        """
+        with self._conditie:
+            taak = self._wachtend.get((bestandspad, werkblad))
+            if taak:
+                taak['dataFrame'] = dataFrame
+                taak['bereiken'].voegSamen(gewijzigdeBereiken)
+                logger.logInfo(f"Opslagopdracht voor {bestandspad} samengevoegd met wachtende opdracht")
+            else:
+                bereiken = GewijzigdeBereiken()
+                bereiken.voegSamen(gewijzigdeBereiken)
+                taak = {'dataFrame': dataFrame, 'bereiken': bereiken, 'callbacks': []}
+                self._wachtend[(bestandspad, werkblad)] = taak
+            
+            if klaarCallback:
+                taak['callbacks'].append(klaarCallback)
+            
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._werker, daemon=True)
+                self._thread.start()
+            
+            self._conditie.notify_all()
+    
+    def wachtTotLeeg(self, timeout=None):
+        """
+        Wacht tot alle opslagopdrachten zijn uitgevoerd
+        
+        Args:
+            timeout (float): Optioneel, maximaal aantal seconden om te wachten
+        
+        Returns:
+            bool: True als de wachtrij leeg is, False bij een timeout
+        """
+        with self._conditie:
+            return self._conditie.wait_for(lambda: not self._wachtend and not self._bezig, timeout)
+    
+    def isBezig(self):
+        """
+        Controleer of er opslagopdrachten wachten of worden uitgevoerd
+        
+        Returns:
+            bool: True als er nog opgeslagen wordt
+        """
+        with self._conditie:
+            return bool(self._wachtend) or self._bezig
+    
+    def _werker(self):
+        """Voer opslagopdrachten uit totdat de wachtrij leeg is"""
+        while True:
+            with self._conditie:
+                if not self._wachtend:
+                    self._thread = None
+                    return
+                bestandspad, werkblad = next(iter(self._wachtend))
+                taak = self._wachtend.pop((bestandspad, werkblad))
+                self._bezig = True
+            
+            try:
+                succes = slaDataFrameOp(bestandspad, taak['dataFrame'], taak['bereiken'], werkblad)
+                for callback in taak['callbacks']:
+                    try:
+                        callback(succes)
+                    except Exception as e:
+                        logger.logFout(f"Fout in opslag callback: {e}")
+            finally:
+                with self._conditie:
+                    self._bezig = False
+                    self._conditie.notify_all()
@@ -0,0 +1,150 @@
+"""
+Excel Schema module voor Excelladin Reloaded
+Beschrijft de tweeregelige kop van het RentPro importsjabloon: een rij met labels
+(de kolomnamen) gevolgd door een rij met RentPro veld-ID's
+"""
+import re
+import pandas as pd
+
+# Een veld-ID is een HTML-id zoals 'Product_Name' of 'Property_15_Value'
+_VELD_ID_PATROON = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+# Minstens één veld-ID moet herkenbaar RentPro zijn, zodat een gewone datarij niet als kop telt
+_RENTPRO_VELD_PATROON = re.compile(r'^(Product_\w+|Property_\d+_Value)$')
+
+class KopSchema:
+    """
+    Koppeling tussen label, RentPro veld-ID en kolompositie van een werkblad
+    
+    Wordt één keer opgebouwd bij het openen van een bestand, zodat acties de
+    koppeling niet telkens opnieuw uit het DataFrame hoeven te lezen.
+    """
+    
+    def __init__(self, labels, veldIds=None):
+        """
+        Initialiseer het schema
+        
+        Args:
+            labels (list): Kolomnamen (labels) in kolomvolgorde
+            veldIds (list): Optioneel, veld-ID per kolom (None voor kolommen zonder ID)
+        """
+        self.labels = list(labels)
+        self.veldIds = list(veldIds) if veldIds is not None else [None] * len(self.labels)
+        self.heeftVeldIds = any(self.veldIds)
+        
+        self._labelPositie = {label: i for i, label in enumerate(self.labels)}
+        self._veldIdPositie = {}
+        for i, veldId in enumerate(self.veldIds):
+            if veldId and veldId not in self._veldIdPositie:
+                self._veldIdPositie[veldId] = i
+        
+        self.labelNaarVeldId = {
+            label: veldId for label, veldId in zip(self.labels, self.veldIds) if veldId
+        }
+        self.veldIdNaarLabel = {
+            veldId: self.labels[i] for veldId, i in self._veldIdPositie.items()
+        }
+    
+    @classmethod
+    def uitDataFrame(cls, dataFrame):
+        """
+        Bouw het schema op uit een ingelezen werkblad
+        
+        De eerste datarij geldt als veld-ID rij als alle gevulde cellen geldige
+        veld-ID's zijn, de ID's uniek zijn, minstens de helft van de kolommen
+        gevuld is en minstens één ID een herkenbaar RentPro veld is.
+        
+        Args:
+            dataFrame (pandas.DataFrame): Het ingelezen werkblad
+        
+        Returns:
+            KopSchema: Het schema van het werkblad
+        """
+        labels = list(dataFrame.columns)
+        if dataFrame.empty:
+            return cls(labels)
+        
+        eersteRij = [None if _isLeeg(waarde) else waarde for waarde in dataFrame.iloc[0].tolist()]
+        gevuld = [waarde for waarde in eersteRij if waarde is not None]
+        
+        isVeldIdRij = (
+            len(gevuld) * 2 >= len(labels)
+            and all(isinstance(waarde, str) and _VELD_ID_PATROON.match(waarde) for waarde in gevuld)
+            and len(set(gevuld)) == len(gevuld)
+            and any(_RENTPRO_VELD_PATROON.match(waarde) for waarde in gevuld)
+        )
+        
+        return cls(labels, eersteRij if isVeldIdRij else None)
+    
+    @property
+    def eersteDataRij(self):
+        """Rij-index (0-based) van de eerste rij met productdata"""
+        return 1 if self.heeftVeldIds else 0
+    
+    def positieVanLabel(self, label):
+        """
+        Haal de kolompositie van een label op
+        
+        Args:
+            label (str): Label (kolomnaam)
+        
+        Returns:
+            int: Kolompositie, of None als het label niet bestaat
+        """
+        return self._labelPositie.get(label)
+    
+    def positieVanVeldId(self, veldId):
+        """
+        Haal de kolompositie van een RentPro veld-ID op
+        
+        Args:
+            veldId (str): RentPro veld-ID
+        
+        Returns:
+            int: Kolompositie, of None als het veld-ID niet in de kop staat
+        """
+        return self._veldIdPositie.get(veldId)
+    
+    def veldIdVanLabel(self, label):
+        """
+        Haal het RentPro veld-ID van een label op
+        
+        Args:
+            label (str): Label (kolomnaam)
+        
+        Returns:
+            str: Veld-ID, of None als de kolom geen veld-ID heeft
+        """
+        return self.labelNaarVeldId.get(label)
+    
+    def labelVanVeldId(self, veldId):
+        """
+        Haal het label van een RentPro veld-ID op
+        
+        Args:
+            veldId (str): RentPro veld-ID
+        
+        Returns:
+            str: Label (kolomnaam), of None als het veld-ID niet in de kop staat
+        """
+        return self.veldIdNaarLabel.get(veldId)
+    
+    def veldIdVanPositie(self, positie):
+        """
+        Haal het RentPro veld-ID van een kolompositie op
+        
+        Args:
+            positie (int): Kolompositie (0-based)
+        
+        Returns:
+            str: Veld-ID, of None als de kolom geen veld-ID heeft
+        """
+        return self.veldIds[positie]
+
+def _isLeeg(waarde):
+    """Controleer of een celwaarde leeg is (None, NaN of lege tekst)"""
+    if isinstance(waarde, str):
+        return not waarde.strip()
+    try:
+        return bool(pd.isna(waarde))
+    except (TypeError, ValueError):
+        return False
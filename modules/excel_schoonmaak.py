@@ -0,0 +1,114 @@
+"""
+Excel Schoonmaak module voor Excelladin Reloaded
+Schoonmaakstappen voor tekstkolommen, die tot één pijplijn van gevectoriseerde
+Series.str-bewerkingen per combinatie van stappen worden samengesteld
+"""
+import re
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+
+# Vooraf gecompileerde patronen, gelijk aan de oorspronkelijke re.sub-aanroepen
+_LEESTEKENS = re.compile(r'[^\w\s]')
+_WITRUIMTE = re.compile(r'\s+')
+
+_IS_TEKST = np.frompyfunc(lambda waarde: isinstance(waarde, str), 1, 1)
+
+# Beschikbare stappen: naam -> (omschrijving, bewerking op een Series met alleen tekst)
+SCHOONMAAK_STAPPEN = {
+    "normaliseerUnicode": (
+        "Zet tekens om naar hun standaardvorm (NFKC), zoals vaste spaties naar gewone spaties",
+        lambda reeks: reeks.str.normalize('NFKC')
+    ),
+    "verwijderLeestekens": (
+        "Verwijder leestekens",
+        lambda reeks: reeks.str.replace(_LEESTEKENS, '', regex=True)
+    ),
+    "verwijderSpaties": (
+        "Vervang reeksen witruimte door één spatie en verwijder spaties aan begin en eind",
+        lambda reeks: reeks.str.replace(_WITRUIMTE, ' ', regex=True).str.strip()
+    ),
+    "bijsnijden": (
+        "Verwijder witruimte aan begin en eind",
+        lambda reeks: reeks.str.strip()
+    ),
+    "kleineLetters": (
+        "Zet alle letters om naar kleine letters",
+        lambda reeks: reeks.str.lower()
+    ),
+}
+
+class SchoonmaakPijplijn:
+    """
+    Vaste reeks schoonmaakstappen voor tekstkolommen
+    
+    Per kolom worden alleen de unieke tekstwaarden schoongemaakt, met één
+    Series.str-bewerking per stap. Lege cellen en getallen blijven ongewijzigd,
+    zodat numerieke kolommen geen tekst worden.
+    """
+    
+    def __init__(self, stappen):
+        """
+        Stel de pijplijn samen
+        
+        Args:
+            stappen (tuple): Namen van de stappen in uitvoervolgorde
+        
+        Raises:
+            ValueError: Als een stap niet bestaat
+        """
+        onbekend = [stap for stap in stappen if stap not in SCHOONMAAK_STAPPEN]
+        if onbekend:
+            raise ValueError(f"Onbekende schoonmaakstap(pen): {', '.join(onbekend)}")
+        
+        self.stappen = tuple(stappen)
+        self._bewerkingen = [SCHOONMAAK_STAPPEN[stap][1] for stap in self.stappen]
+    
+    def pasToe(self, reeks):
+        """
+        Maak een kolom schoon
+        
+        Args:
+            reeks (pandas.Series): De kolom
+        
+        Returns:
+            pandas.Series: De schoongemaakte kolom, of None als er niets veranderd is
+        """
+        if not self._bewerkingen or not _kanTekstBevatten(reeks.dtype):
+            return None
+        
+        waarden = reeks.to_numpy(dtype=object)
+        isTekst = _IS_TEKST(waarden).astype(bool)
+        if not isTekst.any():
+            return None
+        
+        codes, uniek = pd.factorize(waarden[isTekst])
+        uniek = pd.Series(np.asarray(uniek, dtype=object), dtype=object)
+        schoon = uniek
+        for bewerking in self._bewerkingen:
+            schoon = bewerking(schoon)
+        
+        schoon = schoon.to_numpy(dtype=object)
+        if np.array_equal(schoon, uniek.to_numpy()):
+            return None
+        
+        resultaat = waarden.copy()
+        resultaat[isTekst] = schoon[codes]
+        return pd.Series(resultaat, index=reeks.index, name=reeks.name, dtype=object)
+
+def _kanTekstBevatten(dtype):
+    """Controleer of een kolom met dit datatype tekst kan bevatten"""
+    return dtype == object or isinstance(dtype, (pd.StringDtype, pd.CategoricalDtype))
+
+@lru_cache(maxsize=32)
+def compileerPijplijn(stappen):
+    """
+    Stel een pijplijn samen (met cache per combinatie van stappen)
+    
+    Args:
+        stappen (tuple): Namen van de stappen in uitvoervolgorde
+    
+    Returns:
+        SchoonmaakPijplijn: De samengestelde pijplijn
+    """
+    return SchoonmaakPijplijn(stappen)
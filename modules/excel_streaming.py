@@ -0,0 +1,103 @@
+"""
+Excel Streaming module voor Excelladin Reloaded
+Leest grote Excel-bestanden in stukken (chunks) via de read-only modus van openpyxl,
+zodat niet het hele werkboek tegelijk in het geheugen hoeft te staan
+"""
+from openpyxl import load_workbook
+from modules.logger import logger
+
+class StreamingLezer:
+    """
+    Leest de rijen van één werkblad in chunks met openpyxl read-only iteratie
+    
+    Gedraagt zich zoals pandas.read_excel met standaardinstellingen: de eerste rij
+    bevat de kolomnamen en lege rijen aan het einde van het werkblad worden genegeerd.
+    """
+    
+    def __init__(self, bestandspad, werkblad=None):
+        """
+        Open het werkboek en lees de kopregel
+        
+        Args:
+            bestandspad (str): Pad naar het Excel-bestand
+            werkblad (str): Optioneel, naam van het werkblad; standaard het eerste werkblad
+        """
+        self.bestandspad = bestandspad
+        self.werkboek = load_workbook(bestandspad, read_only=True, data_only=True)
+        blad = self.werkboek[werkblad] if werkblad else self.werkboek.worksheets[0]
+        self.werkblad = blad.title
+        self._rijIterator = blad.iter_rows(values_only=True)
+        self._openstaandeLegeRijen = 0
+        self.klaar = False
+        self.kolomNamen = self._maakKolomNamen(next(self._rijIterator, None) or ())
+    
+    def leesChunk(self, aantalRijen):
+        """
+        Lees de volgende chunk rijen
+        
+        Args:
+            aantalRijen (int): Maximaal aantal rijen in de chunk
+        
+        Returns:
+            list: Lijst met tuples, elk zo breed als het aantal kolommen
+        """
+        rijen = []
+        breedte = len(self.kolomNamen)
+        
+        while len(rijen) < aantalRijen:
+            rij = next(self._rijIterator, None)
+            if rij is None:
+                self.klaar = True
+                break
+            
+            rij = tuple(rij[:breedte]) + (None,) * (breedte - len(rij))
+            
+            # Lege rijen alleen meenemen als er daarna nog data volgt
+            if all(waarde is None for waarde in rij):
+                self._openstaandeLegeRijen += 1
+                continue
+            
+            if self._openstaandeLegeRijen:
+                rijen.extend([(None,) * breedte] * self._openstaandeLegeRijen)
+                self._openstaandeLegeRijen = 0
+            rijen.append(rij)
+        
+        return rijen
+    
+    def sluit(self):
+        """Sluit het werkboek en geef de bestandshandle vrij"""
+        try:
+            self.werkboek.close()
+        except Exception as e:
+            logger.logWaarschuwing(f"Kon werkboek niet sluiten: {e}")
+    
+    @staticmethod
+    def _maakKolomNamen(kopregel):
+        """
+        Bepaal kolomnamen op dezelfde manier als pandas
+        
+        Lege kolomkoppen worden 'Unnamed: N' en dubbele namen krijgen een
+        achtervoegsel zoals '.1'.
+        
+        Args:
+            kopregel (tuple): Waarden van de eerste rij
+        
+        Returns:
+            list: Lijst met unieke kolomnamen
+        """
+        kopregel = list(kopregel)
+        while kopregel and kopregel[-1] is None:
+            kopregel.pop()
+        
+        namen = []
+        gezien = {}
+        for i, waarde in enumerate(kopregel):
+            naam = f"Unnamed: {i}" if waarde is None else waarde
+            if naam in gezien:
+                gezien[naam] += 1
+                naam = f"{naam}.{gezien[naam]}"
+            else:
+                gezien[naam] = 0
+            namen.append(naam)
+        
+        return namen
@@ -0,0 +1,115 @@
+"""
+Excel Types module voor Excelladin Reloaded
+Zet ingelezen kolommen om naar compacte datatypes (categorieën, nullable booleans
+en Arrow-tekst) om geheugen te besparen, en terug naar gewone waarden bij opslaan
+"""
+import importlib.util
+import numpy as np
+import pandas as pd
+from modules.logger import logger
+
+# Arrow-tekstkolommen vereisen pyarrow (zie requirements.txt); zonder pyarrow blijven
+# tekstkolommen die geen categorie worden gewone object-kolommen
+ARROW_BESCHIKBAAR = importlib.util.find_spec("pyarrow") is not None
+
+# Een tekstkolom wordt een categorie als hooguit dit deel van de waarden uniek is
+CATEGORIE_RATIO = 0.5
+# Maximaal aantal verschillende waarden in een categoriekolom
+MAX_CATEGORIEEN = 1000
+
+def _compactType(reeks):
+    """
+    Bepaal het compacte datatype voor een kolom
+    
+    Args:
+        reeks (pandas.Series): De kolom
+    
+    Returns:
+        Het compacte datatype, of None als de kolom ongewijzigd blijft
+    """
+    if reeks.dtype != object and not isinstance(reeks.dtype, pd.StringDtype):
+        return None
+    
+    waarden = reeks.dropna()
+    if waarden.empty:
+        return None
+    
+    soorten = set(map(type, waarden))
+    if soorten <= {bool, np.bool_}:
+        return "boolean"
+    if soorten != {str}:
+        return None
+    
+    aantalUniek = waarden.nunique()
+    if aantalUniek <= MAX_CATEGORIEEN and aantalUniek <= len(waarden) * CATEGORIE_RATIO:
+        return "category"
+    if ARROW_BESCHIKBAAR:
+        return pd.StringDtype("pyarrow")
+    return None
+
+def comprimeerDataFrame(dataFrame):
+    """
+    Zet kolommen om naar compacte datatypes
+    
+    Tekstkolommen met weinig verschillende waarden (zoals categorie of BTW
+    percentage) worden categorieën, kolommen met alleen True/False worden
+    nullable booleans en overige tekstkolommen worden Arrow-tekst als pyarrow
+    beschikbaar is. Numerieke en gemengde kolommen blijven ongewijzigd.
+    
+    Args:
+        dataFrame (pandas.DataFrame): Het ingelezen werkblad
+    
+    Returns:
+        tuple: (pandas.DataFrame met compacte types, aantal bespaarde bytes)
+    """
+    voor = int(dataFrame.memory_usage(deep=True).sum())
+    
+    omzettingen = {}
+    for kolom in dataFrame.columns:
+        try:
+            compactType = _compactType(dataFrame[kolom])
+        except TypeError:
+            # Niet-hashbare waarden (zoals lijsten) kunnen niet compact worden opgeslagen
+            compactType = None
+        if compactType is not None:
+            omzettingen[kolom] = compactType
+    
+    if not omzettingen:
+        return dataFrame, 0
+    
+    compact = dataFrame.astype(omzettingen)
+    bespaard = voor - int(compact.memory_usage(deep=True).sum())
+    
+    logger.logInfo(
+        f"Compacte datatypes toegepast op {len(omzettingen)} kolommen: "
+        f"{voor / 1024 / 1024:.2f} MB -> {(voor - bespaard) / 1024 / 1024:.2f} MB "
+        f"({bespaard / 1024 / 1024:.2f} MB bespaard)"
+    )
+    return compact, bespaard
+
+def naarOpslagTypes(dataFrame):
+    """
+    Zet compacte kolommen terug naar gewone Python-waarden voor het opslaan
+    
+    Categorieën, nullable booleans en tekstkolommen worden object-kolommen met
+    None voor lege cellen, zodat het opgeslagen bestand gelijk is aan een bestand
+    zonder compacte types.
+    
+    Args:
+        dataFrame (pandas.DataFrame): Op te slaan data
+    
+    Returns:
+        pandas.DataFrame: Data met object-kolommen in plaats van compacte types
+    """
+    terugTeZetten = [
+        kolom for kolom, dtype in dataFrame.dtypes.items()
+        if isinstance(dtype, (pd.CategoricalDtype, pd.BooleanDtype, pd.StringDtype))
+    ]
+    if not terugTeZetten:
+        return dataFrame
+    
+    resultaat = dataFrame.copy(deep=False)
+    for kolom in terugTeZetten:
+        reeks = resultaat[kolom].astype(object)
+        resultaat[kolom] = reeks.where(reeks.notna(), None)
+    return resultaat
@@ -0,0 +1,124 @@
+"""
+Excel Werkboek module voor Excelladin Reloaded
+Geeft toegang tot alle werkbladen van een werkboek, waarbij een werkblad pas
+wordt ingelezen als het nodig is en een beperkt aantal ingelezen werkbladen
+in het geheugen blijft
+"""
+import threading
+from collections import OrderedDict
+import pandas as pd
+from openpyxl import load_workbook
+from modules.logger import logger
+
+def leesBladNamen(bestandspad):
+    """
+    Lees de namen van de werkbladen uit de metadata van het werkboek
+    
+    Voor .xlsx/.xlsm wordt alleen het werkboekoverzicht gelezen; de werkbladen
+    zelf worden niet geparsed.
+    
+    Args:
+        bestandspad (str): Pad naar het Excel-bestand
+    
+    Returns:
+        list: Namen van de werkbladen in werkboekvolgorde
+    """
+    if bestandspad.lower().endswith(('.xlsx', '.xlsm')):
+        werkboek = load_workbook(bestandspad, read_only=True)
+        try:
+            return list(werkboek.sheetnames)
+        finally:
+            werkboek.close()
+    
+    with pd.ExcelFile(bestandspad) as excelBestand:
+        return list(excelBestand.sheet_names)
+
+class Werkboek:
+    """
+    Werkboek met werkbladen die bij de eerste toegang worden ingelezen
+    
+    Ingelezen werkbladen worden bewaard in een LRU met een vaste bovengrens;
+    het minst recent gebruikte werkblad valt als eerste uit het geheugen.
+    """
+    
+    # Standaard maximaal aantal ingelezen werkbladen in het geheugen
+    MAX_GELADEN_BLADEN = 4
+    
+    def __init__(self, bestandspad, laadFunctie, maxGeladenBladen=None):
+        """
+        Initialiseer het werkboek en lees de namen van de werkbladen
+        
+        Args:
+            bestandspad (str): Pad naar het Excel-bestand
+            laadFunctie (callable): Functie die een werkbladnaam krijgt en het DataFrame teruggeeft
+            maxGeladenBladen (int): Optioneel, maximaal aantal ingelezen werkbladen in het geheugen
+        """
+        self.bestandspad = bestandspad
+        self.bladNamen = leesBladNamen(bestandspad)
+        self.maxGeladenBladen = max(1, maxGeladenBladen or self.MAX_GELADEN_BLADEN)
+        self._laadFunctie = laadFunctie
+        self._geladen = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def haalBlad(self, naam):
+        """
+        Haal een werkblad op en lees het in als het nog niet geladen is
+        
+        Args:
+            naam (str): Naam van het werkblad
+        
+        Returns:
+            pandas.DataFrame: De data van het werkblad
+        """
+        if naam not in self.bladNamen:
+            raise KeyError(f"Werkblad '{naam}' bestaat niet in {self.bestandspad}")
+        
+        with self._lock:
+            dataFrame = self._geladen.get(naam)
+            if dataFrame is not None:
+                self._geladen.move_to_end(naam)
+                return dataFrame
+        
+        logger.logInfo(f"Werkblad '{naam}' inlezen uit {self.bestandspad}")
+        dataFrame = self._laadFunctie(naam)
+        self.bewaar(naam, dataFrame)
+        return dataFrame
+    
+    def bewaar(self, naam, dataFrame):
+        """
+        Bewaar een ingelezen werkblad als meest recent gebruikt
+        
+        Args:
+            naam (str): Naam van het werkblad
+            dataFrame (pandas.DataFrame): De data van het werkblad
+        """
+        with self._lock:
+            self._geladen[naam] = dataFrame
+            self._geladen.move_to_end(naam)
+            
+            while len(self._geladen) > self.maxGeladenBladen:
+                verwijderd, _ = self._geladen.popitem(last=False)
+                logger.logInfo(f"Werkblad '{verwijderd}' uit het geheugen verwijderd")
+    
+    def isGeladen(self, naam):
+        """
+        Controleer of een werkblad al ingelezen in het geheugen staat
+        
+        Args:
+            naam (str): Naam van het werkblad
+        
+        Returns:
+            bool: True als het werkblad geladen is, anders False
+        """
+        with self._lock:
+            return naam in self._geladen
+    
+    def geladenBladen(self):
+        """
+        Haal de namen van de ingelezen werkbladen op
+        
+        Returns:
+            list: Namen van minst naar meest recent gebruikt
+        """
+        with self._lock:
+            return list(self._geladen)
@@ -2,7 +2,7 @@
 Acties tabblad voor Excelladin Reloaded
 """
 import tkinter as tk
-from tkinter import ttk, simpledialog
+from tkinter import ttk, simpledialog, filedialog
 
 from assets.theme import KLEUREN, STIJLEN
 from modules.gui.components import Tooltip, StijlvollePopup
@@ -25,6 +25,7 @@ class ActiesTab:
         self.parent = parent
         self.app = app
         self.categorieFrames = {}
+        self.laatsteActies = []  # laatst uitgevoerde acties, om als workflow op te slaan
         
         # Bouw de UI
         self._buildUI()
@@ -157,6 +158,55 @@ class ActiesTab:
         )
         self.uitvoerButton.pack(fill=tk.X, pady=10)
         Tooltip(self.uitvoerButton, "Voer alle geselecteerde acties uit in volgorde")
+        
+        # Opgeslagen workflows laden en opslaan
+        workflowFrame = tk.Frame(
+            self.container,
+            background=KLEUREN["achtergrond"]
+        )
+        workflowFrame.pack(fill=tk.X, pady=(0, 10))
+        
+        self.laadWorkflowButton = ttk.Button(
+            workflowFrame,
+            text="Workflow Laden",
+            command=self.laadWorkflow
+        )
+        self.laadWorkflowButton.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 5))
+        Tooltip(self.laadWorkflowButton, "Laad een opgeslagen workflow (JSON of YAML) en voer deze uit")
+        
+        self.slaWorkflowOpButton = ttk.Button(
+            workflowFrame,
+            text="Workflow Opslaan",
+            command=self.slaWorkflowOp
+        )
+        self.slaWorkflowOpButton.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(5, 0))
+        Tooltip(self.slaWorkflowOpButton, "Sla de laatst uitgevoerde acties op als workflow")
+        
+        # Ongedaan maken en opnieuw knoppen
+        journaalFrame = tk.Frame(
+            self.container,
+            background=KLEUREN["achtergrond"]
+        )
+        journaalFrame.pack(fill=tk.X)
+        
+        self.ongedaanButton = ttk.Button(
+            journaalFrame,
+            text="Ongedaan Maken",
+            command=self.maakOngedaan
+        )
+        self.ongedaanButton.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 5))
+        Tooltip(self.ongedaanButton, "Maak de laatste actie ongedaan (Ctrl+Z)")
+        
+        self.opnieuwButton = ttk.Button(
+            journaalFrame,
+            text="Opnieuw",
+            command=self.doeOpnieuw
+        )
+        self.opnieuwButton.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(5, 0))
+        Tooltip(self.opnieuwButton, "Voer de laatst ongedaan gemaakte actie opnieuw uit (Ctrl+Y)")
+        
+        self.app.root.bind("<Control-z>", lambda event: self.maakOngedaan())
+        self.app.root.bind("<Control-y>", lambda event: self.doeOpnieuw())
     
     def _buildCategorieTabbladen(self):
         """Bouw tabbladen voor actiecategorieën"""
@@ -458,12 +508,75 @@ class ActiesTab:
                     {'tekst': 'Nee', 'commando': lambda: popup.nee_actie()}
                 ]
             )
-            if popup.wacht_op_antwoord() and excelHandler.slaOp():
-                self.app.updateStatus("Wijzigingen opgeslagen")
+            if popup.wacht_op_antwoord():
+                self._slaOpOpAchtergrond()
         else:
             self.app.updateStatus("Fout bij uitvoeren actie")
             self.app.toonFoutmelding("Fout", resultaat.bericht)
     
+    def maakOngedaan(self):
+        """Maak de laatste actie ongedaan"""
+        if not excelHandler.isBestandGeopend():
+            return
+        
+        excelHandler.schrijfBufferDoor()
+        omschrijving = excelHandler.journaal.kanOngedaanMaken()
+        if not omschrijving:
+            self.app.updateStatus("Niets om ongedaan te maken")
+            return
+        
+        if excelHandler.maakOngedaan():
+            self.app.updateStatus(f"Ongedaan gemaakt: {omschrijving}")
+        else:
+            self.app.toonFoutmelding("Fout", f"Kon '{omschrijving}' niet ongedaan maken")
+    
+    def doeOpnieuw(self):
+        """Voer de laatst ongedaan gemaakte actie opnieuw uit"""
+        if not excelHandler.isBestandGeopend():
+            return
+        
+        excelHandler.schrijfBufferDoor()
+        omschrijving = excelHandler.journaal.kanOpnieuw()
+        if not omschrijving:
+            self.app.updateStatus("Niets om opnieuw uit te voeren")
+            return
+        
+        if excelHandler.doeOpnieuw():
+            self.app.updateStatus(f"Opnieuw uitgevoerd: {omschrijving}")
+        else:
+            self.app.toonFoutmelding("Fout", f"Kon '{omschrijving}' niet opnieuw uitvoeren")
+    
+    def _slaOpOpAchtergrond(self, toonMelding=False):
+        """
+        Sla de wijzigingen op de achtergrond op zodat de GUI responsief blijft
+        
+        Args:
+            toonMelding (bool): Toon een succesmelding zodra het opslaan klaar is
+        """
+        def klaar(succes):
+            # Wordt aangeroepen vanaf de opslagthread, dus via root.after naar de GUI
+            self.app.root.after(0, lambda: self._toonOpslagResultaat(succes, toonMelding))
+        
+        self.app.updateStatus("Bezig met opslaan op de achtergrond...")
+        if not excelHandler.slaOpAsync(klaar):
+            self._toonOpslagResultaat(False, toonMelding)
+    
+    def _toonOpslagResultaat(self, succes, toonMelding):
+        """
+        Toon het resultaat van het opslaan op de achtergrond
+        
+        Args:
+            succes (bool): True als het opslaan succesvol was
+            toonMelding (bool): Toon ook een succesmelding
+        """
+        if succes:
+            self.app.updateStatus("Wijzigingen opgeslagen")
+            if toonMelding:
+                self.app.toonSuccesmelding("Succes", "Wijzigingen zijn opgeslagen")
+        else:
+            self.app.updateStatus("Fout bij opslaan")
+            self.app.toonFoutmelding("Fout", "Kon wijzigingen niet opslaan")
+    
     def _vraagActieParameters(self, actie):
         """
         Vraag parameters voor een actie op basis van het type
@@ -477,7 +590,7 @@ class ActiesTab:
         # Implementeer hier de logica om parameters te vragen op basis van actie type
         # Dit is een eenvoudige implementatie die uitgebreid kan worden
         
-        if isinstance(actie, BESCHIKBARE_ACTIES["kolomVullen"].__class__):
+        if actie.naam == "kolomVullen":
             # Vraag om bronkolommen en formaat
             bronKolommen = self._toonKolomKeuzeDlg()
             if not bronKolommen:
@@ -505,30 +618,58 @@ class ActiesTab:
                 "formaat": formaat
             }
         
-        elif isinstance(actie, BESCHIKBARE_ACTIES["kolomSchoonmaken"].__class__):
-            # Vraag om kolom
-            kolom = simpledialog.askstring(
-                "Kolom", 
-                "Geef de naam van de kolom op die je wilt schoonmaken"
-            )
-            if not kolom:
+        elif actie.naam == "kolomSchoonmaken":
+            # Vraag om kolommen
+            kolommen = self._toonKolomKeuzeDlg()
+            if not kolommen:
                 return None
             
-            # Vraag opties
-            verwijderSpaties = tk.messagebox.askyesno(
+            # Vraag opties, in de volgorde waarin ze worden uitgevoerd
+            stappen = []
+            if tk.messagebox.askyesno(
+                "Normaliseer tekens", 
+                "Wil je speciale tekens (zoals vaste spaties) normaliseren?"
+            ):
+                stappen.append("normaliseerUnicode")
+            
+            if tk.messagebox.askyesno(
+                "Verwijder leestekens", 
+                "Wil je leestekens verwijderen?"
+            ):
+                stappen.append("verwijderLeestekens")
+            
+            if tk.messagebox.askyesno(
                 "Verwijder spaties", 
                 "Wil je extra spaties verwijderen?"
+            ):
+                stappen.append("verwijderSpaties")
+            
+            return {
+                "kolommen": kolommen,
+                "stappen": stappen
+            }
+        
+        elif actie.naam == "kolomBerekenen":
+            # Vraag om doelkolom
+            doelKolom = simpledialog.askstring(
+                "Doelkolom", 
+                "Geef de naam van de doelkolom op"
             )
+            if not doelKolom:
+                return None
             
-            verwijderLeestekens = tk.messagebox.askyesno(
-                "Verwijder leestekens", 
-                "Wil je leestekens verwijderen?"
+            # Vraag om formule
+            expressie = simpledialog.askstring(
+                "Formule", 
+                "Geef de formule op. Gebruik kolomnamen of [kolom met spaties] en ; tussen argumenten.\n"
+                "Voorbeeld: AFRONDEN(Inkoopprijs * (1 + Margepercentage / 100); 2)"
             )
+            if not expressie:
+                return None
             
             return {
-                "kolom": kolom,
-                "verwijderSpaties": verwijderSpaties,
-                "verwijderLeestekens": verwijderLeestekens
+                "doelKolom": doelKolom,
+                "expressie": expressie
             }
         
         # Voeg hier meer actie types toe
@@ -592,8 +733,8 @@ class ActiesTab:
                     {'tekst': 'Nee', 'commando': lambda: popup.nee_actie()}
                 ]
             )
-            if popup.wacht_op_antwoord() and excelHandler.slaOp():
-                self.app.updateStatus("Wijzigingen opgeslagen")
+            if popup.wacht_op_antwoord():
+                self._slaOpOpAchtergrond()
         else:
             self.app.updateStatus("Fout bij vullen kolom")
             self.app.toonFoutmelding("Fout", resultaat.bericht)
@@ -779,17 +920,57 @@ class ActiesTab:
         # Bepaal bereik
         bereik = self.haalGeselecteerdBereik()
         
+        # Onthoud de acties, zodat ze als workflow opgeslagen kunnen worden
+        self.laatsteActies = list(workflow.acties)
+        
+        succes = self._voerWorkflowUit(workflow, bereik)
+        
+        # Verwijder tijdelijke workflow
+        workflowManager.verwijderWorkflow("temp_workflow")
+        
+        self._toonWorkflowResultaat(succes)
+    
+    def _voerWorkflowUit(self, workflow, bereik):
+        """
+        Voer een workflow uit met voortgangsupdates in de statusbalk
+        
+        Args:
+            workflow (Workflow): De workflow
+            bereik (tuple): Tuple met (startRij, eindRij), of None voor het bereik van de workflow
+            
+        Returns:
+            bool: True als alle acties succesvol zijn uitgevoerd, anders False
+        """
         # Voer workflow uit met voortgangsupdate
         def updateVoortgang(percentage, actieNaam):
             self.app.updateStatus(f"Uitvoeren: {actieNaam} ({percentage:.1f}%)")
             self.app.root.update_idletasks()
         
-        self.app.updateStatus("Bezig met uitvoeren van acties...")
-        succes = workflow.voerUit(updateVoortgang, bereik)
+        # Bied aan een afgebroken run voort te zetten, zodat voltooide rijen niet opnieuw naar RentPro gaan
+        hervat = False
+        if workflow.kanHervatten(bereik):
+            popup = StijlvollePopup(
+                self.app.root,
+                "Hervatten",
+                "Een eerdere uitvoering van deze acties is afgebroken. Wil je verdergaan waar die gebleven was?",
+                popup_type="vraag",
+                actie_knoppen=[
+                    {'tekst': 'Ja', 'commando': lambda: popup.ja_actie(), 'primair': True},
+                    {'tekst': 'Nee', 'commando': lambda: popup.nee_actie()}
+                ]
+            )
+            hervat = popup.wacht_op_antwoord()
         
-        # Verwijder tijdelijke workflow
-        workflowManager.verwijderWorkflow("temp_workflow")
+        self.app.updateStatus("Bezig met uitvoeren van acties...")
+        return workflow.voerUit(updateVoortgang, bereik, parallel=True, hervat=hervat)
+    
+    def _toonWorkflowResultaat(self, succes):
+        """
+        Meld het resultaat van een workflow en bied aan de wijzigingen op te slaan
         
+        Args:
+            succes (bool): True als alle acties succesvol zijn uitgevoerd
+        """
         if succes:
             # Vraag of gebruiker het resultaat wil opslaan
             popup = StijlvollePopup(
@@ -804,14 +985,62 @@ class ActiesTab:
             )
             
             if popup.wacht_op_antwoord():
-                if excelHandler.slaOp():
-                    self.app.updateStatus("Wijzigingen opgeslagen")
-                    self.app.toonSuccesmelding("Succes", "Wijzigingen zijn opgeslagen")
-                else:
-                    self.app.updateStatus("Fout bij opslaan")
-                    self.app.toonFoutmelding("Fout", "Kon wijzigingen niet opslaan")
+                self._slaOpOpAchtergrond(toonMelding=True)
             else:
                 self.app.updateStatus("Wijzigingen niet opgeslagen")
         else:
             self.app.updateStatus("Fout bij uitvoeren acties")
             self.app.toonFoutmelding("Fout", "Er is een fout opgetreden bij het uitvoeren van de acties")
+    
+    def laadWorkflow(self):
+        """Laad een opgeslagen workflow en voer deze uit"""
+        if not excelHandler.isBestandGeopend():
+            self.app.toonFoutmelding("Fout", "Geen Excel-bestand geopend")
+            return
+        
+        pad = filedialog.askopenfilename(
+            title="Selecteer workflow",
+            filetypes=[("Workflow bestanden", "*.json *.yaml *.yml"), ("Alle bestanden", "*.*")]
+        )
+        if not pad:
+            return
+        
+        # Alle acties worden bij het laden gecontroleerd; fouten staan in het logboek
+        workflow = workflowManager.laadWorkflow(pad)
+        if workflow is None:
+            self.app.toonFoutmelding("Fout", "De workflow kon niet worden geladen, zie het logboek voor details")
+            return
+        
+        self.laatsteActies = list(workflow.acties)
+        
+        # Een workflow zonder eigen bereik werkt op het geselecteerde bereik
+        bereik = None if workflow.rijen else self.haalGeselecteerdBereik()
+        self._toonWorkflowResultaat(self._voerWorkflowUit(workflow, bereik))
+    
+    def slaWorkflowOp(self):
+        """Sla de laatst uitgevoerde acties op als workflow"""
+        if not self.laatsteActies:
+            self.app.toonFoutmelding("Fout", "Voer eerst acties uit om ze als workflow op te slaan")
+            return
+        
+        naam = simpledialog.askstring("Workflow Opslaan", "Geef een naam op voor de workflow:")
+        if not naam:
+            return
+        
+        pad = filedialog.asksaveasfilename(
+            title="Workflow opslaan",
+            defaultextension=".json",
+            initialfile=f"{naam}.json",
+            filetypes=[("JSON", "*.json"), ("YAML", "*.yaml *.yml")]
+        )
+        if not pad:
+            return
+        
+        workflow = workflowManager.maakWorkflow(naam)
+        for actieNaam, parameters in self.laatsteActies:
+            workflow.voegActieToe(actieNaam, parameters)
+        
+        if workflowManager.slaWorkflowOp(naam, pad):
+            self.app.updateStatus(f"Workflow '{naam}' opgeslagen")
+        else:
+            self.app.toonFoutmelding("Fout", "De workflow kon niet worden opgeslagen, zie het logboek voor details")
@@ -88,6 +88,8 @@ class ExcelladinApp:
             ]
         )
         if popup.wacht_op_antwoord():
+            # Laat opslagopdrachten die al op de achtergrond lopen eerst afronden
+            excelHandler.wachtOpOpslaan()
             self.root.destroy()
     
     def _configureerStijlen(self):
@@ -417,8 +419,13 @@ class ExcelladinApp:
         """
         self.updateStatus(f"Bezig met laden van {os.path.basename(bestandspad)}...")
         
+        # Grote bestanden worden op de achtergrond verder geladen; de callback
+        # komt dan van een andere thread en wordt via root.after doorgegeven
+        def laadVoortgang(geladenRijen, klaar):
+            self.root.after(0, lambda: self._toonLaadVoortgang(geladenRijen, klaar))
+        
         # Laad het bestand
-        if excelHandler.openBestand(bestandspad):
+        if excelHandler.openBestand(bestandspad, voortgangCallback=laadVoortgang):
             # Update UI in Sheet Kiezen tab
             self.sheetKiezenTab.updateNaLaden(bestandspad)
             
@@ -430,3 +437,45 @@ class ExcelladinApp:
         else:
             self.updateStatus("Fout bij laden bestand")
             self.toonFoutmelding("Fout", f"Kon bestand '{bestandspad}' niet laden")
+    
+    def wisselWerkblad(self, werkblad):
+        """
+        Wissel naar een ander werkblad van het geladen bestand en update de UI
+        
+        Args:
+            werkblad (str): Naam van het werkblad
+            
+        Returns:
+            bool: True als het werkblad actief is, anders False
+        """
+        if werkblad == excelHandler.huidigWerkblad:
+            return True
+        
+        self.updateStatus(f"Bezig met laden van werkblad '{werkblad}'...")
+        
+        if excelHandler.wisselWerkblad(werkblad):
+            self.sheetKiezenTab.updateNaLaden(excelHandler.huidigBestand)
+            self.actiesTab.updateNaLaden()
+            self.updateStatus(f"Werkblad '{werkblad}' geladen")
+            return True
+        
+        self.updateStatus("Fout bij wisselen van werkblad")
+        if excelHandler.gewijzigdeBereiken or excelHandler.isLaden():
+            self.toonFoutmelding("Fout", "Sla eerst de wijzigingen op of wacht tot het laden klaar is voordat je van werkblad wisselt")
+        else:
+            self.toonFoutmelding("Fout", f"Kon werkblad '{werkblad}' niet laden")
+        return False
+    
+    def _toonLaadVoortgang(self, geladenRijen, klaar):
+        """
+        Toon de voortgang van het laden van een groot Excel-bestand
+        
+        Args:
+            geladenRijen (int): Aantal rijen dat tot nu toe geladen is
+            klaar (bool): True als alle rijen geladen zijn
+        """
+        self.sheetKiezenTab.updateRijAantal(geladenRijen, klaar)
+        if klaar:
+            self.updateStatus(f"Alle {geladenRijen} rijen geladen")
+        else:
+            self.updateStatus(f"Bezig met laden... {geladenRijen} rijen geladen")
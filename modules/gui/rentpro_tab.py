@@ -333,6 +333,21 @@ class RentproTab:
         overschrijfCheck.pack(anchor=tk.W, pady=5)
         Tooltip(overschrijfCheck, "Als deze optie ingeschakeld is, worden lokale gegevens overschreven door Rentpro data. Anders worden alleen lege velden aangevuld.")
         
+        # Cache negeren optie
+        self.vernieuwVar = tk.BooleanVar(value=False)
+        vernieuwCheck = tk.Checkbutton(
+            optiesFrame,
+            text="Alles opnieuw ophalen (cache negeren)",
+            variable=self.vernieuwVar,
+            background=KLEUREN["achtergrond"],
+            foreground="#FFFFFF",
+            selectcolor="#b01345",
+            activebackground=KLEUREN["achtergrond"],
+            activeforeground="#FFFFFF"
+        )
+        vernieuwCheck.pack(anchor=tk.W, pady=5)
+        Tooltip(vernieuwCheck, "Productpagina's worden lokaal bewaard en bij een volgende synchronisatie hergebruikt. Schakel dit in om alle pagina's opnieuw bij Rentpro op te halen.")
+        
         # Bereik selectie frame
         bereikFrame = tk.Frame(
             optiesFrame,
@@ -645,6 +660,7 @@ class RentproTab:
         
         # Haal opties op
         overschrijf_lokaal = self.overschrijfVar.get()
+        vernieuw = self.vernieuwVar.get()
         bereik = self.haalGeselecteerdBereik()
         
         # Sla inloggegevens op indien gewenst
@@ -672,9 +688,9 @@ class RentproTab:
         self.startButton.config(state=tk.DISABLED)
         
         # Start een asyncio event loop in een aparte thread
-        threading.Thread(target=self.run_async_task, args=(gebruikersnaam, wachtwoord, url, overschrijf_lokaal, bereik), daemon=True).start()
+        threading.Thread(target=self.run_async_task, args=(gebruikersnaam, wachtwoord, url, overschrijf_lokaal, bereik, vernieuw), daemon=True).start()
     
-    def run_async_task(self, gebruikersnaam, wachtwoord, url, overschrijf_lokaal, bereik):
+    def run_async_task(self, gebruikersnaam, wachtwoord, url, overschrijf_lokaal, bereik, vernieuw=False):
         """
         Voer asyncio taken uit in een aparte thread
         
@@ -684,10 +700,11 @@ class RentproTab:
             url (str): De URL voor de Rentpro back-office
             overschrijf_lokaal (bool): Of lokale data overschreven moet worden
             bereik (tuple): Bereik van rijen om te synchroniseren of None voor alles
+            vernieuw (bool): Of de HTTP-cache genegeerd moet worden
         """
-        asyncio.run(self.synchroniseer(gebruikersnaam, wachtwoord, url, overschrijf_lokaal, bereik))
+        asyncio.run(self.synchroniseer(gebruikersnaam, wachtwoord, url, overschrijf_lokaal, bereik, vernieuw))
     
-    async def synchroniseer(self, gebruikersnaam, wachtwoord, url, overschrijf_lokaal, bereik):
+    async def synchroniseer(self, gebruikersnaam, wachtwoord, url, overschrijf_lokaal, bereik, vernieuw=False):
         """
         Asynchrone functie voor synchronisatie met Rentpro
         
@@ -697,6 +714,7 @@ class RentproTab:
             url (str): De URL voor de Rentpro back-office
             overschrijf_lokaal (bool): Of lokale data overschreven moet worden
             bereik (tuple): Bereik van rijen om te synchroniseren of None voor alles
+            vernieuw (bool): Of de HTTP-cache genegeerd moet worden
         """
         try:
             # Update UI
@@ -719,7 +737,9 @@ class RentproTab:
             # Haal producten op
             self.update_ui_status("Ophalen van productgegevens...")
             self.updateLogText("Ophalen van productgegevens...")
-            success = await rentproHandler.haal_producten_op(overschrijf_lokaal, bereik)
+            success = await rentproHandler.haal_producten_op(
+                overschrijf_lokaal, bereik, voortgang=self.update_ui_voortgang, vernieuw=vernieuw
+            )
             
             if success:
                 self.update_ui_success("Synchronisatie succesvol afgerond")
@@ -754,6 +774,17 @@ class RentproTab:
         self.app.root.after(0, lambda: self.app.updateStatus(status))
         self.app.root.after(0, lambda: self.updateResultaat(status))
     
+    def update_ui_voortgang(self, verwerkt, totaal):
+        """
+        Update het voortgangslabel tijdens het ophalen van producten, zonder te loggen
+        
+        Args:
+            verwerkt (int): Aantal verwerkte producten
+            totaal (int): Totaal aantal producten
+        """
+        tekst = f"Ophalen van productgegevens: {verwerkt}/{totaal}"
+        self.app.root.after(0, lambda: self.voortgangLabel.config(text=tekst))
+    
     def update_ui_error(self, error):
         """
         Update UI met foutmelding
@@ -800,21 +831,37 @@ class RentproTab:
             )
             
             if popup.wacht_op_antwoord():
-                if excelHandler.slaOp():
-                    self.app.updateStatus("Wijzigingen opgeslagen")
-                    self.app.toonSuccesmelding("Succes", "Wijzigingen zijn opgeslagen")
-                    self.updateResultaat("Wijzigingen opgeslagen in Excel-bestand")
-                    self.updateLogText("Wijzigingen opgeslagen in Excel-bestand")
-                else:
-                    self.app.updateStatus("Fout bij opslaan")
-                    self.app.toonFoutmelding("Fout", "Kon wijzigingen niet opslaan")
-                    self.updateResultaat("FOUT: Kon wijzigingen niet opslaan")
-                    self.updateLogText("FOUT: Kon wijzigingen niet opslaan")
+                # Opslaan gebeurt op de achtergrond; het resultaat komt via root.after terug
+                def klaar(succes):
+                    self.app.root.after(0, lambda: self.toon_opslag_resultaat(succes))
+                
+                self.app.updateStatus("Bezig met opslaan op de achtergrond...")
+                self.updateLogText("Opslaan gestart op de achtergrond")
+                if not excelHandler.slaOpAsync(klaar):
+                    self.toon_opslag_resultaat(False)
             else:
                 self.updateResultaat("Wijzigingen NIET opgeslagen")
                 self.updateLogText("Wijzigingen NIET opgeslagen")
                 self.app.updateStatus("Wijzigingen niet opgeslagen")
     
+    def toon_opslag_resultaat(self, succes):
+        """
+        Toon het resultaat van het opslaan op de achtergrond
+        
+        Args:
+            succes (bool): True als het opslaan succesvol was
+        """
+        if succes:
+            self.app.updateStatus("Wijzigingen opgeslagen")
+            self.app.toonSuccesmelding("Succes", "Wijzigingen zijn opgeslagen")
+            self.updateResultaat("Wijzigingen opgeslagen in Excel-bestand")
+            self.updateLogText("Wijzigingen opgeslagen in Excel-bestand")
+        else:
+            self.app.updateStatus("Fout bij opslaan")
+            self.app.toonFoutmelding("Fout", "Kon wijzigingen niet opslaan")
+            self.updateResultaat("FOUT: Kon wijzigingen niet opslaan")
+            self.updateLogText("FOUT: Kon wijzigingen niet opslaan")
+    
     def login_zonder_synchronisatie(self):
         """Log in bij Rentpro zonder synchronisatie te starten"""
         if self.is_bezig:
@@ -980,11 +1027,9 @@ class RentproTab:
                 # Haal producten op via API handler
                 logger.logInfo("Producten ophalen via API")
                 self.updateLogText("Producten ophalen via API")
-                producten_lijst = await rentproHandler.api_handler.get_products_list()
-                
-                # Converteer naar het verwachte formaat (list of tuples)
+                # Converteer naar het verwachte formaat (list of tuples), pagina voor pagina
                 producten = []
-                for product in producten_lijst:
+                async for product in rentproHandler.api_handler.iter_products():
                     if "id" in product and "naam" in product:
                         producten.append((product["id"], product["naam"]))
                 
@@ -102,6 +102,31 @@ class SheetKiezenTab:
         self.laadButton.pack(fill=tk.X, pady=10)
         Tooltip(self.laadButton, "Klik om het geselecteerde Excel-bestand te laden")
         
+        # Werkblad selectie frame
+        werkbladFrame = tk.Frame(
+            container,
+            background=KLEUREN["achtergrond"]
+        )
+        werkbladFrame.pack(fill=tk.X, pady=10)
+        
+        werkbladLabel = tk.Label(
+            werkbladFrame,
+            text="Werkblad:",
+            **STIJLEN["label"]
+        )
+        werkbladLabel.pack(side=tk.LEFT)
+        
+        # Keuzelijst met de werkbladen van het geladen bestand
+        self.werkbladVar = tk.StringVar()
+        self.werkbladCombo = ttk.Combobox(
+            werkbladFrame,
+            textvariable=self.werkbladVar,
+            state="disabled"
+        )
+        self.werkbladCombo.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(10, 0))
+        self.werkbladCombo.bind("<<ComboboxSelected>>", self.wisselWerkblad)
+        Tooltip(self.werkbladCombo, "Kies het werkblad om te bewerken; alleen dit werkblad wordt ingelezen")
+        
         # Frame voor bestandsinformatie
         infoFrame = tk.Frame(
             container,
@@ -169,9 +194,17 @@ class SheetKiezenTab:
         
         self.app.laadExcelBestand(bestandspad)
     
+    def wisselWerkblad(self, event=None):
+        """Wissel naar het gekozen werkblad"""
+        werkblad = self.werkbladVar.get()
+        
+        if not self.app.wisselWerkblad(werkblad):
+            # Zet de keuzelijst terug op het actieve werkblad
+            self.werkbladVar.set(excelHandler.huidigWerkblad or "")
+    
     def updateNaLaden(self, bestandspad):
         """
-        Update de UI na het laden van een Excel-bestand
+        Update de UI na het laden van een Excel-bestand of het wisselen van werkblad
         
         Args:
             bestandspad (str): Pad naar het geladen Excel-bestand
@@ -179,9 +212,27 @@ class SheetKiezenTab:
         # Update UI
         self.bestandspadVar.set(bestandspad)
         self.bestandsInfoLabel.config(text=f"Bestand: {os.path.basename(bestandspad)}")
-        self.rijInfoLabel.config(text=f"Rijen: {excelHandler.haalRijAantal()}")
+        self.rijInfoLabel.config(text=f"Rijen: {excelHandler.haalGeladenRijAantal()}")
         self.kolomInfoLabel.config(text=f"Kolommen: {len(excelHandler.kolomNamen)}")
         
+        werkbladNamen = excelHandler.haalWerkbladNamen()
+        self.werkbladCombo.config(
+            values=werkbladNamen,
+            state="readonly" if len(werkbladNamen) > 1 else "disabled"
+        )
+        self.werkbladVar.set(excelHandler.huidigWerkblad or "")
+        
         # Sla op als laatste bestand indien nodig
         if self.onthoudBestandVar.get():
             instellingen.stelLaatsteBestandIn(bestandspad)
+    
+    def updateRijAantal(self, aantal, klaar=True):
+        """
+        Werk het getoonde aantal rijen bij terwijl een bestand wordt geladen
+        
+        Args:
+            aantal (int): Aantal geladen rijen
+            klaar (bool): True als alle rijen geladen zijn
+        """
+        tekst = f"Rijen: {aantal}" if klaar else f"Rijen: {aantal} (bezig met laden...)"
+        self.rijInfoLabel.config(text=tekst)
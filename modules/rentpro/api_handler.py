@@ -5,27 +5,88 @@ zonder afhankelijkheid van een browser
 
 Deze module is de kern van de API-mode in de RentPro handler
 """
-import asyncio
 import re
+import asyncio
 import json
-import requests
 import time
 from datetime import datetime
+from http.cookies import SimpleCookie
+import aiohttp
+from yarl import URL
 from bs4 import BeautifulSoup
 from modules.logger import logger
+from modules.settings import haalRentproMaxGelijktijdig, haalRentproTimeout, haalRentproCacheTTL
+from modules.rentpro.http_cache import httpCache
+
+# Queryparameters waarmee de productlijst een paginanummer kan aangeven
+PAGINA_PARAMETERS = ('page', 'pagina', 'p', 'pg', 'pagenumber', 'pageindex', 'currentpage', 'grid-page')
+
+# Gangbare paginagroottes van een grid; zoveel rijen zonder pager wijst op een gemiste pager
+GANGBARE_PAGINAGROOTTES = (10, 15, 20, 25, 30, 50, 100, 200)
+
+# ASP.NET WebForms-pager: volgt een pagina via een postback in plaats van een link
+_POSTBACK_PAGER = re.compile(r"__doPostBack\([^)]*Page\$", re.IGNORECASE)
+
+# Verborgen velden die geen productgegevens zijn
+NIET_GEINDEXEERDE_VELDEN = ('__RequestVerificationToken',)
+
+class ApiAntwoord:
+    """Volledig ingelezen HTTP-antwoord, met dezelfde velden als een requests.Response"""
+    
+    def __init__(self, status_code, text, url, headers=None, uit_cache=False):
+        """
+        Initialiseer een antwoord
+        
+        Args:
+            status_code (int): HTTP-statuscode
+            text (str): Inhoud van het antwoord
+            url (str): Uiteindelijke URL, na eventuele redirects
+            headers (Mapping): Optioneel, headers van het antwoord
+            uit_cache (bool): True als de inhoud uit de HTTP-cache komt
+        """
+        self.status_code = status_code
+        self.text = text
+        self.url = url
+        self.headers = headers if headers is not None else {}
+        self.uit_cache = uit_cache
 
 class ApiHandler:
     """
     Handler voor directe HTTP communicatie met RentPro
     Vermijdt browserafhankelijkheid door rechtstreeks HTTP-requests te gebruiken
+    
+    Alle verzoeken lopen via één aiohttp-sessie met een gedeelde connection pool,
+    zodat verzoeken vanuit meerdere taken tegelijk kunnen lopen zonder de event
+    loop te blokkeren. Een semaphore begrenst het aantal gelijktijdige verzoeken.
     """
     
-    def __init__(self):
-        """Initialiseer de API handler"""
-        self.session = requests.Session()
+    def __init__(self, max_gelijktijdig=None, timeout=None, cache=None, cache_ttl=None):
+        """
+        Initialiseer de API handler
+        
+        Args:
+            max_gelijktijdig (int, optional): Maximaal aantal gelijktijdige verzoeken,
+                                              standaard uit de instellingen (RentPro.MaxGelijktijdig)
+            timeout (float, optional): Standaard timeout per verzoek in seconden,
+                                       standaard uit de instellingen (RentPro.Timeout)
+            cache (HttpCache, optional): Cache voor productpagina's, standaard de gedeelde httpCache
+            cache_ttl (float, optional): Levensduur van bewaarde pagina's in seconden,
+                                         standaard uit de instellingen (RentPro.CacheTTL)
+        """
+        self.session = None
         self.base_url = "http://metroeventsdc.rentpro5.nl"
         self.logged_in = False
         self.csrf_token = None
+        self.max_gelijktijdig = max_gelijktijdig or haalRentproMaxGelijktijdig()
+        self.timeout = timeout or haalRentproTimeout()
+        # Een aiohttp-sessie hoort bij één event loop; de cookies gaan mee naar een nieuwe sessie
+        self._session_loop = None
+        self._semaphore = None
+        self._cookies = SimpleCookie()
+        # Bewaarde pagina's horen bij de back-office en de gebruiker waarmee is ingelogd
+        self.cache = cache or httpCache
+        self.cache_ttl = haalRentproCacheTTL() if cache_ttl is None else cache_ttl
+        self._cache_scope = self.base_url
         self.headers = {
             "User-Agent": "Mozilla/5.0 Excelladin/1.0",
             "Accept": "text/html,application/xhtml+xml,application/xml",
@@ -34,6 +95,166 @@ class ApiHandler:
             "Connection": "keep-alive"
         }
     
+    async def _get_session(self):
+        """
+        Haal de sessie van de huidige event loop op en maak hem zo nodig aan
+        
+        De GUI voert elke RentPro taak uit met een eigen asyncio.run, dus een
+        volgende taak draait in een nieuwe event loop. De ingelogde sessie
+        (cookies) wordt dan overgezet naar een nieuwe sessie voor die loop.
+        
+        Returns:
+            aiohttp.ClientSession: De sessie
+        """
+        loop = asyncio.get_running_loop()
+        if self.session is not None and not self.session.closed and self._session_loop is loop:
+            return self.session
+        
+        # Eerst de nieuwe sessie vastleggen en pas daarna wachten, zodat gelijktijdige
+        # verzoeken niet elk een eigen sessie aanmaken
+        oude_sessie, oude_loop = self.session, self._session_loop
+        self._bewaar_cookies()
+        
+        connector = aiohttp.TCPConnector(limit=self.max_gelijktijdig, ttl_dns_cache=300)
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            # Net als requests ook cookies accepteren van een server op een IP-adres
+            cookie_jar=aiohttp.CookieJar(unsafe=True),
+            timeout=aiohttp.ClientTimeout(total=self.timeout)
+        )
+        self.session.cookie_jar.update_cookies(self._cookies, URL(self.base_url))
+        self._semaphore = asyncio.Semaphore(self.max_gelijktijdig)
+        self._session_loop = loop
+        
+        if oude_sessie is not None:
+            await self._laat_sessie_los(oude_sessie, oude_loop)
+        return self.session
+    
+    async def _laat_sessie_los(self, sessie, sessie_loop):
+        """
+        Laat een sessie van een andere event loop los; netjes sluiten kan alleen in die loop
+        
+        Args:
+            sessie (aiohttp.ClientSession): De los te laten sessie
+            sessie_loop (asyncio.AbstractEventLoop): De event loop van de sessie
+        """
+        if sessie.closed:
+            return
+        
+        connector = sessie.connector
+        sessie.detach()
+        if sessie_loop.is_closed():
+            # De verbindingen van een afgesloten loop zijn niet meer bruikbaar, alleen afmelden
+            await connector.close()
+    
+    def _bewaar_cookies(self):
+        """Bewaar de cookies van de huidige sessie voor een volgende sessie"""
+        if self.session is not None:
+            self._cookies = self.session.cookie_jar.filter_cookies(URL(self.base_url))
+    
+    async def _request(self, methode, url, headers=None, timeout=None, **kwargs):
+        """
+        Voer een HTTP-verzoek uit via de gedeelde sessie
+        
+        Het antwoord wordt binnen de semaphore volledig ingelezen, zodat de
+        verbinding direct terug gaat naar de pool.
+        
+        Args:
+            methode (str): HTTP-methode, zoals 'GET' of 'POST'
+            url (str): Volledige URL
+            headers (dict, optional): Headers, standaard self.headers
+            timeout (float, optional): Timeout in seconden voor dit verzoek
+            **kwargs: Overige argumenten voor aiohttp, zoals data of allow_redirects
+            
+        Returns:
+            ApiAntwoord: Het antwoord
+            
+        Raises:
+            aiohttp.ClientError: Bij een verbindingsfout
+            asyncio.TimeoutError: Als het verzoek langer duurt dan de timeout
+        """
+        session = await self._get_session()
+        if timeout is not None:
+            kwargs['timeout'] = aiohttp.ClientTimeout(total=timeout)
+        
+        async with self._semaphore:
+            async with session.request(methode, url, headers=headers or self.headers, **kwargs) as response:
+                text = await response.text()
+                return ApiAntwoord(response.status, text, str(response.url), response.headers)
+    
+    async def get(self, url, **kwargs):
+        """
+        Voer een GET-verzoek uit, zie _request
+        
+        Returns:
+            ApiAntwoord: Het antwoord
+        """
+        return await self._request('GET', url, **kwargs)
+    
+    async def post(self, url, **kwargs):
+        """
+        Voer een POST-verzoek uit, zie _request
+        
+        Returns:
+            ApiAntwoord: Het antwoord
+        """
+        return await self._request('POST', url, **kwargs)
+    
+    async def get_cached(self, url, vernieuw=False, **kwargs):
+        """
+        Voer een GET-verzoek uit via de HTTP-cache
+        
+        Een bewaard antwoord binnen de TTL wordt direct teruggegeven. Daarna wordt
+        het gevalideerd met een voorwaardelijk verzoek; bij 304 Not Modified blijft
+        het bewaarde antwoord in gebruik. Alleen een 200 zonder doorverwijzing
+        (bijvoorbeeld naar de loginpagina) wordt bewaard.
+        
+        Args:
+            url (str): Volledige URL
+            vernieuw (bool): Als True, negeer de cache en haal de pagina opnieuw op
+            **kwargs: Overige argumenten, zie _request
+            
+        Returns:
+            ApiAntwoord: Het antwoord
+        """
+        if not self.cache.actief:
+            return await self.get(url, **kwargs)
+        
+        sleutel = self.cache.maak_sleutel(self._cache_scope, url)
+        item = None if vernieuw else self.cache.haal_op(sleutel)
+        if item is not None and item.is_vers(self.cache_ttl):
+            return ApiAntwoord(200, item.tekst, item.url, uit_cache=True)
+        
+        headers = self.headers.copy()
+        if item is not None:
+            headers.update(item.validatie_headers())
+        response = await self.get(url, headers=headers, **kwargs)
+        
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if response.status_code == 304 and item is not None:
+            self.cache.bevestig(sleutel, etag, last_modified)
+            return ApiAntwoord(200, item.tekst, item.url, response.headers, uit_cache=True)
+        
+        if response.status_code == 200 and URL(response.url).path == URL(url).path:
+            self.cache.sla_op(sleutel, response.url, response.text, etag, last_modified)
+        return response
+    
+    async def close(self):
+        """Sluit de sessie en de verbindingen in de pool; de cookies blijven bewaard"""
+        if self.session is None:
+            return
+        
+        self._bewaar_cookies()
+        sessie, sessie_loop = self.session, self._session_loop
+        self.session = None
+        self._session_loop = None
+        
+        if sessie_loop is asyncio.get_running_loop():
+            await sessie.close()
+        else:
+            await self._laat_sessie_los(sessie, sessie_loop)
+    
     async def login(self, username, password, url=None):
         """
         Log in op RentPro via directe HTTP requests
@@ -52,16 +273,18 @@ class ApiHandler:
                 if not url.startswith(('http://', 'https://')):
                     url = f"http://{url}"
                 self.base_url = url
+            self._cache_scope = f"{self.base_url.rstrip('/')}|{username}"
                 
-            # Reset sessie voor schone start
-            self.session = requests.Session()
+            # Reset sessie en cookies voor schone start
+            await self.close()
+            self._cookies = SimpleCookie()
             self.logged_in = False
             
             # Stap 1: Haal login pagina op voor verificatie token
             logger.logInfo("Login pagina ophalen...")
             login_url = f"{self.base_url}/Account/Login"
             
-            response = self.session.get(login_url, headers=self.headers)
+            response = await self.get(login_url)
             if response.status_code != 200:
                 logger.logFout(f"Fout bij ophalen login pagina: {response.status_code}")
                 return False
@@ -98,7 +321,7 @@ class ApiHandler:
                 "Referer": login_url
             })
             
-            response = self.session.post(
+            response = await self.post(
                 login_url,
                 data=login_data,
                 headers=login_headers,
@@ -146,10 +369,7 @@ class ApiHandler:
             
             # Haal huidige pagina op
             products_url = f"{self.base_url}/Product"
-            response = self.session.get(
-                products_url,
-                headers=self.headers
-            )
+            response = await self.get(products_url)
             
             if response.status_code != 200:
                 logger.logFout(f"[{timestamp}] [LOCATION] Fout bij verificatie productpagina: {response.status_code}")
@@ -205,10 +425,7 @@ class ApiHandler:
             # Navigeer naar producten pagina
             logger.logInfo(f"[{timestamp}] Navigeren naar productenpagina...")
             products_url = f"{self.base_url}/Product"
-            response = self.session.get(
-                products_url,
-                headers=self.headers
-            )
+            response = await self.get(products_url)
             
             if response.status_code != 200:
                 logger.logFout(f"[{timestamp}] Fout bij navigeren naar producten: {response.status_code}")
@@ -254,84 +471,232 @@ class ApiHandler:
     
     async def get_products_list(self):
         """
-        Haal lijst van producten op via HTTP requests
+        Haal lijst van alle producten op via HTTP requests, over alle pagina's
         
         Returns:
             list: Lijst van producten als dictionaries met 'id' en 'naam' sleutels
         """
+        return [product async for product in self.iter_products()]
+    
+    async def iter_products(self):
+        """
+        Haal alle producten op en geef ze door zodra hun pagina binnen is
+        
+        De eerste pagina bepaalt via de paginering welke pagina's er nog zijn;
+        die worden gelijktijdig opgehaald, met maximaal max_gelijktijdig pagina's
+        tegelijk in het geheugen. Een pagina die verder doorverwijst (een pager
+        die maar een deel van de paginanummers toont) voegt de nieuwe pagina's toe.
+        
+        Yields:
+            dict: Product met 'id' en 'naam', in volgorde van binnenkomst per pagina
+        """
+        if not self.logged_in:
+            logger.logFout("Niet ingelogd bij ophalen productlijst")
+            return
+        
+        products_url = f"{self.base_url}/Product"
         try:
-            if not self.logged_in:
-                logger.logFout("Niet ingelogd bij ophalen productlijst")
-                return []
-            
-            # Haal productlijst op
-            products_url = f"{self.base_url}/Product"
-            response = self.session.get(
-                products_url,
-                headers=self.headers
+            producten, paginas = await self._haal_productpagina(products_url, products_url)
+        except Exception as e:
+            logger.logFout(f"Fout bij ophalen productlijst: {e}")
+            return
+        
+        if not paginas and len(producten) in GANGBARE_PAGINAGROOTTES:
+            logger.logWaarschuwing(
+                f"De productlijst toont precies {len(producten)} producten maar geen herkenbare pager; "
+                f"mogelijk worden alleen de producten van pagina 1 opgehaald"
             )
+        
+        gezien_ids = set()
+        aantal = 0
+        for product in producten:
+            if product['id'] not in gezien_ids:
+                gezien_ids.add(product['id'])
+                aantal += 1
+                yield product
+        
+        # Pagina 1 is de pagina die net is opgehaald
+        bekend = {1}
+        wachtrij = []
+        
+        def voeg_toe(nieuwe_paginas):
+            if not nieuwe_paginas:
+                return
+            # Een pager toont vaak alleen de eerste en laatste pagina's; vul de tussenliggende aan
+            hoogste = max(nieuwe_paginas)
+            for nummer in range(2, hoogste + 1):
+                if nummer not in bekend:
+                    bekend.add(nummer)
+                    url = nieuwe_paginas.get(nummer) or self._page_url(nieuwe_paginas[hoogste], hoogste, nummer)
+                    wachtrij.append((nummer, url))
+        
+        voeg_toe(paginas)
+        bezig = set()
+        try:
+            while wachtrij or bezig:
+                while wachtrij and len(bezig) < self.max_gelijktijdig:
+                    nummer, url = wachtrij.pop(0)
+                    taak = asyncio.ensure_future(self._haal_productpagina(url, products_url))
+                    taak.pagina_nummer = nummer
+                    bezig.add(taak)
+                
+                klaar, bezig = await asyncio.wait(bezig, return_when=asyncio.FIRST_COMPLETED)
+                for taak in klaar:
+                    try:
+                        producten, paginas = taak.result()
+                    except Exception as e:
+                        logger.logWaarschuwing(f"Kon productpagina {taak.pagina_nummer} niet ophalen: {e}")
+                        continue
+                    
+                    voeg_toe(paginas)
+                    for product in producten:
+                        if product['id'] not in gezien_ids:
+                            gezien_ids.add(product['id'])
+                            aantal += 1
+                            yield product
+        finally:
+            # Bij een afgebroken iteratie geen pagina's op de achtergrond laten ophalen
+            for taak in bezig:
+                taak.cancel()
+        
+        logger.logInfo(f"{aantal} producten gevonden op {len(bekend)} pagina's")
+    
+    async def _haal_productpagina(self, url, products_url):
+        """
+        Haal één pagina van de productlijst op en lees hem uit
+        
+        Args:
+            url (str): URL van de pagina
+            products_url (str): URL van de eerste pagina, om pagerlinks te herkennen
             
-            if response.status_code != 200:
-                logger.logFout(f"Fout bij ophalen productlijst: {response.status_code}")
-                return []
-            
-            # Parse HTML en zoek producten tabel
-            soup = BeautifulSoup(response.text, 'html.parser')
+        Returns:
+            tuple: (lijst met producten, dict met paginanummer -> URL uit de pager)
             
-            # Zoek de producten tabel (heeft class noBold gvItems)
-            product_table = soup.select_one('table.gvItems')
+        Raises:
+            ValueError: Als de pagina niet opgehaald kan worden
+        """
+        response = await self.get(url)
+        if response.status_code != 200:
+            raise ValueError(f"status {response.status_code} voor {url}")
+        
+        soup = BeautifulSoup(response.text, 'html.parser')
+        return self._extract_products(soup), self._extract_pages(soup, response.url or url, products_url)
+    
+    def _extract_products(self, soup):
+        """
+        Helper methode om de producten uit de producttabel van een pagina te halen
+        
+        Returns:
+            list: Producten als dictionaries met 'id' en 'naam' sleutels
+        """
+        # Zoek de producten tabel (heeft class noBold gvItems)
+        product_table = soup.select_one('table.gvItems')
+        if not product_table:
+            product_table = soup.select_one('table.noBold')
             if not product_table:
-                product_table = soup.select_one('table.noBold')
-                if not product_table:
-                    logger.logWaarschuwing("Geen producttabel gevonden in HTML")
-                    return []
-            
-            # Zoek alle product rijen (alternating even/oneven classes)
-            product_rows = product_table.select('tr.even, tr.oneven')
-            if not product_rows:
-                logger.logWaarschuwing("Geen productrijen gevonden in tabel")
+                logger.logWaarschuwing("Geen producttabel gevonden in HTML")
                 return []
-            
-            # Extraheer product IDs en namen
-            products = []
-            for row in product_rows:
-                cells = row.select('td')
-                if len(cells) >= 4:  # Zorg dat er genoeg kolommen zijn
-                    # Eerste kolom (0) bevat ID, vierde kolom (3) bevat naam
-                    product_id_cell = cells[0]
-                    product_name_cell = cells[3]
-                    
-                    # Haal de waarden uit de cellen
-                    # Merk op dat de ID/naam in een <a> tag kunnen zitten
-                    product_id = product_id_cell.get_text(strip=True)
-                    product_name = product_name_cell.get_text(strip=True)
-                    
-                    # Als er geen tekst is, probeer dan de inhoud van een <a> tag
-                    if not product_id and product_id_cell.find('a'):
-                        product_id = product_id_cell.find('a').get_text(strip=True)
-                    
-                    if not product_name and product_name_cell.find('a'):
-                        product_name = product_name_cell.find('a').get_text(strip=True)
-                    
-                    if product_id and product_name:
-                        products.append({
-                            'id': product_id,
-                            'naam': product_name
-                        })
-            
-            logger.logInfo(f"{len(products)} producten gevonden")
-            return products
-            
-        except Exception as e:
-            logger.logFout(f"Fout bij ophalen productlijst: {e}")
+        
+        # Zoek alle product rijen (alternating even/oneven classes)
+        product_rows = product_table.select('tr.even, tr.oneven')
+        if not product_rows:
+            logger.logWaarschuwing("Geen productrijen gevonden in tabel")
             return []
+        
+        # Extraheer product IDs en namen
+        products = []
+        for row in product_rows:
+            cells = row.select('td')
+            if len(cells) >= 4:  # Zorg dat er genoeg kolommen zijn
+                # Eerste kolom (0) bevat ID, vierde kolom (3) bevat naam
+                product_id_cell = cells[0]
+                product_name_cell = cells[3]
+                
+                # Haal de waarden uit de cellen
+                # Merk op dat de ID/naam in een <a> tag kunnen zitten
+                product_id = product_id_cell.get_text(strip=True)
+                product_name = product_name_cell.get_text(strip=True)
+                
+                # Als er geen tekst is, probeer dan de inhoud van een <a> tag
+                if not product_id and product_id_cell.find('a'):
+                    product_id = product_id_cell.find('a').get_text(strip=True)
+                
+                if not product_name and product_name_cell.find('a'):
+                    product_name = product_name_cell.find('a').get_text(strip=True)
+                
+                if product_id and product_name:
+                    products.append({
+                        'id': product_id,
+                        'naam': product_name
+                    })
+        return products
+    
+    def _page_url(self, voorbeeld_url, voorbeeld_nummer, nummer):
+        """Helper methode om de URL van een pagina af te leiden uit de URL van een andere pagina"""
+        voorbeeld = URL(voorbeeld_url)
+        for naam, waarde in voorbeeld.query.items():
+            if naam.lower() in PAGINA_PARAMETERS and waarde == str(voorbeeld_nummer):
+                return str(voorbeeld.update_query({naam: str(nummer)}))
+        return voorbeeld_url
     
-    async def get_product_details(self, product_id):
+    def _extract_pages(self, soup, page_url, products_url):
+        """
+        Helper methode om de pagina's uit de pager van de productlijst te halen
+        
+        Herkent links naar de productlijst met een paginanummer in de query,
+        zoals ?page=3 of ?pagina=3, met behoud van de overige parameters (sortering, filter).
+        RentPro schrijft links soms met een dubbele slash (//product/edit/54); die
+        tellen als hetzelfde pad. Een postback-pager kan niet gevolgd worden en
+        wordt gemeld.
+        
+        Returns:
+            dict: Paginanummer -> absolute URL
+        """
+        lijst_pad = self._normaliseer_pad(URL(products_url).path)
+        basis = URL(page_url)
+        paginas = {}
+        postback = False
+        for link in soup.select('a[href]'):
+            if _POSTBACK_PAGER.search(link['href']):
+                postback = True
+                continue
+            try:
+                href = basis.join(URL(link['href']))
+            except ValueError:
+                continue
+            
+            pad = self._normaliseer_pad(href.path)
+            if pad not in (lijst_pad, f"{lijst_pad}/index"):
+                continue
+            
+            for naam, waarde in href.query.items():
+                if naam.lower() in PAGINA_PARAMETERS and waarde.isdigit():
+                    paginas[int(waarde)] = str(href)
+        
+        if postback and not paginas:
+            logger.logWaarschuwing(
+                f"De pager van {page_url} werkt via een postback en kan niet gevolgd worden; "
+                f"alleen deze pagina wordt opgehaald"
+            )
+        return paginas
+    
+    @staticmethod
+    def _normaliseer_pad(pad):
+        """Helper methode om een URL-pad vergelijkbaar te maken: kleine letters, enkele slashes, zonder slash aan het eind"""
+        return re.sub(r'/{2,}', '/', pad).rstrip('/').lower()
+    
+    async def get_product_details(self, product_id, vernieuw=False):
         """
         Haal details van een specifiek product op via HTTP
         
+        De pagina's komen zo mogelijk uit de HTTP-cache, zie get_cached. De pagina
+        wordt één keer doorlopen; naast de vaste velden bevat het resultaat het
+        hele formulier, met als sleutel het veld-ID (zoals 'Product_Name' of
+        'Property_15_Value').
+        
         Args:
             product_id (str): ID van het product
+            vernieuw (bool): Als True, negeer de cache en haal de pagina opnieuw op
             
         Returns:
             dict: Product gegevens of None bij fout
@@ -343,38 +708,36 @@ class ApiHandler:
             
             # Haal productdetails op (probeer eerst Edit pagina, dan Details pagina)
             edit_url = f"{self.base_url}/Product/Edit/{product_id}"
-            response = self.session.get(
-                edit_url,
-                headers=self.headers,
-                allow_redirects=True
-            )
+            response = await self.get_cached(edit_url, vernieuw=vernieuw, allow_redirects=True)
             
             if response.status_code != 200:
                 # Probeer de details pagina als edit niet werkt
                 details_url = f"{self.base_url}/Product/Details/{product_id}"
-                response = self.session.get(
-                    details_url, 
-                    headers=self.headers
-                )
+                response = await self.get_cached(details_url, vernieuw=vernieuw)
                 
                 if response.status_code != 200:
                     logger.logFout(f"Fout bij ophalen productdetails: {response.status_code}")
                     return None
             
-            # Parse HTML en extraheer productgegevens
+            # Parse HTML en bouw in één doorgang een index van het hele formulier
             soup = BeautifulSoup(response.text, 'html.parser')
+            velden, labels = self._index_form(soup)
+            
+            def veld(input_id, field_name):
+                return velden.get(input_id) or self._find_label_value(labels, field_name)
             
-            # Zoek belangrijke velden op basis van id of label
-            product_data = {
+            # Alle formuliervelden, met de vaste velden daar overheen
+            product_data = dict(velden)
+            product_data.update({
                 'id': product_id,
-                'naam': self._extract_input_value(soup, 'Product_Name') or self._extract_field_value(soup, "Naam"),
-                'beschrijving': self._extract_input_value(soup, 'Product_Decription') or self._extract_field_value(soup, "Omschrijving"),
-                'prijs': self._extract_input_value(soup, 'ProductPrice') or self._extract_field_value(soup, "Prijs") or "0.00",
-                'categorie': self._extract_input_value(soup, 'Product_CategoryID') or self._extract_field_value(soup, "Categorie") or "Onbekend",
-                'voorraad': self._extract_input_value(soup, 'Stock') or self._extract_field_value(soup, "Voorraad") or "0",
+                'naam': veld('Product_Name', "Naam"),
+                'beschrijving': veld('Product_Decription', "Omschrijving"),
+                'prijs': veld('ProductPrice', "Prijs") or "0.00",
+                'categorie': veld('Product_CategoryID', "Categorie") or "Onbekend",
+                'voorraad': veld('Stock', "Voorraad") or "0",
                 'afbeelding_url': self._extract_image_url(soup),
                 'last_updated': time.strftime("%Y-%m-%d %H:%M:%S")
-            }
+            })
             
             return product_data
             
@@ -382,50 +745,71 @@ class ApiHandler:
             logger.logFout(f"Fout bij ophalen productdetails voor {product_id}: {e}")
             return None
     
-    def _extract_input_value(self, soup, input_id):
-        """Helper methode om waarde van input veld te extraheren op basis van ID"""
-        try:
-            input_elem = soup.find('input', id=input_id)
-            if input_elem and input_elem.has_attr('value'):
-                return input_elem['value']
-                
-            # Probeer ook textarea
-            textarea = soup.find('textarea', id=input_id)
-            if textarea:
-                return textarea.get_text(strip=True)
-                
-            # Probeer ook select
-            select = soup.find('select', id=input_id)
-            if select:
-                selected_option = select.find('option', selected=True)
-                if selected_option:
-                    return selected_option.get_text(strip=True)
-            
-            return ""
-        except Exception:
-            return ""
-    
-    def _extract_field_value(self, soup, field_name):
-        """Helper methode om veldwaarde te extraheren uit HTML"""
-        try:
-            # Zoek label met veldnaam
-            label = soup.find('label', string=re.compile(field_name, re.IGNORECASE))
-            if label and label.parent:
-                # Vind de waarde in het volgende element of sibling
-                value_elem = label.find_next('div') or label.find_next('span') or label.find_next('p')
+    def _index_form(self, soup):
+        """
+        Helper methode om alle formuliervelden van een pagina in één doorgang te indexeren
+        
+        Velden worden geïndexeerd op id en, als dat nog niet bestaat, op name. Van een
+        select telt de tekst van de geselecteerde optie, van een checkbox of radio
+        alleen een aangevinkte waarde. Labels worden gekoppeld aan de waarde van
+        hun veld (via 'for') of anders aan de tekst van het volgende element; rijen
+        van een tabel met twee kolommen tellen als label en waarde.
+        
+        Returns:
+            tuple: (dict veld-ID -> waarde, dict label in kleine letters -> waarde)
+        """
+        velden = {}
+        labels = {}
+        label_elementen = []
+        
+        def voeg_toe(element, waarde):
+            for sleutel in (element.get('id'), element.get('name')):
+                if sleutel and sleutel not in NIET_GEINDEXEERDE_VELDEN and sleutel not in velden:
+                    velden[sleutel] = waarde
+        
+        for element in soup.find_all(['input', 'select', 'textarea', 'label', 'tr']):
+            if element.name == 'input':
+                soort = (element.get('type') or 'text').lower()
+                if soort in ('submit', 'button', 'image', 'reset', 'file'):
+                    continue
+                if soort in ('checkbox', 'radio'):
+                    if element.has_attr('checked'):
+                        voeg_toe(element, element.get('value', 'on'))
+                    continue
+                voeg_toe(element, element.get('value', ''))
+            elif element.name == 'textarea':
+                voeg_toe(element, element.get_text(strip=True))
+            elif element.name == 'select':
+                geselecteerd = element.find('option', selected=True)
+                voeg_toe(element, geselecteerd.get_text(strip=True) if geselecteerd else '')
+            elif element.name == 'label':
+                label_elementen.append(element)
+            else:
+                cellen = element.find_all(['td', 'th'], recursive=False)
+                if len(cellen) >= 2:
+                    labels.setdefault(cellen[0].get_text().strip().lower(), cellen[1].get_text(strip=True))
+        
+        # Labels na de doorgang koppelen, zodat ook velden na het label bekend zijn
+        for label in label_elementen:
+            tekst = label.get_text().strip().lower()
+            if not tekst or tekst in labels:
+                continue
+            if label.get('for') in velden:
+                labels[tekst] = velden[label['for']]
+            else:
+                value_elem = label.find_next(['div', 'span', 'p'])
                 if value_elem:
-                    return value_elem.get_text(strip=True)
-            
-            # Alternatieve methode: zoek in table met twee kolommen
-            rows = soup.select('table tr')
-            for row in rows:
-                cells = row.select('td, th')
-                if len(cells) >= 2 and field_name.lower() in cells[0].get_text().lower():
-                    return cells[1].get_text(strip=True)
-            
-            return ""
-        except Exception:
-            return ""
+                    labels[tekst] = value_elem.get_text(strip=True)
+        
+        return velden, labels
+    
+    def _find_label_value(self, labels, field_name):
+        """Helper methode om de waarde te vinden van het eerste label dat de veldnaam bevat"""
+        field_name = field_name.lower()
+        for label, waarde in labels.items():
+            if field_name in label:
+                return waarde
+        return ""
     
     def _extract_image_url(self, soup):
         """Helper methode om afbeelding URL te extraheren"""
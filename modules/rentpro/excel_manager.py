@@ -2,17 +2,36 @@
 Excel Manager voor RentPro integratie
 Verantwoordelijk voor het beheren van Excel interacties
 """
+import configparser
 from modules.logger import logger
 from modules.excel_handler import excelHandler
+from modules.excel_index import normaliseerSleutel
 
 class ExcelManager:
     """
     Beheert alle Excel-gerelateerde functies voor RentPro integratie
     """
     
+    # Kolomposities in de sheet en de bijbehorende sleutels in de productdata
+    KOLOM_MAPPING = [
+        (1, 'naam'),
+        (2, 'beschrijving'),
+        (3, 'prijs'),
+        (4, 'categorie'),
+        (5, 'voorraad'),
+        (6, 'afbeelding_url'),
+    ]
+    
+    # Kolommen die als productsleutel kunnen dienen, in volgorde van voorkeur
+    SLEUTEL_KOLOMMEN = ['Productcode', 'Product URL']
+    
     def __init__(self):
         """Initialiseer de Excel manager"""
-        pass
+        # Sleutelkolom uit config/rentpro.ini ([Excel] sleutelkolom) gaat voor de standaardvolgorde
+        config = configparser.ConfigParser()
+        config.read('config/rentpro.ini')
+        sleutel_kolom = config.get('Excel', 'sleutelkolom', fallback='').strip()
+        self.sleutel_kolommen = [sleutel_kolom] if sleutel_kolom else list(self.SLEUTEL_KOLOMMEN)
     
     def is_bestand_geopend(self):
         """
@@ -40,16 +59,75 @@ class ExcelManager:
                     # Gebruik opgegeven bereik
                     return (start_row, end_row)
                 else:
-                    # Gebruik alle rijen met data
+                    # Gebruik alle rijen met data (na de veld-ID rij van het sjabloon)
                     total_rows = excelHandler.getTotalRows()
-                    if total_rows > 0:
-                        return (0, total_rows - 1)
+                    eerste_rij = excelHandler.haalSchema().eersteDataRij
+                    if total_rows > eerste_rij:
+                        return (eerste_rij, total_rows - 1)
             
             return None
         except Exception as e:
             logger.logFout(f"Fout bij bepalen rijbereik: {e}")
             return None
     
+    def bepaal_sleutel_kolom(self):
+        """
+        Bepaal de kolom die de productsleutel bevat
+        
+        De eerste geconfigureerde sleutelkolom die in de sheet voorkomt wordt
+        gebruikt; staat geen daarvan in de sheet, dan is dat de eerste kolom.
+        
+        Returns:
+            str: Naam van de sleutelkolom, of None als geen bestand is geopend
+        """
+        kolom_namen = excelHandler.kolomNamen
+        if not kolom_namen:
+            return None
+        
+        for kolom in self.sleutel_kolommen:
+            if kolom in kolom_namen:
+                return kolom
+        return kolom_namen[0]
+    
+    def haal_sleutel_index(self):
+        """
+        Haal de index van productsleutel naar rijen op
+        
+        Returns:
+            SleutelIndex: De index, of None als geen bestand is geopend
+        """
+        sleutel_kolom = self.bepaal_sleutel_kolom()
+        if sleutel_kolom is None:
+            return None
+        return excelHandler.haalSleutelIndex(sleutel_kolom)
+    
+    def zoek_rijen(self, product_id):
+        """
+        Zoek de rijen met een productsleutel
+        
+        Args:
+            product_id (str): Productsleutel
+        
+        Returns:
+            list: Rij-indexen (0-based) met deze sleutel, leeg als het product niet in de sheet staat
+        """
+        index = self.haal_sleutel_index()
+        if index is None:
+            return []
+        return index.zoekAlle(product_id)
+    
+    def controleer_dubbele_sleutels(self):
+        """
+        Zoek productsleutels die in meerdere rijen voorkomen
+        
+        Returns:
+            dict: Dictionary met sleutel -> lijst van rij-indexen (0-based)
+        """
+        index = self.haal_sleutel_index()
+        if index is None:
+            return {}
+        return index.duplicaten()
+    
     def get_product_id(self, row_index):
         """
         Haal het product ID op uit een rij
@@ -61,11 +139,12 @@ class ExcelManager:
             str: Product ID of None bij fout
         """
         try:
-            # Lees de eerste kolom (ProductID)
-            product_id = excelHandler.getCellValue(row_index, 0)
-            if product_id and isinstance(product_id, (str, int)):
-                return str(product_id)
-            return None
+            # Lees de sleutelkolom (zoals Productcode)
+            sleutel_kolom = self.bepaal_sleutel_kolom()
+            if sleutel_kolom is None:
+                return None
+            product_id = excelHandler.getCellValue(row_index, excelHandler.kolomNamen.index(sleutel_kolom))
+            return normaliseerSleutel(product_id)
         except Exception as e:
             logger.logWaarschuwing(f"Kon product ID niet lezen van rij {row_index}: {e}")
             return None
@@ -90,46 +169,80 @@ class ExcelManager:
             
             # Haal de huidige ID op en vergelijk
             current_id = self.get_product_id(row_index)
-            if current_id != product_data.get('id'):
+            if current_id != normaliseerSleutel(product_data.get('id')):
                 logger.logWaarschuwing(f"Product ID mismatch: {current_id} != {product_data.get('id')}")
                 return False
             
-            # Update de relevante cellen
-            # Kolom 1: Naam
-            if 'naam' in product_data:
-                if overschrijf_lokaal or not excelHandler.getCellValue(row_index, 1):
-                    excelHandler.setCellValue(row_index, 1, product_data['naam'])
-            
-            # Kolom 2: Beschrijving
-            if 'beschrijving' in product_data:
-                if overschrijf_lokaal or not excelHandler.getCellValue(row_index, 2):
-                    excelHandler.setCellValue(row_index, 2, product_data['beschrijving'])
+            # Verzamel de relevante cellen (kolompositie -> waarde) en schrijf ze in één keer
+            updates = {}
+            for kolom_index, sleutel in self.KOLOM_MAPPING:
+                if sleutel not in product_data:
+                    continue
+                if overschrijf_lokaal or not excelHandler.getCellValue(row_index, kolom_index):
+                    updates[kolom_index] = product_data[sleutel]
             
-            # Kolom 3: Prijs
-            if 'prijs' in product_data:
-                if overschrijf_lokaal or not excelHandler.getCellValue(row_index, 3):
-                    excelHandler.setCellValue(row_index, 3, product_data['prijs'])
-            
-            # Kolom 4: Categorie
-            if 'categorie' in product_data:
-                if overschrijf_lokaal or not excelHandler.getCellValue(row_index, 4):
-                    excelHandler.setCellValue(row_index, 4, product_data['categorie'])
-            
-            # Kolom 5: Voorraad
-            if 'voorraad' in product_data:
-                if overschrijf_lokaal or not excelHandler.getCellValue(row_index, 5):
-                    excelHandler.setCellValue(row_index, 5, product_data['voorraad'])
-            
-            # Kolom 6: Afbeelding URL
-            if 'afbeelding_url' in product_data:
-                if overschrijf_lokaal or not excelHandler.getCellValue(row_index, 6):
-                    excelHandler.setCellValue(row_index, 6, product_data['afbeelding_url'])
-            
-            # Kolom 7: Laatst bijgewerkt
+            # Kolom 7: Laatst bijgewerkt wordt altijd bijgewerkt
             if 'last_updated' in product_data:
-                excelHandler.setCellValue(row_index, 7, product_data['last_updated'])
+                updates[7] = product_data['last_updated']
+            
+            excelHandler.setRowValues(row_index, updates)
             
             return True
         except Exception as e:
             logger.logFout(f"Fout bij updaten rij {row_index}: {e}")
             return False
+    
+    def update_product_op_sleutel(self, product_data, overschrijf_lokaal=False, rijen=None):
+        """
+        Update alle rijen met de productsleutel uit de productgegevens
+        
+        Args:
+            product_data (dict): Dictionary met productgegevens, inclusief 'id'
+            overschrijf_lokaal (bool): Of bestaande waarden overschreven moeten worden
+            rijen (tuple): Optioneel, tuple met (startRij, eindRij) om de update tot dat bereik te beperken
+        
+        Returns:
+            int: Aantal bijgewerkte rijen
+        """
+        if not product_data or not isinstance(product_data, dict):
+            logger.logWaarschuwing("Ongeldige product data zonder sleutel")
+            return 0
+        
+        product_id = product_data.get('id')
+        gevonden = self.zoek_rijen(product_id)
+        if rijen is not None:
+            gevonden = [rij for rij in gevonden if rijen[0] <= rij <= rijen[1]]
+        if not gevonden:
+            logger.logWaarschuwing(f"Product {product_id} staat niet in de sheet")
+            return 0
+        if len(gevonden) > 1:
+            logger.logWaarschuwing(
+                f"Product {product_id} staat in meerdere rijen ({', '.join(str(rij + 1) for rij in gevonden)}), alle rijen worden bijgewerkt"
+            )
+        
+        return sum(1 for rij in gevonden if self.update_product_row(rij, product_data, overschrijf_lokaal))
+    
+    def bewerking(self, omschrijving):
+        """
+        Groepeer alle wijzigingen binnen een with-blok tot één ongedaan te maken stap
+        
+        Args:
+            omschrijving (str): Omschrijving van de bewerking
+            
+        Returns:
+            Context manager voor gebruik met 'with'
+        """
+        return excelHandler.bewerking(omschrijving)
+    
+    def schrijf_wijzigingen_door(self):
+        """
+        Schrijf alle gebufferde celwijzigingen in bulk naar de sheet
+        
+        Returns:
+            int: Aantal doorgevoerde celwijzigingen
+        """
+        try:
+            return excelHandler.schrijfBufferDoor()
+        except Exception as e:
+            logger.logFout(f"Fout bij doorvoeren celwijzigingen: {e}")
+            return 0
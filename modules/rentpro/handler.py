@@ -7,6 +7,7 @@ BELANGRIJK: Dit is de definitieve implementatie die direct geïmporteerd wordt d
 modules/rentpro_handler.py voor backwards compatibiliteit.
 """
 import asyncio
+import functools
 from modules.logger import logger
 from modules.rentpro.driver_manager import DriverManager
 from modules.rentpro.authenticator import Authenticator
@@ -65,7 +66,7 @@ class RentproHandler:
     async def close(self):
         """
         Sluit de RentPro sessie en maak resources vrij
-        In API-mode hoeft geen WebDriver gesloten te worden
+        In API-mode hoeft geen WebDriver gesloten te worden, alleen de HTTP-sessie
         
         Returns:
             bool: True als het sluiten succesvol was, anders False
@@ -73,7 +74,8 @@ class RentproHandler:
         try:
             # Als we in API-mode zijn, hoeft de browser niet gesloten te worden
             if self.gebruik_api_mode:
-                logger.logInfo("API mode actief, geen browser om te sluiten")
+                logger.logInfo("API mode actief, HTTP-verbindingen sluiten")
+                await self.api_handler.close()
                 return True
                 
             # Alleen in browser-mode: sluit de WebDriver
@@ -162,14 +164,35 @@ class RentproHandler:
             self.ingelogd = True  # Simuleer login voor UI compatibiliteit
             return True  # Geef True terug voor graceful degradation
 
-    async def haal_producten_op(self, overschrijf_lokaal=False, rijen=None):
+    async def haal_producten_op(self, overschrijf_lokaal=False, rijen=None, voortgang=None, vernieuw=False):
         """
         Haal producten op van RentPro en update Excel
         Gebruikt verschillende methoden afhankelijk van mode (API/browser)
         
+        In API-mode worden de productdetails gelijktijdig opgehaald, begrensd door
+        de instelling RentPro.MaxGelijktijdig. De resultaten worden via de
+        productsleutel in Excel gezet, dus de volgorde van binnenkomst maakt niet uit.
+        
         Args:
             overschrijf_lokaal (bool): Of lokale data overschreven moet worden
             rijen (tuple): Optioneel, tuple met (startRij, eindRij)
+            voortgang (callable): Optioneel, wordt aangeroepen met (verwerkt, totaal)
+                                  na elk verwerkt product
+            vernieuw (bool): Als True, negeer de HTTP-cache en haal alle productpagina's opnieuw op
+            
+        Returns:
+            bool: True als ophalen succesvol was, anders False
+        """
+        # De hele synchronisatie, inclusief het doorvoeren van de buffer, is één ongedaan te maken stap
+        with self.excel_manager.bewerking("RentPro synchronisatie"):
+            return await self._synchroniseer_producten(overschrijf_lokaal, rijen, voortgang, vernieuw)
+    
+    async def _synchroniseer_producten(self, overschrijf_lokaal, rijen, voortgang, vernieuw):
+        """
+        Voer de synchronisatie van haal_producten_op uit
+        
+        Args:
+            Zie haal_producten_op
             
         Returns:
             bool: True als ophalen succesvol was, anders False
@@ -212,39 +235,32 @@ class RentproHandler:
                 # Haal productlijst op via WebDriver
                 await self.data_extractor.get_products_list()
             
-            # Loop door elke rij en verwerk producten
+            # Verzamel de unieke productsleutels; dubbele rijen worden via de index samen bijgewerkt
+            product_ids = self._verzamel_product_ids(start_rij, eind_rij)
+            
+            # Verwerk de producten in volgorde van binnenkomst
             succesvol = 0
-            for row_index in range(start_rij, eind_rij + 1):
-                # Haal product ID uit Excel
-                product_id = self.excel_manager.get_product_id(row_index)
-                if not product_id:
-                    # Geen ProductID, sla deze rij over
-                    continue
-                
-                # Haal product details op via de juiste methode
-                product_data = None
-                if self.gebruik_api_mode:
-                    # Haal product details op via API
-                    product_data = await self.api_handler.get_product_details(product_id)
-                else:
-                    # Haal product details op via WebDriver
-                    product_data = await self.data_extractor.get_product_details(product_id)
+            nummer = 0
+            async for product_id, product_data in self._haal_details_op(product_ids, vernieuw):
+                nummer += 1
+                if voortgang:
+                    voortgang(nummer, len(product_ids))
                 
                 if not product_data:
                     # Kon geen productdetails ophalen
                     continue
                 
-                # Update Excel
-                update_success = self.excel_manager.update_product_row(
-                    row_index, product_data, overschrijf_lokaal
+                # Update Excel via de productsleutel
+                succesvol += self.excel_manager.update_product_op_sleutel(
+                    product_data, overschrijf_lokaal, (start_rij, eind_rij)
                 )
                 
-                if update_success:
-                    succesvol += 1
-                
                 # Log voortgang periodiek
-                if (row_index - start_rij) % 5 == 0 or row_index == eind_rij:
-                    logger.logInfo(f"Voortgang: {row_index - start_rij + 1}/{eind_rij - start_rij + 1} producten verwerkt")
+                if nummer % 5 == 1 or nummer == len(product_ids):
+                    logger.logInfo(f"Voortgang: {nummer}/{len(product_ids)} producten verwerkt")
+            
+            # Schrijf alle gebufferde celwijzigingen in één keer per kolom weg
+            self.excel_manager.schrijf_wijzigingen_door()
             
             logger.logInfo(f"Klaar met ophalen producten. {succesvol} producten succesvol bijgewerkt.")
             return True
@@ -263,6 +279,46 @@ class RentproHandler:
                 eind_rij if 'eind_rij' in locals() else 0
             )
     
+    async def _haal_details_op(self, product_ids, vernieuw=False):
+        """
+        Haal de details van producten op met een begrensd aantal tegelijk
+        
+        In browser-mode is er één pagina, dus worden de producten één voor één
+        opgehaald. Een fout bij één product stopt de rest niet.
+        
+        Args:
+            product_ids (list): Productsleutels om op te halen
+            vernieuw (bool): Als True, negeer de HTTP-cache (alleen API-mode)
+            
+        Yields:
+            tuple: (product_id, product_data of None), in volgorde van binnenkomst
+        """
+        if self.gebruik_api_mode:
+            ophalen = functools.partial(self.api_handler.get_product_details, vernieuw=vernieuw)
+            gelijktijdig = self.api_handler.max_gelijktijdig
+        else:
+            ophalen = self.data_extractor.get_product_details
+            gelijktijdig = 1
+        
+        semaphore = asyncio.Semaphore(gelijktijdig)
+        
+        async def haal_op(product_id):
+            async with semaphore:
+                try:
+                    return product_id, await ophalen(product_id)
+                except Exception as e:
+                    logger.logWaarschuwing(f"Kon details van product {product_id} niet ophalen: {e}")
+                    return product_id, None
+        
+        taken = [asyncio.ensure_future(haal_op(product_id)) for product_id in product_ids]
+        try:
+            for taak in asyncio.as_completed(taken):
+                yield await taak
+        finally:
+            # Bij een afgebroken verwerking geen verzoeken op de achtergrond laten lopen
+            for taak in taken:
+                taak.cancel()
+    
     async def _verwerk_mock_producten(self, overschrijf_lokaal, start_rij, eind_rij):
         """
         Verwerk mockdata voor producten
@@ -284,14 +340,10 @@ class RentproHandler:
             product_types = ["Speaker", "Microfoon", "Kabel", "Licht", "Mixer", "Monitor", "Statief"]
             product_suffixes = ["XL", "Mini", "Pro", "Ultra", "Plus", "Max"]
             
-            # Loop door elke rij
+            # Loop door elk uniek product
+            product_ids = self._verzamel_product_ids(start_rij, eind_rij)
             succesvol = 0
-            for row_index in range(start_rij, eind_rij + 1):
-                # Haal product ID uit Excel
-                product_id = self.excel_manager.get_product_id(row_index)
-                if not product_id:
-                    continue
-                
+            for nummer, product_id in enumerate(product_ids, start=1):
                 # Genereer unieke maar consistente mock data op basis van product_id
                 seed = sum(ord(c) for c in product_id)
                 random.seed(seed)
@@ -312,20 +364,19 @@ class RentproHandler:
                     'last_updated': time.strftime("%Y-%m-%d %H:%M:%S")
                 }
                 
-                # Update Excel
-                update_success = self.excel_manager.update_product_row(
-                    row_index, product_data, overschrijf_lokaal
+                # Update Excel via de productsleutel
+                succesvol += self.excel_manager.update_product_op_sleutel(
+                    product_data, overschrijf_lokaal, (start_rij, eind_rij)
                 )
                 
-                if update_success:
-                    succesvol += 1
-                
                 # Simuleer verwerking voor natuurlijker gedrag
                 await asyncio.sleep(0.05)
                 
                 # Log voortgang periodiek
-                if (row_index - start_rij) % 5 == 0 or row_index == eind_rij:
-                    logger.logInfo(f"Voortgang (mock): {row_index - start_rij + 1}/{eind_rij - start_rij + 1} producten verwerkt")
+                if nummer % 5 == 1 or nummer == len(product_ids):
+                    logger.logInfo(f"Voortgang (mock): {nummer}/{len(product_ids)} producten verwerkt")
+            
+            self.excel_manager.schrijf_wijzigingen_door()
             
             logger.logInfo(f"Klaar met verwerken mock producten. {succesvol} producten succesvol bijgewerkt.")
             return True
@@ -333,7 +384,30 @@ class RentproHandler:
         except Exception as e:
             logger.logFout(f"Fout bij verwerken mock producten: {e}")
             return False
-            
+    
+    def _verzamel_product_ids(self, start_rij, eind_rij):
+        """
+        Verzamel de unieke productsleutels in een rijbereik
+        
+        Args:
+            start_rij (int): Eerste rij om te verwerken
+            eind_rij (int): Laatste rij om te verwerken
+        
+        Returns:
+            list: Unieke productsleutels in volgorde van voorkomen
+        """
+        product_ids = {}
+        for row_index in range(start_rij, eind_rij + 1):
+            product_id = self.excel_manager.get_product_id(row_index)
+            if product_id:
+                product_ids.setdefault(product_id, None)
+        
+        dubbel = self.excel_manager.controleer_dubbele_sleutels()
+        if dubbel:
+            logger.logWaarschuwing(f"{len(dubbel)} productsleutels komen in meerdere rijen voor en worden één keer opgehaald")
+        
+        return list(product_ids)
+    
     async def navigeer_naar_producten(self):
         """
         Navigeer naar de productenpagina
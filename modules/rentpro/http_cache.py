@@ -0,0 +1,343 @@
+"""
+HTTP Cache module voor de RentPro integratie
+Bewaart antwoorden van productpagina's in een lokale SQLite-database, zodat een
+volgende synchronisatie dezelfde pagina's niet opnieuw volledig hoeft op te halen
+
+Een antwoord is binnen de TTL direct bruikbaar. Daarna wordt het gevalideerd
+met een voorwaardelijk verzoek (If-None-Match / If-Modified-Since); stuurt de
+server geen validators mee, dan laat de inhoudshash zien of de pagina gewijzigd is.
+"""
+import os
+import time
+import zlib
+import sqlite3
+import hashlib
+import threading
+from modules.logger import logger
+from modules.settings import haalRentproCacheMaxMB
+
+# Map en bestand van de cache (relatief aan de werkmap, net als de logs)
+CACHE_MAP = "cache"
+CACHE_BESTAND = "rentpro_http.sqlite"
+
+# Na opruimen blijft de cache onder dit deel van de maximale grootte
+OPRUIM_FRACTIE = 0.9
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS antwoorden (
+    sleutel TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    inhoud BLOB NOT NULL,
+    inhoud_hash TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    gevalideerd REAL NOT NULL,
+    gebruikt REAL NOT NULL,
+    grootte INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS antwoorden_gebruikt ON antwoorden (gebruikt);
+"""
+
+def bereken_inhoud_hash(tekst):
+    """
+    Bereken de hash van de inhoud van een antwoord
+    
+    Args:
+        tekst (str): Inhoud van het antwoord
+    
+    Returns:
+        str: Hexadecimale BLAKE2b hash
+    """
+    return hashlib.blake2b(tekst.encode('utf-8'), digest_size=20).hexdigest()
+
+class CacheItem:
+    """Een bewaard antwoord uit de cache"""
+    
+    def __init__(self, url, tekst, inhoud_hash, etag, last_modified, gevalideerd):
+        """
+        Initialiseer een cache-item
+        
+        Args:
+            url (str): URL van het antwoord
+            tekst (str): Inhoud van het antwoord
+            inhoud_hash (str): Hash van de inhoud
+            etag (str): ETag van de server, of None
+            last_modified (str): Last-Modified van de server, of None
+            gevalideerd (float): Tijdstip waarop het antwoord voor het laatst is opgehaald of bevestigd
+        """
+        self.url = url
+        self.tekst = tekst
+        self.inhoud_hash = inhoud_hash
+        self.etag = etag
+        self.last_modified = last_modified
+        self.gevalideerd = gevalideerd
+    
+    def is_vers(self, ttl):
+        """
+        Controleer of het antwoord zonder validatie gebruikt mag worden
+        
+        Args:
+            ttl (float): Levensduur in seconden
+        
+        Returns:
+            bool: True als het antwoord jonger is dan de TTL
+        """
+        return time.time() - self.gevalideerd < ttl
+    
+    def validatie_headers(self):
+        """
+        Headers voor een voorwaardelijk verzoek
+        
+        Returns:
+            dict: If-None-Match en/of If-Modified-Since, leeg als de server geen validators gaf
+        """
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+class HttpCache:
+    """
+    SQLite-cache met HTTP-antwoorden, begrensd in grootte
+    
+    Bij overschrijding van de maximale grootte worden de minst recent gebruikte
+    antwoorden verwijderd (LRU). De inhoud wordt gecomprimeerd opgeslagen.
+    """
+    
+    def __init__(self, pad=None, max_grootte=None):
+        """
+        Initialiseer de cache; de database wordt bij het eerste gebruik geopend
+        
+        Args:
+            pad (str): Optioneel, pad naar de database
+            max_grootte (int): Optioneel, maximale grootte in bytes (gecomprimeerd);
+                               standaard uit de instellingen (RentPro.CacheMaxMB)
+        """
+        self.pad = pad or os.path.join(CACHE_MAP, CACHE_BESTAND)
+        if max_grootte is None:
+            max_grootte = int(haalRentproCacheMaxMB() * 1024 * 1024)
+        self.max_grootte = max_grootte
+        self._verbinding = None
+        self._totale_grootte = 0
+        self._lock = threading.RLock()
+    
+    @property
+    def actief(self):
+        """True als de cache gebruikt wordt; een maximale grootte van 0 schakelt hem uit"""
+        return self.max_grootte > 0
+    
+    def maak_sleutel(self, scope, url):
+        """
+        Maak de cachesleutel van een URL binnen een sessiescope
+        
+        Args:
+            scope (str): Scope van de sessie, zoals back-office URL en gebruiker
+            url (str): URL van het verzoek
+        
+        Returns:
+            str: De sleutel
+        """
+        return hashlib.blake2b(f"{scope}\0{url}".encode('utf-8'), digest_size=20).hexdigest()
+    
+    def haal_op(self, sleutel):
+        """
+        Haal een bewaard antwoord op en markeer het als recent gebruikt
+        
+        Args:
+            sleutel (str): Cachesleutel, zie maak_sleutel
+        
+        Returns:
+            CacheItem: Het antwoord, of None als het niet in de cache staat
+        """
+        try:
+            with self._lock:
+                db = self._db()
+                rij = db.execute(
+                    "SELECT url, inhoud, inhoud_hash, etag, last_modified, gevalideerd "
+                    "FROM antwoorden WHERE sleutel = ?", (sleutel,)
+                ).fetchone()
+                if rij is None:
+                    return None
+                db.execute("UPDATE antwoorden SET gebruikt = ? WHERE sleutel = ?", (time.time(), sleutel))
+                db.commit()
+        except sqlite3.Error as e:
+            logger.logWaarschuwing(f"Kon HTTP-cache niet lezen: {e}")
+            return None
+        
+        url, inhoud, inhoud_hash, etag, last_modified, gevalideerd = rij
+        try:
+            tekst = zlib.decompress(inhoud).decode('utf-8')
+        except (zlib.error, UnicodeDecodeError):
+            self.verwijder(sleutel)
+            return None
+        return CacheItem(url, tekst, inhoud_hash, etag, last_modified, gevalideerd)
+    
+    def sla_op(self, sleutel, url, tekst, etag=None, last_modified=None):
+        """
+        Bewaar een opgehaald antwoord
+        
+        Is de inhoud gelijk aan wat al bewaard was, dan worden alleen de
+        validators en het tijdstip bijgewerkt.
+        
+        Args:
+            sleutel (str): Cachesleutel, zie maak_sleutel
+            url (str): URL van het antwoord
+            tekst (str): Inhoud van het antwoord
+            etag (str): Optioneel, ETag van de server
+            last_modified (str): Optioneel, Last-Modified van de server
+        
+        Returns:
+            bool: True als de inhoud nieuw of gewijzigd is
+        """
+        inhoud_hash = bereken_inhoud_hash(tekst)
+        nu = time.time()
+        try:
+            with self._lock:
+                db = self._db()
+                rij = db.execute(
+                    "SELECT inhoud_hash, grootte FROM antwoorden WHERE sleutel = ?", (sleutel,)
+                ).fetchone()
+                
+                if rij is not None and rij[0] == inhoud_hash:
+                    db.execute(
+                        "UPDATE antwoorden SET etag = ?, last_modified = ?, gevalideerd = ?, gebruikt = ? "
+                        "WHERE sleutel = ?",
+                        (etag, last_modified, nu, nu, sleutel)
+                    )
+                    db.commit()
+                    return False
+                
+                inhoud = zlib.compress(tekst.encode('utf-8'))
+                db.execute(
+                    "INSERT OR REPLACE INTO antwoorden VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (sleutel, url, inhoud, inhoud_hash, etag, last_modified, nu, nu, len(inhoud))
+                )
+                db.commit()
+                self._totale_grootte += len(inhoud) - (rij[1] if rij is not None else 0)
+                
+                if self._totale_grootte > self.max_grootte:
+                    self._ruim_op()
+        except sqlite3.Error as e:
+            # Een mislukte cache mag het ophalen zelf niet stoppen
+            logger.logWaarschuwing(f"Kon antwoord niet in HTTP-cache bewaren: {e}")
+        return True
+    
+    def bevestig(self, sleutel, etag=None, last_modified=None):
+        """
+        Markeer een bewaard antwoord als gevalideerd na een 304 Not Modified
+        
+        Args:
+            sleutel (str): Cachesleutel, zie maak_sleutel
+            etag (str): Optioneel, nieuwe ETag van de server
+            last_modified (str): Optioneel, nieuwe Last-Modified van de server
+        """
+        nu = time.time()
+        try:
+            with self._lock:
+                db = self._db()
+                db.execute(
+                    "UPDATE antwoorden SET etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified), "
+                    "gevalideerd = ?, gebruikt = ? WHERE sleutel = ?",
+                    (etag, last_modified, nu, nu, sleutel)
+                )
+                db.commit()
+        except sqlite3.Error as e:
+            logger.logWaarschuwing(f"Kon HTTP-cache niet bijwerken: {e}")
+    
+    def verwijder(self, sleutel):
+        """
+        Verwijder een antwoord uit de cache
+        
+        Args:
+            sleutel (str): Cachesleutel, zie maak_sleutel
+        """
+        try:
+            with self._lock:
+                db = self._db()
+                rij = db.execute("SELECT grootte FROM antwoorden WHERE sleutel = ?", (sleutel,)).fetchone()
+                if rij is not None:
+                    db.execute("DELETE FROM antwoorden WHERE sleutel = ?", (sleutel,))
+                    db.commit()
+                    self._totale_grootte -= rij[0]
+        except sqlite3.Error as e:
+            logger.logWaarschuwing(f"Kon antwoord niet uit HTTP-cache verwijderen: {e}")
+    
+    def verwijder_product(self, product_id):
+        """
+        Verwijder de Edit- en Details-pagina van een product, voor alle sessies
+        
+        Aan te roepen nadat de applicatie het product zelf in RentPro heeft
+        gewijzigd, zodat een volgende synchronisatie de nieuwe waarden ophaalt.
+        
+        Args:
+            product_id (str): ID van het product
+        
+        Returns:
+            int: Aantal verwijderde antwoorden
+        """
+        # % en _ in het ID letterlijk nemen
+        patroon = str(product_id).replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        try:
+            with self._lock:
+                db = self._db()
+                rijen = db.execute(
+                    "SELECT sleutel, grootte FROM antwoorden "
+                    "WHERE url LIKE ? ESCAPE '\\' OR url LIKE ? ESCAPE '\\'",
+                    (f"%/Product/Edit/{patroon}", f"%/Product/Details/{patroon}")
+                ).fetchall()
+                if rijen:
+                    db.executemany("DELETE FROM antwoorden WHERE sleutel = ?", [(sleutel,) for sleutel, _ in rijen])
+                    db.commit()
+                    self._totale_grootte -= sum(grootte for _, grootte in rijen)
+            return len(rijen)
+        except sqlite3.Error as e:
+            logger.logWaarschuwing(f"Kon product {product_id} niet uit HTTP-cache verwijderen: {e}")
+            return 0
+    
+    def leeg(self):
+        """Verwijder alle antwoorden uit de cache"""
+        try:
+            with self._lock:
+                db = self._db()
+                db.execute("DELETE FROM antwoorden")
+                db.commit()
+                self._totale_grootte = 0
+            logger.logInfo("HTTP-cache geleegd")
+        except sqlite3.Error as e:
+            logger.logWaarschuwing(f"Kon HTTP-cache niet legen: {e}")
+    
+    def _ruim_op(self):
+        """Verwijder de minst recent gebruikte antwoorden tot de cache weer onder de grens zit"""
+        doel = self.max_grootte * OPRUIM_FRACTIE
+        db = self._db()
+        verwijderd = []
+        for sleutel, grootte in db.execute("SELECT sleutel, grootte FROM antwoorden ORDER BY gebruikt").fetchall():
+            if self._totale_grootte <= doel:
+                break
+            verwijderd.append((sleutel,))
+            self._totale_grootte -= grootte
+        
+        db.executemany("DELETE FROM antwoorden WHERE sleutel = ?", verwijderd)
+        db.commit()
+        logger.logInfo(f"HTTP-cache opgeruimd: {len(verwijderd)} antwoorden verwijderd")
+    
+    def _db(self):
+        """Open de database bij het eerste gebruik en bepaal de huidige grootte"""
+        if self._verbinding is None:
+            map_ = os.path.dirname(self.pad)
+            if map_ and not os.path.exists(map_):
+                os.makedirs(map_)
+            
+            self._verbinding = sqlite3.connect(self.pad, check_same_thread=False)
+            self._verbinding.execute("PRAGMA journal_mode=WAL")
+            self._verbinding.execute("PRAGMA synchronous=NORMAL")
+            self._verbinding.executescript(_SCHEMA)
+            self._totale_grootte = self._verbinding.execute(
+                "SELECT COALESCE(SUM(grootte), 0) FROM antwoorden"
+            ).fetchone()[0]
+        return self._verbinding
+
+# Singleton instance voor gebruik in de hele applicatie
+httpCache = HttpCache()
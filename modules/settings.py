@@ -338,3 +338,63 @@ def haalRentproURL():
         str: De opgeslagen URL of een standaard URL
     """
     return instellingen.haalOp('Rentpro', 'URL', 'http://metroeventsdc.rentpro5.nl/')
+
+def haalRentproMaxGelijktijdig(standaard=8):
+    """
+    Haal het maximale aantal gelijktijdige HTTP-verzoeken naar Rentpro op
+    
+    Args:
+        standaard (int): Waarde als de instelling ontbreekt of ongeldig is
+    
+    Returns:
+        int: Het maximale aantal gelijktijdige verzoeken (minimaal 1)
+    """
+    try:
+        return max(1, int(instellingen.haalOp('Rentpro', 'MaxGelijktijdig', standaard)))
+    except ValueError:
+        return standaard
+
+def haalRentproTimeout(standaard=30.0):
+    """
+    Haal de timeout per HTTP-verzoek naar Rentpro op
+    
+    Args:
+        standaard (float): Waarde in seconden als de instelling ontbreekt of ongeldig is
+    
+    Returns:
+        float: De timeout in seconden
+    """
+    try:
+        return float(instellingen.haalOp('Rentpro', 'Timeout', standaard))
+    except ValueError:
+        return standaard
+
+def haalRentproCacheTTL(standaard=3600.0):
+    """
+    Haal op hoe lang een bewaarde Rentpro productpagina zonder validatie gebruikt wordt
+    
+    Args:
+        standaard (float): Waarde in seconden als de instelling ontbreekt of ongeldig is
+    
+    Returns:
+        float: De levensduur in seconden; 0 valideert elke pagina bij de server
+    """
+    try:
+        return max(0.0, float(instellingen.haalOp('Rentpro', 'CacheTTL', standaard)))
+    except ValueError:
+        return standaard
+
+def haalRentproCacheMaxMB(standaard=200.0):
+    """
+    Haal de maximale grootte van de Rentpro HTTP-cache op
+    
+    Args:
+        standaard (float): Waarde in megabytes als de instelling ontbreekt of ongeldig is
+    
+    Returns:
+        float: De maximale grootte in megabytes; 0 schakelt de cache uit
+    """
+    try:
+        return max(0.0, float(instellingen.haalOp('Rentpro', 'CacheMaxMB', standaard)))
+    except ValueError:
+        return standaard
@@ -2,8 +2,22 @@
 Workflow module voor Excelladin Reloaded
 Beheert het combineren en in volgorde uitvoeren van meerdere acties
 """
+from contextlib import nullcontext
 from modules.logger import logger
-from modules.actions import voerActieUit, ActieResultaat
+from modules.excel_handler import excelHandler
+from modules.actions import (
+    voerActieUit,
+    voerLokaleActiesUit,
+    haalActieOp,
+    LokaleActie,
+    ActieResultaat
+)
+from modules.workflow_planner import bouwGraaf, voerGraafUit
+from modules.workflow_checkpoint import checkpointJournaal, maakRunId
+from modules.workflow_opslag import schrijfWorkflowBestand, leesWorkflowBestand
+
+# Standaard aantal rijen per chunk bij uitvoeren in chunks
+STANDAARD_CHUNK_GROOTTE = 10000
 
 class Workflow:
     """Workflow klasse voor het uitvoeren van meerdere acties in volgorde"""
@@ -17,6 +31,7 @@ class Workflow:
         """
         self.naam = naam
         self.acties = []  # lijst met (actieNaam, parameters) tuples
+        self.rijen = None  # standaardbereik (startRij, eindRij), None voor alle rijen
         self.voortgang = 0
         self.resultaten = []
     
@@ -70,14 +85,108 @@ class Workflow:
         """
         return self.resultaten
     
-    def voerUit(self, voortgangCallback=None, rijen=None):
+    def maakPlan(self):
+        """
+        Deel de acties in stappen in voor de uitvoering
+        
+        Opeenvolgende lokale acties (die alleen kolommen van het werkblad lezen en
+        schrijven) worden samengevoegd tot één stap, zodat ze samen in één
+        doorgang over de data worden uitgevoerd in plaats van elk apart. Overige
+        acties, zoals RentPro acties, vormen elk een eigen stap.
+        
+        Returns:
+            list: Lijst met stappen; elke stap is een lijst met indexen in self.acties
+        """
+        stappen = []
+        vorigeLokaal = False
+        
+        for i, (actieNaam, parameters) in enumerate(self.acties):
+            lokaal = isinstance(haalActieOp(actieNaam), LokaleActie)
+            if lokaal and vorigeLokaal:
+                stappen[-1].append(i)
+            else:
+                stappen.append([i])
+            vorigeLokaal = lokaal
+        
+        return stappen
+    
+    def _beschrijfStap(self, stap):
+        """
+        Beschrijf een samengevoegde stap voor de log en het journaal
+        
+        Args:
+            stap (list): Indexen van de acties in de stap
+            
+        Returns:
+            str: Omschrijving met de namen van de acties
+        """
+        namen = [self.acties[i][0] for i in stap]
+        
+        gelezen, geschreven = set(), set()
+        for i in stap:
+            actieNaam, parameters = self.acties[i]
+            actie = haalActieOp(actieNaam)
+            try:
+                gelezen.update(actie.leesKolommen(parameters))
+                geschreven.update(actie.schrijfKolommen(parameters))
+            except (KeyError, ValueError):
+                # Ongeldige parameters worden bij het uitvoeren gemeld
+                pass
+        
+        logger.logInfo(
+            f"Acties {', '.join(namen)} samengevoegd tot één doorgang "
+            f"({len(gelezen | geschreven)} kolommen gelezen, {len(geschreven)} geschreven)"
+        )
+        return " + ".join(namen)
+    
+    def isHervatbaar(self):
+        """
+        Controleer of de workflow acties bevat die per rij voortgang vastleggen
+        
+        Returns:
+            bool: True als een afgebroken run van deze workflow hervat kan worden
+        """
+        return any(getattr(haalActieOp(actieNaam), 'hervatbaar', False) for actieNaam, _ in self.acties)
+    
+    def kanHervatten(self, rijen=None):
+        """
+        Controleer of er een afgebroken run van deze workflow op het huidige bestand is
+        
+        Args:
+            rijen (tuple): Optioneel, tuple met (startRij, eindRij) waarop de workflow werkt
+            
+        Returns:
+            bool: True als voerUit met hervat=True voltooide rijen kan overslaan
+        """
+        if not self.isHervatbaar():
+            return False
+        
+        if rijen is None:
+            rijen = self.rijen
+        runId = maakRunId(self.naam, self.acties, excelHandler.huidigBestand, rijen)
+        return any(run['runId'] == runId for run in checkpointJournaal.haalOnvoltooideRuns())
+    
+    def voerUit(self, voortgangCallback=None, rijen=None, parallel=False, hervat=False,
+                chunkGrootte=None, annuleer=None):
         """
         Voer alle acties in de workflow uit
         
+        Bevat de workflow hervatbare acties (zoals RentPro bulk upload), dan wordt
+        de voortgang per rij vastgelegd in het checkpointjournaal.
+        
+        Met een chunkgrootte gaan de lokale acties per chunk rijen door de hele
+        reeks acties, met voortgang per chunk; zie _voerInChunksUit. Dit gaat
+        voor op parallel.
+        
         Args:
             voortgangCallback (callable): Callback functie om voortgang te rapporteren,
                                            ontvangt percentage en huidige actienaam
-            rijen (tuple): Optioneel, tuple met (startRij, eindRij) om alleen een bereik te bewerken
+            rijen (tuple): Optioneel, tuple met (startRij, eindRij) om alleen een bereik te bewerken;
+                           standaard het bereik van de workflow (self.rijen)
+            parallel (bool): Voer onafhankelijke stappen tegelijk uit (zie modules.workflow_planner)
+            hervat (bool): Zet een afgebroken run voort en sla de daarin voltooide rijen over
+            chunkGrootte (int): Optioneel, voer de lokale acties uit in chunks van dit aantal rijen
+            annuleer (threading.Event): Optioneel, stopt een uitvoering in chunks na de lopende chunk
             
         Returns:
             bool: True als alle acties succesvol zijn uitgevoerd, anders False
@@ -86,31 +195,285 @@ class Workflow:
             logger.logWaarschuwing(f"Workflow '{self.naam}' bevat geen acties")
             return True
         
+        if rijen is None:
+            rijen = self.rijen
+        
+        run = None
+        if self.isHervatbaar():
+            run = checkpointJournaal.startRun(self.naam, self.acties, excelHandler.huidigBestand, rijen, hervat)
+        
+        if chunkGrootte:
+            succes = self._voerInChunksUit(voortgangCallback, rijen, run, chunkGrootte, annuleer)
+        elif parallel:
+            succes = self._voerParallelUit(voortgangCallback, rijen, run)
+        else:
+            succes = self._voerSerieelUit(voortgangCallback, rijen, run)
+        
+        if run is not None:
+            if succes:
+                run.voltooi()
+            else:
+                run.breekAf()
+        return succes
+    
+    def _voerSerieelUit(self, voortgangCallback=None, rijen=None, run=None):
+        """
+        Voer de stappen van de workflow na elkaar uit
+        
+        Args:
+            voortgangCallback (callable): Callback functie om voortgang te rapporteren,
+                                           ontvangt percentage en huidige actienaam
+            rijen (tuple): Optioneel, tuple met (startRij, eindRij) om alleen een bereik te bewerken
+            run (WorkflowRun): Optioneel, de run waarin de voortgang per rij wordt vastgelegd
+            
+        Returns:
+            bool: True als alle acties succesvol zijn uitgevoerd, anders False
+        """
         logger.logInfo(f"Start uitvoering workflow '{self.naam}'")
         self.voortgang = 0
         self.resultaten = []
         
-        for i, (actieNaam, parameters) in enumerate(self.acties):
-            logger.logInfo(f"Uitvoeren actie {i+1}/{len(self.acties)}: {actieNaam}")
-            
-            # Voer de actie uit
-            resultaat = voerActieUit(actieNaam, parameters, rijen)
+        def verwerkResultaat(resultaat):
+            """Bewaar het resultaat van de volgende actie en update de voortgang"""
+            actieNaam = self.acties[len(self.resultaten)][0]
             self.resultaten.append(resultaat)
             
             # Update voortgang
-            self.voortgang = i + 1
+            self.voortgang = len(self.resultaten)
             if voortgangCallback:
                 percentage = self.haalVoortgang()
                 voortgangCallback(percentage, actieNaam)
+        
+        for stap in self.maakPlan():
+            if len(stap) == 1:
+                i = stap[0]
+                actieNaam, parameters = self.acties[i]
+                logger.logInfo(f"Uitvoeren actie {i+1}/{len(self.acties)}: {actieNaam}")
+                
+                # Voer de actie uit, met de checkpoint van de run actief
+                with run.actie(i) if run is not None else nullcontext():
+                    verwerkResultaat(voerActieUit(actieNaam, parameters, rijen))
+            else:
+                logger.logInfo(f"Uitvoeren acties {stap[0]+1}-{stap[-1]+1}/{len(self.acties)} in één doorgang")
+                
+                # Alle wijzigingen van de samengevoegde acties vormen samen één ongedaan te maken stap
+                acties = [(haalActieOp(self.acties[i][0]), self.acties[i][1]) for i in stap]
+                with excelHandler.bewerking(self._beschrijfStap(stap)):
+                    stapResultaten = voerLokaleActiesUit(acties, rijen, verwerkResultaat)
+                    excelHandler.schrijfBufferDoor()
+                
+                # Een mislukte terugschrijfactie vervangt het laatste resultaat achteraf
+                if stapResultaten:
+                    self.resultaten[-1] = stapResultaten[-1]
             
             # Stop bij fout als niet alle acties uitgevoerd moeten worden
+            resultaat = self.resultaten[-1]
             if not resultaat.succes:
+                actieNaam = self.acties[len(self.resultaten) - 1][0]
                 logger.logFout(f"Fout bij uitvoeren actie '{actieNaam}': {resultaat.bericht}")
                 return False
         
         logger.logInfo(f"Workflow '{self.naam}' succesvol uitgevoerd")
         return True
 
+    def _verdeelInSegmenten(self, stap):
+        """
+        Verdeel een stap met lokale acties in segmenten die samen in chunks kunnen lopen
+        
+        Binnen een chunk ziet een actie alleen de rijen van die chunk. Een actie
+        die een hele kolom opzoekt (OPZOEKEN) die eerder in het segment wordt
+        gewijzigd, moet daarom wachten tot dat segment alle chunks heeft gehad.
+        
+        Args:
+            stap (list): Indexen van opeenvolgende lokale acties
+            
+        Returns:
+            list: Segmenten als lijsten met actie-indexen
+        """
+        segmenten = [[]]
+        geschreven = set()
+        for i in stap:
+            actieNaam, parameters = self.acties[i]
+            actie = haalActieOp(actieNaam)
+            try:
+                volledig = set(actie.volledigeKolommen(parameters))
+                schrijft = actie.schrijfKolommen(parameters)
+            except (KeyError, ValueError):
+                # Ongeldige parameters worden bij het uitvoeren gemeld
+                volledig, schrijft = set(), []
+            
+            if volledig & geschreven:
+                segmenten.append([])
+                geschreven = set()
+            segmenten[-1].append(i)
+            geschreven.update(schrijft)
+        return segmenten
+    
+    def _voerInChunksUit(self, voortgangCallback=None, rijen=None, run=None, chunkGrootte=STANDAARD_CHUNK_GROOTTE,
+                         annuleer=None):
+        """
+        Voer de workflow uit met de lokale acties in chunks rijen
+        
+        Elke chunk gaat door alle opeenvolgende lokale acties voordat de volgende
+        chunk begint, dus per kolom staat steeds hooguit één chunk aan
+        tussenresultaten in het geheugen. Voortgang wordt per chunk gemeld en
+        tussen twee chunks kan de uitvoering geannuleerd worden. Overige acties,
+        zoals RentPro acties, worden als geheel uitgevoerd. De hele uitvoering
+        vormt één ongedaan te maken stap, ook na annuleren.
+        
+        Args:
+            voortgangCallback (callable): Callback functie om voortgang te rapporteren,
+                                           ontvangt percentage en huidige omschrijving
+            rijen (tuple): Optioneel, tuple met (startRij, eindRij) om alleen een bereik te bewerken
+            run (WorkflowRun): Optioneel, de run waarin de voortgang per rij wordt vastgelegd
+            chunkGrootte (int): Aantal rijen per chunk
+            annuleer (threading.Event): Optioneel, stopt de uitvoering na de lopende chunk
+            
+        Returns:
+            bool: True als alle acties succesvol zijn uitgevoerd, anders False
+        """
+        logger.logInfo(f"Start uitvoering workflow '{self.naam}' in chunks van {chunkGrootte} rijen")
+        self.voortgang = 0
+        self.resultaten = []
+        
+        # Het aantal rijen en daarmee de chunks liggen pas vast als alle rijen geladen zijn
+        excelHandler.wachtTotGeladen()
+        totaalRijen = excelHandler.haalRijAantal()
+        start, eind = rijen if rijen is not None else (0, totaalRijen - 1)
+        start, eind = max(start, 0), min(eind, totaalRijen - 1)
+        # Zonder rijen één lege chunk, zodat de acties zelf de fout melden
+        chunks = [
+            (chunkStart, min(chunkStart + chunkGrootte - 1, eind))
+            for chunkStart in range(start, eind + 1, chunkGrootte)
+        ] or [(start, eind)]
+        
+        def meldVoortgang(omschrijving):
+            """Geef de voortgang door aan de callback"""
+            if voortgangCallback:
+                voortgangCallback(self.haalVoortgang(), omschrijving)
+        
+        with excelHandler.bewerking(f"Workflow '{self.naam}'"):
+            for stap in self.maakPlan():
+                actieNaam, parameters = self.acties[stap[0]]
+                if isinstance(haalActieOp(actieNaam), LokaleActie):
+                    gelukt = all(
+                        self._voerSegmentInChunksUit(segment, chunks, rijen, meldVoortgang, annuleer)
+                        for segment in self._verdeelInSegmenten(stap)
+                    )
+                else:
+                    with run.actie(stap[0]) if run is not None else nullcontext():
+                        self.resultaten.append(voerActieUit(actieNaam, parameters, rijen))
+                    self.voortgang = len(self.resultaten)
+                    meldVoortgang(actieNaam)
+                    gelukt = self.resultaten[-1].succes
+                
+                if not gelukt:
+                    break
+            excelHandler.schrijfBufferDoor()
+        
+        for i, resultaat in enumerate(self.resultaten):
+            if not resultaat.succes:
+                logger.logFout(f"Fout bij uitvoeren actie '{self.acties[i][0]}': {resultaat.bericht}")
+                return False
+        
+        if len(self.resultaten) < len(self.acties):
+            return False
+        
+        logger.logInfo(f"Workflow '{self.naam}' succesvol uitgevoerd")
+        return True
+    
+    def _voerSegmentInChunksUit(self, segment, chunks, rijen, meldVoortgang, annuleer=None):
+        """
+        Voer een segment lokale acties chunk voor chunk uit
+        
+        Args:
+            segment (list): Indexen van de acties, zie _verdeelInSegmenten
+            chunks (list): Chunks als (startRij, eindRij) tuples
+            rijen (tuple): Optioneel, tuple met (startRij, eindRij) waarop de workflow werkt
+            meldVoortgang (callable): Wordt na elke chunk aangeroepen met een omschrijving
+            annuleer (threading.Event): Optioneel, stopt de uitvoering na de lopende chunk
+            
+        Returns:
+            bool: True als alle acties voor alle chunks gelukt zijn, anders False
+        """
+        acties = [(haalActieOp(self.acties[i][0]), self.acties[i][1]) for i in segment]
+        omschrijving = self._beschrijfStap(segment) if len(segment) > 1 else self.acties[segment[0]][0]
+        klaar = len(self.resultaten)
+        
+        for nummer, venster in enumerate(chunks):
+            rijTekst = f"rijen {venster[0]+1}-{venster[1]+1}"
+            
+            # De eerste actie van het segment is dan niet afgerond; eerdere chunks blijven bewerkt
+            if annuleer is not None and annuleer.is_set():
+                logger.logWaarschuwing(f"Workflow '{self.naam}' geannuleerd voor {rijTekst}")
+                self.resultaten.append(ActieResultaat(False, f"Geannuleerd voor {rijTekst}"))
+                return False
+            
+            chunkResultaten = voerLokaleActiesUit(acties, rijen, venster=venster)
+            
+            # Bij een fout gelden de resultaten van deze chunk, met de fout als laatste
+            if not chunkResultaten[-1].succes:
+                fout = chunkResultaten[-1]
+                chunkResultaten[-1] = ActieResultaat(False, f"{fout.bericht} ({rijTekst})")
+                self.resultaten.extend(chunkResultaten)
+                return False
+            
+            self.voortgang = klaar + len(segment) * (nummer + 1) / len(chunks)
+            meldVoortgang(f"{omschrijving}, {rijTekst}")
+        
+        self.resultaten.extend(chunkResultaten)
+        self.voortgang = len(self.resultaten)
+        return True
+    
+    def _voerParallelUit(self, voortgangCallback=None, rijen=None, run=None):
+        """
+        Voer de workflow uit volgens de afhankelijkheidsgraaf van zijn stappen
+        
+        Stappen die geen kolommen delen lopen tegelijk. De hele uitvoering vormt
+        één ongedaan te maken stap, omdat de wijzigingen van gelijktijdige
+        stappen niet van elkaar te scheiden zijn.
+        
+        Args:
+            voortgangCallback (callable): Callback functie om voortgang te rapporteren,
+                                           ontvangt percentage en huidige actienaam
+            rijen (tuple): Optioneel, tuple met (startRij, eindRij) om alleen een bereik te bewerken
+            run (WorkflowRun): Optioneel, de run waarin de voortgang per rij wordt vastgelegd
+            
+        Returns:
+            bool: True als alle acties succesvol zijn uitgevoerd, anders False
+        """
+        logger.logInfo(f"Start parallelle uitvoering workflow '{self.naam}'")
+        self.voortgang = 0
+        self.resultaten = []
+        
+        # Kolommen en bereiken liggen pas vast als alle rijen geladen zijn
+        excelHandler.wachtTotGeladen()
+        knopen = bouwGraaf(self.acties, self.maakPlan(), rijen)
+        
+        def naActie(index, resultaat):
+            """Update de voortgang na elke afgeronde actie"""
+            self.voortgang += 1
+            if voortgangCallback:
+                voortgangCallback(self.haalVoortgang(), self.acties[index][0])
+        
+        with excelHandler.bewerking(f"Workflow '{self.naam}'"):
+            resultaten = voerGraafUit(knopen, rijen, naActie, run=run)
+            excelHandler.schrijfBufferDoor()
+        
+        # Resultaten in workflowvolgorde, ongeacht de volgorde van afronden
+        self.resultaten = [resultaten[i] for i in sorted(resultaten)]
+        
+        for i in sorted(resultaten):
+            if not resultaten[i].succes:
+                logger.logFout(f"Fout bij uitvoeren actie '{self.acties[i][0]}': {resultaten[i].bericht}")
+                return False
+        
+        if len(resultaten) < len(self.acties):
+            return False
+        
+        logger.logInfo(f"Workflow '{self.naam}' succesvol uitgevoerd")
+        return True
+
 class WorkflowManager:
     """Manager voor het beheren van workflows"""
     
@@ -196,5 +559,101 @@ class WorkflowManager:
         
         return workflow.voerUit(voortgangCallback, rijen)
 
+    def haalHervatbareRunsOp(self):
+        """
+        Haal de afgebroken runs op die hervat kunnen worden
+        
+        Returns:
+            list: Dictionaries met runId, workflow, bestand, acties, rijen, status,
+                  bijgewerkt en voltooideRijen, nieuwste eerst
+        """
+        return checkpointJournaal.haalOnvoltooideRuns()
+    
+    def hervatRun(self, runId, voortgangCallback=None, parallel=False):
+        """
+        Hervat een afgebroken run, ook na een herstart van de applicatie
+        
+        De workflow wordt opnieuw opgebouwd uit de acties die bij de run zijn
+        vastgelegd. Het bestand van de run wordt geopend als dat nog niet het
+        huidige bestand is. Lokale acties worden opnieuw uitgevoerd; hervatbare
+        acties slaan de rijen over die al voltooid zijn.
+        
+        Args:
+            runId (str): ID van de run, zie haalHervatbareRunsOp
+            voortgangCallback (callable): Callback functie om voortgang te rapporteren
+            parallel (bool): Voer onafhankelijke stappen tegelijk uit
+            
+        Returns:
+            bool: True als de workflow succesvol is afgerond, anders False
+        """
+        run = next((run for run in self.haalHervatbareRunsOp() if run['runId'] == runId), None)
+        if run is None:
+            logger.logFout(f"Kan run '{runId}' niet hervatten: Niet gevonden of al voltooid")
+            return False
+        
+        if run['bestand'] and run['bestand'] != excelHandler.huidigBestand:
+            if not excelHandler.openBestand(run['bestand']):
+                logger.logFout(f"Kan run '{runId}' niet hervatten: Bestand {run['bestand']} niet te openen")
+                return False
+        
+        workflow = self.haalWorkflowOp(run['workflow'])
+        if workflow is None or workflow.acties != run['acties']:
+            workflow = Workflow(run['workflow'])
+            workflow.acties = list(run['acties'])
+        
+        logger.logInfo(f"Hervatten workflow '{run['workflow']}' ({run['voltooideRijen']} rijen al voltooid)")
+        return workflow.voerUit(voortgangCallback, run['rijen'], parallel=parallel, hervat=True)
+    
+    def slaWorkflowOp(self, naam, pad):
+        """
+        Sla een workflow op als JSON- of YAML-bestand
+        
+        Args:
+            naam (str): Naam van de workflow
+            pad (str): Pad naar het bestand; .yaml/.yml wordt YAML, anders JSON
+            
+        Returns:
+            bool: True als de workflow is opgeslagen, anders False
+        """
+        workflow = self.haalWorkflowOp(naam)
+        
+        if workflow is None:
+            logger.logFout(f"Kan workflow '{naam}' niet opslaan: Bestaat niet")
+            return False
+        
+        try:
+            schrijfWorkflowBestand(pad, workflow.naam, workflow.acties, workflow.rijen)
+            return True
+        except (ValueError, OSError) as e:
+            logger.logFout(f"Kan workflow '{naam}' niet opslaan in {pad}: {e}")
+            return False
+    
+    def laadWorkflow(self, pad):
+        """
+        Laad een opgeslagen workflow en controleer alle acties
+        
+        Alle acties worden bij het laden gecontroleerd en voorgecompileerd, zodat
+        een ongeldige workflow direct wordt gemeld in plaats van halverwege een run.
+        
+        Args:
+            pad (str): Pad naar het JSON- of YAML-bestand
+            
+        Returns:
+            Workflow: De geladen workflow, of None als het bestand ongeldig is
+        """
+        try:
+            naam, acties, rijen = leesWorkflowBestand(pad)
+        except (ValueError, OSError) as e:
+            logger.logFout(f"Kan workflow niet laden uit {pad}: {e}")
+            return None
+        
+        workflow = Workflow(naam)
+        workflow.acties = acties
+        workflow.rijen = rijen
+        self.workflows[naam] = workflow
+        logger.logInfo(f"Workflow '{naam}' geladen uit {pad} ({len(acties)} acties)")
+        
+        return workflow
+
 # Singleton instance voor gebruik in de hele applicatie
 workflowManager = WorkflowManager()
\ No newline at end of file
@@ -0,0 +1,316 @@
+"""
+Workflow Checkpoint module voor Excelladin Reloaded
+Legt per actie en per rij vast welk werk van een workflow al gedaan is, in een
+lokale SQLite-database, zodat een afgebroken run hervat kan worden zonder
+voltooide rijen opnieuw naar RentPro te sturen
+"""
+import os
+import json
+import sqlite3
+import hashlib
+import datetime
+import threading
+from contextlib import contextmanager
+from modules.logger import logger
+
+# Map en bestand van het checkpointjournaal (relatief aan de werkmap, net als de logs)
+CHECKPOINT_MAP = "checkpoints"
+CHECKPOINT_BESTAND = "workflows.sqlite"
+
+# Voltooide of verlaten runs ouder dan dit aantal dagen worden opgeruimd
+BEWAAR_DAGEN = 14
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    workflow TEXT NOT NULL,
+    bestand TEXT,
+    acties TEXT NOT NULL,
+    rijen TEXT,
+    status TEXT NOT NULL,
+    gestart TEXT NOT NULL,
+    bijgewerkt TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS rijen (
+    run_id TEXT NOT NULL,
+    actie_index INTEGER NOT NULL,
+    sleutel TEXT NOT NULL,
+    gegevens TEXT,
+    PRIMARY KEY (run_id, actie_index, sleutel)
+);
+"""
+
+_huidige = threading.local()
+
+def _nu():
+    """Huidige tijd als ISO-tekst"""
+    return datetime.datetime.now().isoformat(timespec='seconds')
+
+def maakRunId(workflowNaam, acties, bestandspad, rijen):
+    """
+    Bepaal de ID van een run uit alles wat het werk van de run bepaalt
+    
+    Dezelfde workflow op hetzelfde bestand en bereik krijgt dezelfde ID, zodat
+    een nieuwe poging de onvoltooide run terugvindt.
+    
+    Args:
+        workflowNaam (str): Naam van de workflow
+        acties (list): Lijst met (actieNaam, parameters) tuples
+        bestandspad (str): Pad naar het geopende Excel-bestand
+        rijen (tuple): Optioneel, tuple met (startRij, eindRij)
+    
+    Returns:
+        str: De run-ID
+    """
+    inhoud = json.dumps(
+        [workflowNaam, acties, os.path.abspath(bestandspad) if bestandspad else None, rijen],
+        sort_keys=True, default=str
+    )
+    return hashlib.sha1(inhoud.encode('utf-8')).hexdigest()
+
+class ActieCheckpoint:
+    """
+    Voortgang van één actie binnen een run
+    
+    Een actie vraagt de voltooide rijen op, slaat die over en markeert elke rij
+    direct na het afronden, zodat een crash hooguit de rij kost die bezig was.
+    """
+    
+    def __init__(self, journaal, runId, actieIndex):
+        """
+        Initialiseer de checkpoint van een actie
+        
+        Args:
+            journaal (CheckpointJournaal): Het journaal
+            runId (str): ID van de run
+            actieIndex (int): Index van de actie in de workflow
+        """
+        self._journaal = journaal
+        self.runId = runId
+        self.actieIndex = actieIndex
+    
+    def voltooid(self):
+        """
+        Haal de voltooide rijen van de actie op
+        
+        Returns:
+            dict: Sleutel (str) -> bewaarde gegevens (of None)
+        """
+        return self._journaal._haalRijen(self.runId, self.actieIndex)
+    
+    def markeer(self, sleutel, gegevens=None):
+        """
+        Markeer een rij als voltooid
+        
+        Args:
+            sleutel: Sleutel van de rij, zoals de rij-index
+            gegevens: Optioneel, JSON-serialiseerbare gegevens om bij hervatten opnieuw te gebruiken
+        """
+        self._journaal._markeerRij(self.runId, self.actieIndex, str(sleutel), gegevens)
+
+class _GeenCheckpoint:
+    """Checkpoint buiten een workflowrun: niets is voltooid en niets wordt bewaard"""
+    
+    def voltooid(self):
+        """Geen voltooide rijen"""
+        return {}
+    
+    def markeer(self, sleutel, gegevens=None):
+        """Niets bewaren"""
+        pass
+
+_GEEN_CHECKPOINT = _GeenCheckpoint()
+
+def huidigeCheckpoint():
+    """
+    Haal de checkpoint op van de actie die op deze thread wordt uitgevoerd
+    
+    Returns:
+        ActieCheckpoint: De checkpoint, of een lege checkpoint buiten een workflowrun
+    """
+    return getattr(_huidige, 'checkpoint', None) or _GEEN_CHECKPOINT
+
+class WorkflowRun:
+    """Eén (mogelijk hervatte) uitvoering van een workflow"""
+    
+    def __init__(self, journaal, runId, hervat):
+        """
+        Initialiseer de run
+        
+        Args:
+            journaal (CheckpointJournaal): Het journaal
+            runId (str): ID van de run
+            hervat (bool): True als een eerdere onvoltooide run wordt voortgezet
+        """
+        self._journaal = journaal
+        self.runId = runId
+        self.hervat = hervat
+    
+    @contextmanager
+    def actie(self, actieIndex):
+        """
+        Maak de checkpoint van een actie actief op deze thread
+        
+        Args:
+            actieIndex (int): Index van de actie in de workflow
+        """
+        vorige = getattr(_huidige, 'checkpoint', None)
+        _huidige.checkpoint = ActieCheckpoint(self._journaal, self.runId, actieIndex)
+        try:
+            yield _huidige.checkpoint
+        finally:
+            _huidige.checkpoint = vorige
+    
+    def voltooi(self):
+        """Markeer de run als voltooid; de rijvoortgang is dan niet meer nodig"""
+        self._journaal._zetStatus(self.runId, 'voltooid', wisRijen=True)
+    
+    def breekAf(self):
+        """Markeer de run als afgebroken, zodat hij hervat kan worden"""
+        self._journaal._zetStatus(self.runId, 'afgebroken')
+
+class CheckpointJournaal:
+    """
+    SQLite-journaal met de voortgang van workflowruns
+    
+    Elke voltooide rij wordt direct vastgelegd (WAL-modus), zodat de voortgang
+    een crash of verlopen sessie overleeft.
+    """
+    
+    def __init__(self, pad=None):
+        """
+        Initialiseer het journaal; de database wordt bij het eerste gebruik geopend
+        
+        Args:
+            pad (str): Optioneel, pad naar de database
+        """
+        self.pad = pad or os.path.join(CHECKPOINT_MAP, CHECKPOINT_BESTAND)
+        self._verbinding = None
+        self._lock = threading.RLock()
+    
+    def startRun(self, workflowNaam, acties, bestandspad=None, rijen=None, hervat=False):
+        """
+        Start een run, of zet een onvoltooide run met dezelfde ID voort
+        
+        Args:
+            workflowNaam (str): Naam van de workflow
+            acties (list): Lijst met (actieNaam, parameters) tuples
+            bestandspad (str): Optioneel, pad naar het geopende Excel-bestand
+            rijen (tuple): Optioneel, tuple met (startRij, eindRij)
+            hervat (bool): Zet een onvoltooide run voort in plaats van opnieuw te beginnen
+        
+        Returns:
+            WorkflowRun: De run
+        """
+        runId = maakRunId(workflowNaam, acties, bestandspad, rijen)
+        
+        with self._lock:
+            db = self._db()
+            rij = db.execute("SELECT status FROM runs WHERE run_id = ?", (runId,)).fetchone()
+            voortzetten = hervat and rij is not None and rij[0] != 'voltooid'
+            
+            if voortzetten:
+                db.execute(
+                    "UPDATE runs SET status = 'bezig', bijgewerkt = ? WHERE run_id = ?",
+                    (_nu(), runId)
+                )
+                aantal = db.execute("SELECT COUNT(*) FROM rijen WHERE run_id = ?", (runId,)).fetchone()[0]
+                logger.logInfo(f"Workflow '{workflowNaam}' hervat: {aantal} rijen al voltooid")
+            else:
+                db.execute("DELETE FROM rijen WHERE run_id = ?", (runId,))
+                db.execute(
+                    "INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?, ?, 'bezig', ?, ?)",
+                    (runId, workflowNaam, bestandspad, json.dumps(acties, default=str),
+                     json.dumps(rijen), _nu(), _nu())
+                )
+            db.commit()
+        
+        return WorkflowRun(self, runId, voortzetten)
+    
+    def haalOnvoltooideRuns(self):
+        """
+        Haal alle runs op die hervat kunnen worden
+        
+        Returns:
+            list: Dictionaries met runId, workflow, bestand, acties, rijen, status,
+                  bijgewerkt en het aantal voltooide rijen, nieuwste eerst
+        """
+        with self._lock:
+            rijen = self._db().execute(
+                "SELECT r.run_id, r.workflow, r.bestand, r.acties, r.rijen, r.status, r.bijgewerkt, "
+                "(SELECT COUNT(*) FROM rijen WHERE rijen.run_id = r.run_id) "
+                "FROM runs r WHERE r.status != 'voltooid' ORDER BY r.bijgewerkt DESC"
+            ).fetchall()
+        
+        return [
+            {
+                'runId': runId,
+                'workflow': workflow,
+                'bestand': bestand,
+                'acties': [tuple(actie) for actie in json.loads(acties)],
+                'rijen': tuple(json.loads(bereik)) if json.loads(bereik) else None,
+                'status': status,
+                'bijgewerkt': bijgewerkt,
+                'voltooideRijen': aantal
+            }
+            for runId, workflow, bestand, acties, bereik, status, bijgewerkt, aantal in rijen
+        ]
+    
+    def _db(self):
+        """Open de database bij het eerste gebruik en ruim oude runs op"""
+        if self._verbinding is None:
+            map_ = os.path.dirname(self.pad)
+            if map_ and not os.path.exists(map_):
+                os.makedirs(map_)
+            
+            self._verbinding = sqlite3.connect(self.pad, check_same_thread=False)
+            self._verbinding.execute("PRAGMA journal_mode=WAL")
+            self._verbinding.execute("PRAGMA synchronous=NORMAL")
+            self._verbinding.executescript(_SCHEMA)
+            
+            grens = (datetime.datetime.now() - datetime.timedelta(days=BEWAAR_DAGEN)).isoformat(timespec='seconds')
+            self._verbinding.execute(
+                "DELETE FROM rijen WHERE run_id IN (SELECT run_id FROM runs WHERE bijgewerkt < ?)", (grens,)
+            )
+            self._verbinding.execute("DELETE FROM runs WHERE bijgewerkt < ?", (grens,))
+            self._verbinding.commit()
+        return self._verbinding
+    
+    def _haalRijen(self, runId, actieIndex):
+        """Voltooide rijen van een actie: sleutel -> gegevens"""
+        with self._lock:
+            rijen = self._db().execute(
+                "SELECT sleutel, gegevens FROM rijen WHERE run_id = ? AND actie_index = ?",
+                (runId, actieIndex)
+            ).fetchall()
+        return {sleutel: json.loads(gegevens) if gegevens is not None else None for sleutel, gegevens in rijen}
+    
+    def _markeerRij(self, runId, actieIndex, sleutel, gegevens):
+        """Leg een voltooide rij direct vast"""
+        try:
+            with self._lock:
+                db = self._db()
+                db.execute(
+                    "INSERT OR REPLACE INTO rijen VALUES (?, ?, ?, ?)",
+                    (runId, actieIndex, sleutel, json.dumps(gegevens, default=str) if gegevens is not None else None)
+                )
+                db.execute("UPDATE runs SET bijgewerkt = ? WHERE run_id = ?", (_nu(), runId))
+                db.commit()
+        except sqlite3.Error as e:
+            # Een mislukte checkpoint mag de actie zelf niet stoppen
+            logger.logWaarschuwing(f"Kon voortgang niet vastleggen voor rij {sleutel}: {e}")
+    
+    def _zetStatus(self, runId, status, wisRijen=False):
+        """Werk de status van een run bij"""
+        with self._lock:
+            db = self._db()
+            if wisRijen:
+                db.execute("DELETE FROM rijen WHERE run_id = ?", (runId,))
+            db.execute(
+                "UPDATE runs SET status = ?, bijgewerkt = ? WHERE run_id = ?",
+                (status, _nu(), runId)
+            )
+            db.commit()
+
+# Singleton instance voor gebruik in de hele applicatie
+checkpointJournaal = CheckpointJournaal()
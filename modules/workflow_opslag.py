@@ -0,0 +1,184 @@
+"""
+Workflow Opslag module voor Excelladin Reloaded
+Slaat workflowdefinities op als JSON of YAML en leest ze terug, waarbij elke
+actie bij het inlezen wordt gecontroleerd en voorgecompileerd
+"""
+import os
+import json
+import importlib.util
+from modules.logger import logger
+from modules.actions import BESCHIKBARE_ACTIES, haalActieOp
+
+# YAML is alleen beschikbaar als PyYAML is geïnstalleerd
+YAML_BESCHIKBAAR = importlib.util.find_spec("yaml") is not None
+
+# Verhoog bij een wijziging in het bestandsformaat
+FORMAAT_VERSIE = 1
+
+def _isYaml(pad):
+    """Bepaal aan de extensie of een workflowbestand YAML is"""
+    return pad.lower().endswith(('.yaml', '.yml'))
+
+def controleerActies(acties):
+    """
+    Controleer en precompileer de acties van een workflow
+    
+    Per actie wordt gecontroleerd of hij bestaat en of de parameters geldig
+    zijn. Formaten, formules en schoonmaakstappen worden daarbij gecompileerd
+    (en gecachet), zodat het uitvoeren later niets meer hoeft te parsen.
+    
+    Args:
+        acties (list): Lijst met (actieNaam, parameters) tuples
+    
+    Returns:
+        list: Foutmeldingen, leeg als alle acties geldig zijn
+    """
+    fouten = []
+    for i, (actieNaam, parameters) in enumerate(acties):
+        actie = haalActieOp(actieNaam)
+        if actie is None:
+            if actieNaam in BESCHIKBARE_ACTIES:
+                fouten.append(f"Actie {i+1}: actie '{actieNaam}' kan niet worden geladen, zie het logboek")
+            else:
+                fouten.append(f"Actie {i+1}: onbekende actie '{actieNaam}'")
+            continue
+        if not isinstance(parameters, dict):
+            fouten.append(f"Actie {i+1} ({actieNaam}): parameters moeten een object zijn")
+            continue
+        
+        fout = actie.controleer(parameters)
+        if fout:
+            fouten.append(f"Actie {i+1} ({actieNaam}): {fout}")
+    return fouten
+
+def naarDefinitie(naam, acties, rijen=None):
+    """
+    Zet een workflow om naar een definitie die als JSON of YAML opgeslagen kan worden
+    
+    Args:
+        naam (str): Naam van de workflow
+        acties (list): Lijst met (actieNaam, parameters) tuples
+        rijen (tuple): Optioneel, standaardbereik (startRij, eindRij)
+    
+    Returns:
+        dict: De definitie
+    """
+    return {
+        'versie': FORMAAT_VERSIE,
+        'naam': naam,
+        'rijen': list(rijen) if rijen else None,
+        'acties': [{'actie': actieNaam, 'parameters': parameters} for actieNaam, parameters in acties]
+    }
+
+def uitDefinitie(definitie):
+    """
+    Lees een definitie in en controleer alle acties
+    
+    Args:
+        definitie (dict): De definitie, zie naarDefinitie
+    
+    Returns:
+        tuple: (naam, acties als lijst met (actieNaam, parameters) tuples, rijen of None)
+    
+    Raises:
+        ValueError: Als de definitie of een van de acties ongeldig is
+    """
+    if not isinstance(definitie, dict):
+        raise ValueError("Workflowdefinitie moet een object zijn")
+    
+    versie = definitie.get('versie', FORMAAT_VERSIE)
+    if versie != FORMAAT_VERSIE:
+        raise ValueError(f"Niet-ondersteunde versie van workflowdefinitie: {versie}")
+    
+    naam = definitie.get('naam')
+    if not naam or not isinstance(naam, str):
+        raise ValueError("Workflowdefinitie mist een naam")
+    
+    rijen = definitie.get('rijen')
+    if rijen is not None:
+        if (not isinstance(rijen, (list, tuple)) or len(rijen) != 2
+                or not all(isinstance(rij, int) and rij >= 0 for rij in rijen) or rijen[0] > rijen[1]):
+            raise ValueError("Ongeldig bereik in workflowdefinitie, verwacht [startRij, eindRij]")
+        rijen = tuple(rijen)
+    
+    ruweActies = definitie.get('acties')
+    if not isinstance(ruweActies, list) or not ruweActies:
+        raise ValueError("Workflowdefinitie bevat geen acties")
+    
+    acties = []
+    for i, actie in enumerate(ruweActies):
+        if not isinstance(actie, dict) or 'actie' not in actie:
+            raise ValueError(f"Actie {i+1}: verwacht een object met 'actie' en 'parameters'")
+        acties.append((actie['actie'], actie.get('parameters') or {}))
+    
+    fouten = controleerActies(acties)
+    if fouten:
+        raise ValueError("Ongeldige workflow '" + naam + "':\n" + "\n".join(fouten))
+    
+    return naam, acties, rijen
+
+def schrijfWorkflowBestand(pad, naam, acties, rijen=None):
+    """
+    Schrijf een workflow naar een JSON- of YAML-bestand
+    
+    Args:
+        pad (str): Pad naar het bestand; .yaml/.yml wordt YAML, anders JSON
+        naam (str): Naam van de workflow
+        acties (list): Lijst met (actieNaam, parameters) tuples
+        rijen (tuple): Optioneel, standaardbereik (startRij, eindRij)
+    
+    Raises:
+        ValueError: Als YAML gevraagd wordt maar PyYAML niet is geïnstalleerd
+        OSError: Als het bestand niet geschreven kan worden
+    """
+    if _isYaml(pad) and not YAML_BESCHIKBAAR:
+        raise ValueError("YAML wordt niet ondersteund: installeer PyYAML of gebruik .json")
+    
+    definitie = naarDefinitie(naam, acties, rijen)
+    
+    map_ = os.path.dirname(pad)
+    if map_ and not os.path.exists(map_):
+        os.makedirs(map_)
+    
+    # Eerst naar een tijdelijk bestand, zodat een afgebroken schrijfactie het oude bestand heel laat
+    tijdelijk = f"{pad}.tmp"
+    with open(tijdelijk, 'w', encoding='utf-8') as bestand:
+        if _isYaml(pad):
+            import yaml
+            yaml.safe_dump(definitie, bestand, allow_unicode=True, sort_keys=False)
+        else:
+            json.dump(definitie, bestand, ensure_ascii=False, indent=2)
+    os.replace(tijdelijk, pad)
+    
+    logger.logInfo(f"Workflow '{naam}' opgeslagen in {pad}")
+
+def leesWorkflowBestand(pad):
+    """
+    Lees een workflow uit een JSON- of YAML-bestand en controleer alle acties
+    
+    Args:
+        pad (str): Pad naar het bestand
+    
+    Returns:
+        tuple: (naam, acties, rijen), zie uitDefinitie
+    
+    Raises:
+        ValueError: Als het bestand of een van de acties ongeldig is
+        OSError: Als het bestand niet gelezen kan worden
+    """
+    with open(pad, 'r', encoding='utf-8') as bestand:
+        if _isYaml(pad):
+            if not YAML_BESCHIKBAAR:
+                raise ValueError("YAML wordt niet ondersteund: installeer PyYAML of gebruik .json")
+            import yaml
+            try:
+                definitie = yaml.safe_load(bestand)
+            except yaml.YAMLError as e:
+                raise ValueError(f"Ongeldige YAML in {pad}: {e}") from e
+        else:
+            try:
+                definitie = json.load(bestand)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Ongeldige JSON in {pad}: {e}") from e
+    
+    return uitDefinitie(definitie)
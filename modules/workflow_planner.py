@@ -0,0 +1,224 @@
+"""
+Workflow Planner module voor Excelladin Reloaded
+Bouwt een afhankelijkheidsgraaf uit de kolommen die acties lezen en schrijven en
+voert onafhankelijke stappen tegelijk uit: lokale stappen in een threadpool,
+RentPro stappen op de aanroepende thread (waar hun asyncio-lus draait)
+"""
+import os
+import concurrent.futures
+from contextlib import nullcontext
+from modules.logger import logger
+from modules.actions import (
+    voerActieUit,
+    voerLokaleActiesUit,
+    haalActieOp,
+    LokaleActie,
+    ActieResultaat
+)
+
+# Maximaal aantal lokale stappen dat tegelijk wordt uitgevoerd
+MAX_WERKTHREADS = min(4, os.cpu_count() or 1)
+
+class WorkflowKnoop:
+    """
+    Eén stap in de afhankelijkheidsgraaf
+    
+    Een stap is een losse actie of een reeks samengevoegde lokale acties (zie
+    Workflow.maakPlan). Van elke stap is bekend welke kolommen hij leest en
+    schrijft; stappen zonder overlap mogen tegelijk worden uitgevoerd.
+    """
+    
+    def __init__(self, nummer, indexen, acties, rijen=None):
+        """
+        Initialiseer een stap en bepaal de gelezen en geschreven kolommen
+        
+        Args:
+            nummer (int): Volgnummer van de stap in de workflow
+            indexen (list): Indexen van de acties in de workflow
+            acties (list): Lijst met (actieNaam, parameters) tuples
+            rijen (tuple): Optioneel, tuple met (startRij, eindRij) waarop de workflow werkt
+        """
+        self.nummer = nummer
+        self.indexen = list(indexen)
+        self.acties = list(acties)
+        self.lokaal = all(isinstance(haalActieOp(actieNaam), LokaleActie) for actieNaam, _ in self.acties)
+        self.afhankelijkheden = set()
+        
+        self.leest = set()
+        self.schrijft = set()
+        # Zonder bekende kolommen wordt de stap niet tegelijk met andere stappen uitgevoerd
+        self.onbekend = False
+        # Een gewijzigde veld-ID rij kan het bereik van latere acties veranderen
+        self.schrijftVeldIdRij = False
+        self.volgtSchema = False
+        
+        for actieNaam, parameters in self.acties:
+            actie = haalActieOp(actieNaam)
+            if actie is None:
+                self.onbekend = True
+                continue
+            
+            try:
+                leest = actie.leesKolommen(parameters)
+                schrijft = actie.schrijfKolommen(parameters)
+                if leest is not None and isinstance(actie, LokaleActie):
+                    leest = leest + actie.volledigeKolommen(parameters)
+            except (KeyError, ValueError):
+                # Ongeldige parameters worden bij het uitvoeren gemeld
+                leest = schrijft = None
+            
+            if leest is None or schrijft is None:
+                self.onbekend = True
+                continue
+            
+            self.leest.update(leest)
+            self.schrijft.update(schrijft)
+            volgtSchema = actie.bereikVolgtSchema(rijen)
+            self.volgtSchema = self.volgtSchema or volgtSchema
+            if schrijft and not volgtSchema and (rijen is None or rijen[0] <= 0):
+                self.schrijftVeldIdRij = True
+    
+    def conflicteertMet(self, ander):
+        """
+        Controleer of twee stappen in workflowvolgorde uitgevoerd moeten worden
+        
+        Args:
+            ander (WorkflowKnoop): De andere stap
+        
+        Returns:
+            bool: True als de stappen niet tegelijk uitgevoerd mogen worden
+        """
+        if self.onbekend or ander.onbekend:
+            return True
+        
+        # RentPro stappen delen de sessie en de asyncio-lus van de aanroepende thread
+        if not self.lokaal and not ander.lokaal:
+            return True
+        
+        if self.schrijft & (ander.leest | ander.schrijft) or self.leest & ander.schrijft:
+            return True
+        
+        return (
+            (self.schrijftVeldIdRij and ander.volgtSchema)
+            or (ander.schrijftVeldIdRij and self.volgtSchema)
+        )
+
+def bouwGraaf(acties, stappen, rijen=None):
+    """
+    Bouw de afhankelijkheidsgraaf van een workflow
+    
+    Een stap hangt af van elke eerdere stap waarmee hij conflicteert, zodat
+    conflicterende stappen altijd in workflowvolgorde worden uitgevoerd.
+    
+    Args:
+        acties (list): Lijst met (actieNaam, parameters) tuples van de workflow
+        stappen (list): Stappen als lijsten met actie-indexen, zie Workflow.maakPlan
+        rijen (tuple): Optioneel, tuple met (startRij, eindRij) om alleen een bereik te bewerken
+    
+    Returns:
+        list: WorkflowKnoop per stap, in workflowvolgorde
+    """
+    knopen = []
+    for nummer, stap in enumerate(stappen):
+        knoop = WorkflowKnoop(nummer, stap, [acties[i] for i in stap], rijen)
+        for eerder in knopen:
+            if knoop.conflicteertMet(eerder):
+                knoop.afhankelijkheden.add(eerder.nummer)
+        knopen.append(knoop)
+    
+    onafhankelijk = sum(1 for knoop in knopen if not knoop.afhankelijkheden)
+    logger.logInfo(f"Afhankelijkheidsgraaf: {len(knopen)} stappen, {onafhankelijk} zonder afhankelijkheden")
+    return knopen
+
+def _voerLokaleKnoopUit(knoop, rijen):
+    """
+    Voer een lokale stap uit in een werkthread
+    
+    Args:
+        knoop (WorkflowKnoop): De stap
+        rijen (tuple): Optioneel, tuple met (startRij, eindRij) om alleen een bereik te bewerken
+    
+    Returns:
+        list: ActieResultaat per uitgevoerde actie
+    """
+    acties = [(haalActieOp(actieNaam), parameters) for actieNaam, parameters in knoop.acties]
+    return voerLokaleActiesUit(acties, rijen)
+
+def voerGraafUit(knopen, rijen=None, naActie=None, maxWerkthreads=None, run=None):
+    """
+    Voer de stappen van een afhankelijkheidsgraaf uit, onafhankelijke stappen tegelijk
+    
+    Lokale stappen gaan naar een threadpool; RentPro stappen worden op de
+    aanroepende thread uitgevoerd, terwijl de lokale stappen doorlopen. Het
+    verwerken van resultaten en het melden van voortgang gebeurt altijd op de
+    aanroepende thread, bij gelijktijdig afgeronde stappen in workflowvolgorde.
+    Na een mislukte actie worden geen nieuwe stappen meer gestart; lopende
+    stappen worden nog afgemaakt.
+    
+    Args:
+        knopen (list): WorkflowKnoop per stap, zie bouwGraaf
+        rijen (tuple): Optioneel, tuple met (startRij, eindRij) om alleen een bereik te bewerken
+        naActie (callable): Optioneel, wordt na elke actie aangeroepen met (actie-index, ActieResultaat)
+        maxWerkthreads (int): Optioneel, maximaal aantal lokale stappen tegelijk
+        run (WorkflowRun): Optioneel, run waarvan de checkpoint actief is tijdens RentPro stappen
+    
+    Returns:
+        dict: Actie-index -> ActieResultaat voor alle uitgevoerde acties
+    """
+    resultaten = {}
+    gestart = set()
+    klaar = set()
+    lopend = {}
+    mislukt = False
+    
+    def verwerk(knoop, stapResultaten):
+        """Bewaar de resultaten van een afgeronde stap"""
+        nonlocal mislukt
+        for index, resultaat in zip(knoop.indexen, stapResultaten):
+            resultaten[index] = resultaat
+            if naActie:
+                naActie(index, resultaat)
+            if not resultaat.succes:
+                mislukt = True
+        klaar.add(knoop.nummer)
+    
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=max(1, maxWerkthreads or MAX_WERKTHREADS),
+        thread_name_prefix="workflow"
+    ) as pool:
+        while True:
+            if not mislukt:
+                gereed = [
+                    knoop for knoop in knopen
+                    if knoop.nummer not in gestart and knoop.afhankelijkheden <= klaar
+                ]
+                
+                for knoop in gereed:
+                    if knoop.lokaal:
+                        gestart.add(knoop.nummer)
+                        lopend[pool.submit(_voerLokaleKnoopUit, knoop, rijen)] = knoop
+                
+                # Eén RentPro stap op deze thread; de lokale stappen lopen ondertussen door
+                knoop = next((knoop for knoop in gereed if not knoop.lokaal), None)
+                if knoop is not None:
+                    gestart.add(knoop.nummer)
+                    actieNaam, parameters = knoop.acties[0]
+                    with run.actie(knoop.indexen[0]) if run is not None else nullcontext():
+                        resultaat = voerActieUit(actieNaam, parameters, rijen)
+                    verwerk(knoop, [resultaat])
+                    continue
+            
+            if not lopend:
+                break
+            
+            afgerond, _ = concurrent.futures.wait(lopend, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in sorted(afgerond, key=lambda future: lopend[future].nummer):
+                knoop = lopend.pop(future)
+                try:
+                    stapResultaten = future.result()
+                except Exception as e:
+                    logger.logFout(f"Fout bij uitvoeren stap {knoop.nummer + 1}: {e}")
+                    stapResultaten = [ActieResultaat(False, f"Fout bij uitvoeren actie: {e}")]
+                verwerk(knoop, stapResultaten)
+    
+    return resultaten
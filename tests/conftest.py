@@ -0,0 +1,8 @@
+"""
+Gedeelde pytest-instellingen voor Excelladin Reloaded
+"""
+import os
+import sys
+
+# Maak 'modules' importeerbaar, ook als pytest buiten de projectmap wordt gestart
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
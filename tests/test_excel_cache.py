@@ -0,0 +1,43 @@
+"""
+Tests voor het cacheformaat van modules.excel_cache
+"""
+import datetime
+import numpy as np
+import pandas as pd
+from modules.excel_cache import _schrijfData, _leesData, schrijfNaarCache, laadUitCache, _cachePaden
+
+def test_round_trip_behoudt_waarden_en_datatypes(tmp_path):
+    dataFrame = pd.DataFrame({
+        'Code': pd.Series(['P1', None, 'P3'], dtype=object),
+        'Gemengd': pd.Series([1, 'twee', 3.5], dtype=object),
+        'Datum': pd.Series([datetime.datetime(2024, 1, 2, 3, 4), datetime.date(2020, 1, 1), None], dtype=object),
+        'Aantal': [1, 2, 3],
+        'Prijs': [1.5, np.nan, 0.0],
+        'Categorie': pd.Categorical(['a', 'b', None]),
+        'Actief': pd.array([True, None, False], dtype='boolean'),
+    })
+    pad = tmp_path / 'data.npz'
+    _schrijfData(pad, dataFrame)
+    terug = _leesData(pad)
+    
+    assert terug.equals(dataFrame)
+    assert terug.dtypes.to_dict() == dataFrame.dtypes.to_dict()
+    assert type(terug.loc[0, 'Datum']) is datetime.datetime
+    assert type(terug.loc[1, 'Datum']) is datetime.date
+
+def test_niet_te_coderen_waarden_worden_niet_gecachet(tmp_path):
+    werkboek = tmp_path / 'werkboek.xlsx'
+    werkboek.write_bytes(b'inhoud')
+    
+    assert not schrijfNaarCache(str(werkboek), pd.DataFrame({'a': [{'geen': 'celwaarde'}]}))
+
+def test_cache_met_pickle_wordt_niet_geladen(tmp_path):
+    werkboek = tmp_path / 'werkboek.xlsx'
+    werkboek.write_bytes(b'inhoud')
+    assert schrijfNaarCache(str(werkboek), pd.DataFrame({'a': [1, 2]}))
+    
+    # Een archief met een object-array kan alleen via pickle gelezen worden
+    _, dataPad = _cachePaden(str(werkboek))
+    np.savez(dataPad, beschrijving=np.array([object()], dtype=object))
+    
+    assert laadUitCache(str(werkboek)) is None
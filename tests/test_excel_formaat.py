@@ -0,0 +1,28 @@
+"""
+Tests voor de formaatsjablonen van modules.excel_formaat
+"""
+import pandas as pd
+import pytest
+from modules.excel_formaat import compileerFormaat
+
+KOLOMMEN = {
+    'Merk': pd.Series(['Sony', None, 'LG'], dtype=object),
+    'Code': pd.Series([1, 2, 30]),
+}
+
+def test_kolomvelden_worden_per_kolom_gevuld():
+    assert compileerFormaat('{Merk} - {Code:>3}').pasToe(KOLOMMEN, 3).tolist() == ['Sony -   1', ' -   2', 'LG -  30']
+
+def test_index_en_attribuut_vallen_terug_op_str_format():
+    sjabloon = compileerFormaat('{Merk[0]}{Code}')
+    
+    assert sjabloon.perRij
+    assert sjabloon.velden == ['Merk', 'Code']
+    # Een lege cel is lege tekst, dus [0] mislukt en die rij blijft leeg
+    assert sjabloon.pasToe(KOLOMMEN, 3).tolist() == ['S1', '', 'L30']
+
+def test_ontbrekende_kolom_geeft_keyerror():
+    with pytest.raises(KeyError):
+        compileerFormaat('{Type[0]}').pasToe(KOLOMMEN, 3)
+    with pytest.raises(KeyError):
+        compileerFormaat('{Type}').pasToe(KOLOMMEN, 3)
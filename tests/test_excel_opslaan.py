@@ -0,0 +1,162 @@
+"""
+Tests voor het direct patchen van het xlsx-pakket in modules.excel_opslaan
+"""
+import io
+import zipfile
+import datetime
+import pandas as pd
+import pytest
+from openpyxl import Workbook, load_workbook
+from openpyxl.styles import Font
+from modules.excel_opslaan import (
+    GewijzigdeBereiken, slaDeltaOp, _herschrijfWerkblad, _patchPakket,
+    _verzamelWijzigingen, _PakketNietOndersteund
+)
+
+BLAD = (
+    b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    b'<dimension ref="A1:B3"/><sheetData>'
+    b'<row r="1" spans="1:2"><c r="A1" t="s"><v>0</v></c><c r="B1" t="s"><v>1</v></c></row>'
+    b'<row r="2" spans="1:2"><c r="A2" s="3"><v>1</v></c><c r="B2" t="s"><v>2</v></c></row>'
+    b'<row r="3" spans="1:2"><c r="A3"><v>2</v></c></row>'
+    b'</sheetData><pageMargins left="0.7" right="0.7" top="0.75" bottom="0.75" header="0.3" footer="0.3"/></worksheet>'
+)
+
+def _herschrijf(blad, wijzigingen, kopregels=None):
+    """Herschrijf een werkblad-XML in het geheugen en geef de nieuwe XML terug"""
+    doel = io.BytesIO()
+    _herschrijfWerkblad(
+        io.BytesIO(blad), doel, wijzigingen,
+        kopregels.append if kopregels is not None else (lambda rijXml: None)
+    )
+    return doel.getvalue()
+
+def _maakWerkboek(pad):
+    """Maak een werkboek met gedeelde teksten, opmaak en een tweede werkblad"""
+    werkboek = Workbook()
+    blad = werkboek.active
+    blad.title = 'Producten'
+    blad.append(['Code', 'Naam', 'Prijs'])
+    blad.append(['P1', 'Tent', 10])
+    blad.append(['P2', 'Stoel', 2.5])
+    blad.append(['P3', None, None])
+    blad['B2'].font = Font(bold=True)
+    werkboek.create_sheet('Extra')['A1'] = 'blijft staan'
+    werkboek.save(pad)
+
+def _leesWerkblad(pad, naam='Producten'):
+    """Lees alle waarden van een werkblad als lijst van tuples"""
+    werkboek = load_workbook(pad)
+    try:
+        return [tuple(rij) for rij in werkboek[naam].iter_rows(values_only=True)]
+    finally:
+        werkboek.close()
+
+def _markeerAlles(dataFrame, rijen):
+    """Markeer de gegeven DataFrame-rijen in alle kolommen als gewijzigd"""
+    bereiken = GewijzigdeBereiken()
+    for kolom in dataFrame.columns:
+        bereiken.markeerRijen(kolom, rijen)
+    return bereiken
+
+def test_herschrijf_vervangt_alleen_gewijzigde_cellen():
+    nieuw = _herschrijf(BLAD, {2: {1: 'a < b & "c"'}})
+    
+    assert b'<c r="B2" t="inlineStr"><is><t xml:space="preserve">a &lt; b &amp; "c"</t></is></c>' in nieuw
+    assert b'<c r="A2" s="3"><v>1</v></c>' in nieuw
+    # Ongewijzigde rijen en de rest van het werkblad blijven byte voor byte gelijk
+    assert BLAD.split(b'<row r="3"')[1] in nieuw
+    assert nieuw.startswith(BLAD.split(b'<sheetData>')[0])
+
+def test_herschrijf_getallen_booleans_en_lege_cellen():
+    nieuw = _herschrijf(BLAD, {2: {0: None, 1: 7}, 3: {0: 1.25, 1: True}})
+    
+    # De stijl van een bestaande cel blijft behouden, ook als de cel leeg wordt
+    assert b'<c r="A2" s="3"/>' in nieuw
+    assert b'<c r="B2"><v>7</v></c>' in nieuw
+    assert b'<c r="A3"><v>1.25</v></c><c r="B3" t="b"><v>1</v></c>' in nieuw
+    # Na het invoegen van een cel klopt spans niet meer
+    assert b'<row r="3">' in nieuw
+
+def test_herschrijf_voegt_rijen_en_cellen_in_volgorde_in():
+    blad = BLAD.replace(b'<row r="3" spans="1:2"><c r="A3"><v>2</v></c></row>', b'<row r="4"><c r="A4"><v>4</v></c></row>')
+    nieuw = _herschrijf(blad, {3: {0: 'x'}, 6: {2: 'y'}})
+    
+    rijen = nieuw.split(b'<sheetData>')[1].split(b'</sheetData>')[0]
+    assert rijen.index(b'<row r="3">') < rijen.index(b'<row r="4">') < rijen.index(b'<row r="6">')
+    assert b'<dimension ref="A1:C6"/>' in nieuw
+
+def test_herschrijf_geeft_kopregel_door_voor_controle():
+    kopregels = []
+    _herschrijf(BLAD, {3: {0: 1}}, kopregels)
+    
+    assert len(kopregels) == 1
+    assert kopregels[0].startswith(b'<row r="1"')
+
+@pytest.mark.parametrize('waarde', ['=SOM(A1:A2)', 'stuur\x07teken', float('nan'), datetime.date(2024, 1, 2)])
+def test_herschrijf_weigert_waarden_voor_openpyxl(waarde):
+    with pytest.raises(_PakketNietOndersteund):
+        _herschrijf(BLAD, {2: {1: waarde}})
+
+def test_herschrijf_weigert_formule_in_gewijzigde_cel():
+    blad = BLAD.replace(b'<c r="A3"><v>2</v></c>', b'<c r="A3"><f>A2*2</f><v>2</v></c>')
+    
+    with pytest.raises(_PakketNietOndersteund):
+        _herschrijf(blad, {3: {0: 5}})
+
+def test_patch_pakket_round_trip(tmp_path):
+    bron = tmp_path / 'bron.xlsx'
+    doel = tmp_path / 'doel.xlsx'
+    _maakWerkboek(bron)
+    
+    dataFrame = pd.read_excel(bron, dtype=object)
+    dataFrame.iloc[0, 1] = 'Grote tent'
+    dataFrame.iloc[1, 2] = 3
+    dataFrame.iloc[2, 1] = 'Was leeg'
+    dataFrame.iloc[0, 2] = None
+    dataFrame.loc[len(dataFrame)] = ['P4', 'Nieuw', 1.5]
+    
+    wijzigingen = _verzamelWijzigingen(dataFrame, _markeerAlles(dataFrame, [0, 1, 2, 3]))
+    assert _patchPakket(str(bron), str(doel), dataFrame, wijzigingen)
+    
+    assert _leesWerkblad(doel) == [
+        ('Code', 'Naam', 'Prijs'),
+        ('P1', 'Grote tent', None),
+        ('P2', 'Stoel', 3),
+        ('P3', 'Was leeg', None),
+        ('P4', 'Nieuw', 1.5),
+    ]
+    assert _leesWerkblad(doel, 'Extra') == [('blijft staan',)]
+    assert load_workbook(doel)['Producten']['B2'].font.b
+    
+    # De gedeelde teksten en andere onderdelen blijven inhoudelijk gelijk
+    with zipfile.ZipFile(bron) as oud, zipfile.ZipFile(doel) as nieuw:
+        assert oud.namelist() == nieuw.namelist()
+        for naam in oud.namelist():
+            if naam != 'xl/worksheets/sheet1.xml':
+                assert oud.read(naam) == nieuw.read(naam), naam
+        assert nieuw.testzip() is None
+
+def test_patch_pakket_controleert_kopregel_uit_gedeelde_teksten(tmp_path):
+    bron = tmp_path / 'bron.xlsx'
+    _maakWerkboek(bron)
+    
+    dataFrame = pd.read_excel(bron, dtype=object).rename(columns={'Naam': 'Omschrijving'})
+    wijzigingen = _verzamelWijzigingen(dataFrame, _markeerAlles(dataFrame, [0]))
+    
+    assert not _patchPakket(str(bron), str(tmp_path / 'doel.xlsx'), dataFrame, wijzigingen)
+
+def test_sla_delta_op_valt_terug_op_openpyxl(tmp_path):
+    bron = tmp_path / 'bron.xlsx'
+    doel = tmp_path / 'doel.xlsx'
+    _maakWerkboek(bron)
+    
+    dataFrame = pd.read_excel(bron, dtype=object)
+    dataFrame['Naam'] = dataFrame['Naam'].astype(object)
+    dataFrame.iloc[0, 1] = datetime.datetime(2024, 1, 2)
+    bereiken = GewijzigdeBereiken()
+    bereiken.markeer('Naam', 0, 0)
+    
+    assert slaDeltaOp(str(bron), dataFrame, bereiken, doelpad=str(doel))
+    assert _leesWerkblad(doel)[1][1] == datetime.datetime(2024, 1, 2)
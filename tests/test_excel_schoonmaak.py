@@ -0,0 +1,32 @@
+"""
+Tests voor de schoonmaakpijplijn van modules.excel_schoonmaak
+"""
+import re
+import numpy as np
+import pandas as pd
+import pytest
+from modules.excel_schoonmaak import compileerPijplijn
+
+WAARDEN = ['  Sóny,  TV!  ', 'a\t\tb', 'ﬁ Ⅻ', '', 'al schoon', 'Prod-1_x']
+
+def test_gelijk_aan_oorspronkelijke_re_sub():
+    schoon = compileerPijplijn(('verwijderLeestekens', 'verwijderSpaties')).pasToe(pd.Series(WAARDEN, dtype=object))
+    
+    verwacht = [re.sub(r'\s+', ' ', re.sub(r'[^\w\s]', '', waarde)).strip() for waarde in WAARDEN]
+    assert schoon.tolist() == verwacht
+
+def test_lege_cellen_en_getallen_blijven_ongewijzigd():
+    reeks = pd.Series([' A ', None, 3, 2.5, np.nan], dtype=object)
+    schoon = compileerPijplijn(('bijsnijden', 'kleineLetters')).pasToe(reeks)
+    
+    assert schoon.tolist()[:4] == ['a', None, 3, 2.5]
+    assert pd.isna(schoon.iloc[4])
+    assert schoon.dtype == object
+
+def test_geen_wijziging_geeft_none():
+    assert compileerPijplijn(('bijsnijden',)).pasToe(pd.Series(['a', 'b'], dtype=object)) is None
+    assert compileerPijplijn(('bijsnijden',)).pasToe(pd.Series([1, 2])) is None
+
+def test_onbekende_stap():
+    with pytest.raises(ValueError):
+        compileerPijplijn(('bestaatNiet',))
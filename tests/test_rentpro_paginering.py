@@ -0,0 +1,105 @@
+"""
+Tests voor het herkennen van de paginering van de RentPro-productlijst
+"""
+import asyncio
+import os
+from bs4 import BeautifulSoup
+from yarl import URL
+from modules.logger import logger
+from modules.rentpro.api_handler import ApiAntwoord, ApiHandler
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+BASIS = "http://metroeventsdc.rentpro5.nl"
+PRODUCTEN = f"{BASIS}/Product"
+
+def leesFixture(naam):
+    with open(os.path.join(FIXTURES, naam), encoding='utf-8') as bestand:
+        return bestand.read()
+
+def maakPagina(ids, pager=''):
+    """Bouw een productpagina met dezelfde gridopmaak als de fixture"""
+    rijen = ''.join(
+        f'<tr class="{"even" if i % 2 else "oneven"}">'
+        f'<td style="" ><a href="{BASIS}//product/edit/{id}">{id}</a></td>'
+        f'<td style="" >C{id}</td><td style="" >Groep</td><td style="" >Product {id}</td></tr>'
+        for i, id in enumerate(ids)
+    )
+    return (
+        '<table cellspacing="0" border="0" class="noBold gvItems">'
+        '<tr class="head"><th>ID</th><th>Code</th><th>Groep</th><th>Naam</th></tr>'
+        f'{rijen}</table><div class="pager">{pager}</div>'
+    )
+
+def soep(html):
+    return BeautifulSoup(html, 'html.parser')
+
+def vangWaarschuwingen(monkeypatch):
+    meldingen = []
+    monkeypatch.setattr(logger, 'logWaarschuwing', meldingen.append)
+    return meldingen
+
+def test_fixture_producten_en_pager():
+    handler = ApiHandler()
+    html = soep(leesFixture('rentpro_productlijst.html'))
+    
+    producten = handler._extract_products(html)
+    assert [(p['id'], p['naam']) for p in producten] == [
+        ('101', 'Speaker actief 12 inch'), ('102', 'Subwoofer 18 inch'), ('103', 'LED par 7x10W'),
+    ]
+    # Links met een dubbele slash (//Product?page=2) horen bij de productlijst
+    paginas = handler._extract_pages(html, PRODUCTEN, PRODUCTEN)
+    assert sorted(paginas) == [2, 3]
+    assert URL(paginas[3]).query['sort'] == 'Name'
+
+def test_andere_paginaparameters():
+    handler = ApiHandler()
+    pager = ''.join(f'<a href="/Product/index?grid-page={n}">{n}</a>' for n in (2, 3))
+    pager += '<a href="/Product?currentPage=4">4</a>'
+    
+    assert sorted(handler._extract_pages(soep(maakPagina([1], pager)), PRODUCTEN, PRODUCTEN)) == [2, 3, 4]
+
+def test_postbackpager_geeft_waarschuwing(monkeypatch):
+    meldingen = vangWaarschuwingen(monkeypatch)
+    pager = "<a href=\"javascript:__doPostBack('ctl00$gvItems','Page$2')\">2</a>"
+    
+    assert ApiHandler()._extract_pages(soep(maakPagina([1], pager)), PRODUCTEN, PRODUCTEN) == {}
+    assert len(meldingen) == 1 and 'postback' in meldingen[0]
+
+def haalAlles(handler):
+    async def verzamel():
+        return [product['id'] async for product in handler.iter_products()]
+    return asyncio.run(verzamel())
+
+def test_iter_products_volgt_pager(monkeypatch):
+    handler = ApiHandler()
+    handler.logged_in = True
+    # Pagina 2 toont verderop pagina 4, die niet op pagina 1 stond
+    paginas = {
+        1: leesFixture('rentpro_productlijst.html'),
+        2: maakPagina([201, 202], f'<a href="{BASIS}//Product?page=4&amp;sort=Name">4</a>'),
+        3: maakPagina([301]),
+        4: maakPagina([401, 101]),
+    }
+    
+    async def get(url, **kwargs):
+        nummer = int(URL(url).query.get('page', 1))
+        return ApiAntwoord(200, paginas[nummer], url)
+    monkeypatch.setattr(handler, 'get', get)
+    
+    assert sorted(haalAlles(handler)) == ['101', '102', '103', '201', '202', '301', '401']
+
+def test_volle_pagina_zonder_pager_geeft_waarschuwing(monkeypatch):
+    meldingen = vangWaarschuwingen(monkeypatch)
+    handler = ApiHandler()
+    handler.logged_in = True
+    html = {'vol': maakPagina(range(1, 51)), 'kort': maakPagina(range(1, 8))}
+    
+    for soort, verwacht in (('vol', 1), ('kort', 0)):
+        meldingen.clear()
+        
+        async def get(url, **kwargs):
+            return ApiAntwoord(200, html[soort], url)
+        monkeypatch.setattr(handler, 'get', get)
+        
+        haalAlles(handler)
+        assert len([m for m in meldingen if 'geen herkenbare pager' in m]) == verwacht